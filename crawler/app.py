@@ -1,33 +1,121 @@
-from flask import Flask, render_template, request, jsonify
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from flask import Flask, Blueprint, render_template, request, jsonify, Response
+from driver_pool import DriverPool
+import failures
+import metrics
+import argparse
+import atexit
+import sys
+import threading
 import time
 import re
 import os
-import json
+import glob
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
+from async_scheduler import CrawlScheduler
+from crawl_jobs import CrawlJobManager
+from crawl_schedule import CrawlSchedule, MODE_DEEP, MODE_LIGHT
+from crawl_journal import CrawlJournal
+from failures import CircuitBreaker, RecrawlQueue
+from sharding import sharded_crawl_batch
+from freshness import FreshnessCache
+from leaderboard_cache import LeaderboardCache
+from history_store import HistoryStore, PERIODS, DEFAULT_HISTORY_LIMIT
+from output_writer import OutputWriter, dumps_json
+from static_export import StaticExporter
+from ranking import RankingEngine
+from player_record import records_from_results
 
-app = Flask(__name__)
+# 웹 페이지/조회 API (읽기 전용, 여러 웹 워커로 실행 가능)와 크롤링 API(크롤링 실행, 한 프로세스에서만 실행)
+# create_app()이 실행 역할에 맞게 등록함
+web_pages = Blueprint('web_pages', __name__)
+crawl_api = Blueprint('crawl_api', __name__)
+
+# 백그라운드 크롤링 작업 관리자 (동시에 하나의 작업만 실행)
+crawl_jobs = CrawlJobManager()
 
 # 웹드라이버 경로 (app.py와 같은 폴더에 있다고 가정)
 DRIVER_PATH = "./chromedriver"
 
+# 리그별 URL 파일 (league1_urls.txt -> 1부리그, league2_urls.txt -> 2부리그 ...)
+# 리그 파일이 하나도 없으면 LEGACY_URLS_FILE 을 리그 구분 없이 사용
+LEAGUE_URLS_PATTERN = "league*_urls.txt"
+LEGACY_URLS_FILE = "urls.txt"
+
 # 결과 저장 파일 경로 (다음 회차 비교를 위한 데이터)
 OUTPUT_JSON_FILE = "fconline_manager_stats.json"
 
 # 웹 페이지 표시용 임시 데이터 파일 (서버가 HTML을 렌더링할 때 사용)
 DISPLAY_JSON_FILE = "current_crawl_display_data.json"
 
+# 전적 기록 저장소 (SQLite). 위 JSON 파일들은 정적 사이트용으로 계속 내보냄
+HISTORY_DB_FILE = "fconline_history.db"
+
+# 샤드 크롤링: 1보다 크면 player_id 해시로 나눈 샤드를 별도 워커 프로세스(또는 다른 서버)에서 크롤링
+CRAWL_SHARDS = 1
+
+# 샤드 크롤링 시 이 서버에서 띄울 워커 프로세스 수 (다른 서버는 'python sharding.py worker'로 합류)
+SHARD_LOCAL_WORKERS = 2
+
+# 크롤링 저널 (프로필 하나가 끝날 때마다 기록, 중간에 멈추면 다음 크롤링이 이어서 진행)
+CRAWL_JOURNAL_FILE = "crawl_journal.jsonl"
+
+# 실행 역할: "all" (웹 페이지 + 크롤링, 개발용 기본값), "web" (웹 페이지만, 크롤링 요청은 크롤링 서비스로 전달),
+# "crawler" (크롤링 서비스, 한 프로세스로만 실행)
+ROLE_ALL = "all"
+ROLE_WEB = "web"
+ROLE_CRAWLER = "crawler"
+SERVER_ROLES = (ROLE_ALL, ROLE_WEB, ROLE_CRAWLER)
+
+# 역할 "web" 에서 크롤링 요청을 넘길 크롤링 서비스 주소
+CRAWL_SERVICE_URL = "http://127.0.0.1:5002"
+
+# 정해진 간격으로 자동 크롤링 (간격, 조용한 시간대, 전체 크롤링 시간대는 crawl_schedule.py 설정)
+SCHEDULED_CRAWL = True
+
+# 최종 실패한 플레이어를 모아 두는 재크롤링 목록 (다음 크롤링에서 우선 크롤링, '/crawl/retry'로 따로 실행)
+RECRAWL_QUEUE_FILE = "crawl_recrawl_queue.json"
+
 # 렌더링된 HTML 페이지를 파일로 저장할 경로
 OUTPUT_HTML_FILE = "fconline_manager_stats.html"
 
-# 동시에 실행할 크롤링 작업 수
-MAX_WORKERS = 5
+# 정적 사이트 내보내기 폴더 (리그별 HTML 조각/데이터/정적 파일을 해시 이름으로, 바뀐 파일만 기록). None이면 내보내지 않음
+STATIC_EXPORT_DIR = "static_site"
+
+# 동시에 실행할 크롤링 작업 수 (상한). 실제 동시 작업 수는 응답 상태에 따라 자동 조절됨
+MAX_WORKERS = 8
+
+# 크롤링 시작 시 동시 작업 수
+INITIAL_WORKERS = 3
+
+# 드라이버 하나를 재사용할 최대 프로필 수 (초과 시 Chrome을 새로 띄움)
+DRIVER_MAX_USES = 20
+
+# Chrome 설정: "lean" (이미지/폰트/광고 차단, eager 로딩, 공유 디스크 캐시) 또는 "full" (기본 설정)
+BROWSER_PROFILE = "lean"
+
+# lean 설정에서 풀의 모든 드라이버가 함께 쓰는 디스크 캐시 폴더
+BROWSER_CACHE_DIR = "chrome_cache"
+
+# 크롤링 엔진 선택: "selenium" (브라우저) 또는 "http" (감독 모드 전적 직접 요청, 실패 시 selenium으로 재시도)
+CRAWL_ENGINE = "selenium"
+
+# 증분 크롤링: 최근 전적 변동이 없는 감독은 건너뛰고 이전 결과를 그대로 사용
+INCREMENTAL_CRAWL = True
+
+# 증분 크롤링 시, 재확인 주기가 된 감독은 HTTP 요청으로 전적만 먼저 확인 (같으면 브라우저 크롤링 생략)
+FRESHNESS_PRECHECK = True
+
+# 감독 모드 탭 클릭 후 전적이 바뀔 때까지 기다리는 최대 시간 (기존 고정 대기 + 요소 대기 합계)
+MANAGER_RECORD_TIMEOUT = (10 + 5) + (10 + 5)
+
+# 결과 파일 저장 (내용이 바뀐 파일만 임시 파일에 쓴 뒤 한꺼번에 교체)
+output_writer = OutputWriter()
+
+# 정적 사이트 내보내기 (크롤링 결과를 공개할 때마다 실행)
+static_exporter = StaticExporter(STATIC_EXPORT_DIR) if STATIC_EXPORT_DIR else None
+
+# 결과 페이지 응답 캐시 (표시용 JSON 파일이 바뀌거나 크롤링이 끝나면 다시 생성)
+leaderboard_cache = LeaderboardCache(DISPLAY_JSON_FILE, lambda *args: _render_results_table(*args))
 
 # -------------------------------------------------------------
 # 헬퍼 함수: URL에서 플레이어 ID 추출 (예: '1155593160' 부분)
@@ -37,35 +125,46 @@ def _get_player_id_from_url(url):
         return match.group(1)
     return None
 
-# -------------------------------------------------------------
-# 헬퍼 함수: 이전 결과 JSON 파일을 로드하고 모든 데이터를 반환 (업데이트 로직을 위해)
-def _load_all_previous_data(json_file_path):
-    previous_data = {} # {player_id: {data}, ...}
-    if os.path.exists(json_file_path):
-        try:
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            for item in data:
-                player_id = item.get('player_id')
-                if player_id:
-                    previous_data[player_id] = item
-        except json.JSONDecodeError as e:
-            print(f"경고: 이전 JSON 파일을 읽는 중 오류 발생 (파일 손상?): {e}")
-        except Exception as e:
-            print(f"경고: 이전 결과 로드 중 알 수 없는 오류 발생: {e}")
-    return previous_data
-
 # -------------------------------------------------------------
 # 헬퍼 함수: Selenium 드라이버 초기화 (Headless 모드 등 옵션 포함)
+# Selenium은 크롤링할 때만 import (웹 페이지만 제공하는 프로세스는 Selenium을 불러오지 않음)
 def _initialize_driver():
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--window-size=1920x1080")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from browser_profile import build_chrome_options, apply_request_blocking
+
+    options = build_chrome_options(BROWSER_PROFILE, BROWSER_CACHE_DIR)
     service = Service(executable_path=DRIVER_PATH)
-    return webdriver.Chrome(service=service, options=options)
+    driver = webdriver.Chrome(service=service, options=options)
+    try:
+        apply_request_blocking(driver, BROWSER_PROFILE)
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 서버 전체에서 공유하는 드라이버 풀 (최초 사용 시 생성, 서버 종료 시 정리)
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+
+def _get_driver_pool():
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = DriverPool(_initialize_driver, size=MAX_WORKERS, max_uses=DRIVER_MAX_USES)
+            atexit.register(_driver_pool.close)
+        return _driver_pool
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 전적 저장소 (최초 사용 시 생성)
+_history_store = None
+
+def _get_history_store():
+    global _history_store
+    if _history_store is None:
+        _history_store = HistoryStore(HISTORY_DB_FILE)
+    return _history_store
 
 # -------------------------------------------------------------
 # 헬퍼 함수: URL 파일 읽기 (주석 포함)
@@ -91,316 +190,872 @@ def _read_urls_from_file(filename):
                 print(f"경고 ({filename}): 알 수 없는 형식의 줄이 발견되었습니다: {stripped_line}")
     return urls_with_annotation
 
+# -------------------------------------------------------------
+# 헬퍼 함수: 리그별 URL 파일 찾기
+# 반환값: [(리그명, 파일명), ...] (리그 번호 순). 리그 파일이 없으면 [(None, LEGACY_URLS_FILE)]
+def _discover_league_url_files():
+    league_files = []
+    for filename in glob.glob(LEAGUE_URLS_PATTERN):
+        match = re.fullmatch(r'league(\d+)_urls\.txt', os.path.basename(filename))
+        if match:
+            league_files.append((int(match.group(1)), f"{match.group(1)}부리그", filename))
+    if not league_files:
+        return [(None, LEGACY_URLS_FILE)]
+    return [(league, filename) for _, league, filename in sorted(league_files)]
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 리그별 크롤링 대상 목록 생성 (여러 리그에 중복된 player_id는 앞 리그에서 한 번만 크롤링)
+# 반환값: [(리그명, [{"url", "annotation", "league"}, ...]), ...]
+def _load_league_items():
+    league_items = []
+    seen_player_ids = {}
+    for league, filename in _discover_league_url_files():
+        urls_data = _read_urls_from_file(filename)
+        if not urls_data:
+            print(f"경고: '{filename}' 파일에 유효한 URL이 없습니다.")
+        items = []
+        for url, annotation in urls_data:
+            player_id = _get_player_id_from_url(url)
+            if player_id and player_id in seen_player_ids:
+                print(f"경고: {player_id}({annotation})는 이미 {seen_player_ids[player_id] or filename}에 있어 건너뜁니다.")
+                continue
+            seen_player_ids[player_id] = league
+            items.append({"url": url, "annotation": annotation, "league": league})
+        league_items.append((league, items))
+    return league_items
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 리그별 결과 파일 경로 (예: fconline_manager_stats_1부리그.json)
+def _league_output_file(league):
+    base, ext = os.path.splitext(OUTPUT_JSON_FILE)
+    return f"{base}_{league}{ext}"
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 크롤링 결과 기본 틀 생성
+#  - 크롤링 결과에는 읽어 온 값(승/무/패, 구단주명)만 담고, 읽지 못한 값은 넣지 않음
+#  - 판수/채굴 효율/승률 계산과 "N/A", "50.97%" 같은 표시 형식은 병합 단계(PlayerRecord)에서만 처리
+def _new_result(url, annotation, league=None):
+    current_url_data = {
+        "URL": url,
+        "player_id": _get_player_id_from_url(url),
+        "주석": annotation,
+    }
+    if league:
+        current_url_data["리그명"] = league
+    return current_url_data
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 읽어 온 승/무/패를 결과에 채움
+def _apply_record(current_url_data, win, draw, loss):
+    current_url_data["승"] = win
+    current_url_data["무"] = draw
+    current_url_data["패"] = loss
+
 # -------------------------------------------------------------
 # 단일 URL을 크롤링하는 함수 (각 스레드에서 실행될 예정)
 def _crawl_single_url(item_to_process):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from browser_profile import page_transfer_stats
+    from readiness import RECORD_PATTERN, read_grade_text, timed_wait, wait_for_manager_record
+
     url = item_to_process['url']
     annotation = item_to_process['annotation']
     
-    driver = None
+    pool = _get_driver_pool()
+    pooled = None
+    driver_broken = False
+    stage_timings = {}
     
-    player_id = _get_player_id_from_url(url)
-    current_url_data = {
-        "URL": url,
-        "player_id": player_id,
-        "주석": annotation,
-        "구단주명": "N/A",
-        "승": "N/A", "무": "N/A", "패": "N/A",
-        "판수": "N/A", "채굴 효율": "N/A", "승률": "N/A",
-        "비고": "-"
-    }
+    current_url_data = _new_result(url, annotation, item_to_process.get('league'))
     
-    print(f"--- [스레드-{os.getpid()}] 처리 시작: {url} ---")
+    print(f"--- [스레드-{threading.current_thread().name}] 처리 시작: {url} ---")
     
     try:
-        driver = _initialize_driver()
+        stage_started = time.monotonic()
+        pooled = pool.acquire()
+        driver = pooled.driver
+        # 새 Chrome을 띄운 경우와 풀에서 재사용한 경우를 구분해 기록
+        stage_timings["driver_launch" if pooled.uses == 1 else "driver_reuse"] = time.monotonic() - stage_started
+
+        stage_started = time.monotonic()
         driver.get(url)
+        stage_timings["page_load"] = time.monotonic() - stage_started
         
-        WebDriverWait(driver, 10 + 5).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "selector_wrap"))
+        _, stage_timings["selector_wrap"] = timed_wait(
+            driver, 10 + 5, EC.presence_of_element_located((By.CLASS_NAME, "selector_wrap"))
         )
 
-        league_selector_link = WebDriverWait(driver, 5 + 5).until(
-            EC.element_to_be_clickable((By.CLASS_NAME, "league"))
+        league_selector_link, stage_timings["dropdown"] = timed_wait(
+            driver, 5 + 5, EC.element_to_be_clickable((By.CLASS_NAME, "league"))
         )
         league_selector_link.click()
-        time.sleep(1 + 5)
 
-        manager_mode_tab = WebDriverWait(driver, 5 + 5).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "a[onclick='SetType(52);']"))
+        # 드롭다운이 펼쳐지면 감독 모드 탭이 클릭 가능해지므로 별도의 고정 대기는 두지 않음
+        manager_mode_tab, stage_timings["manager_tab"] = timed_wait(
+            driver, 5 + 5, EC.element_to_be_clickable((By.CSS_SELECTOR, "a[onclick='SetType(52);']"))
         )
+        previous_grade_text = read_grade_text(driver)
         manager_mode_tab.click()
-        time.sleep(10 + 5)
 
-        grade_desc_element = WebDriverWait(driver, 10 + 5).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "grade_desc"))
+        # 전적 텍스트가 감독 모드 값으로 바뀌는 즉시 진행 (최대 MANAGER_RECORD_TIMEOUT초)
+        grade_desc_element, stage_timings["grade_desc"], record_changed = wait_for_manager_record(
+            driver, previous_grade_text, MANAGER_RECORD_TIMEOUT
         )
-        full_text = grade_desc_element.text
-        match = re.search(r'(\d+)승\s*(\d+)무\s*(\d+)패', full_text)
+        # 바뀌지 않았으면 화면의 값은 클릭 전 공식 경기 전적이므로 사용하지 않고 실패로 기록 (재시도/재크롤링 대상)
+        match = RECORD_PATTERN.search(grade_desc_element.text) if record_changed else None
 
-        if match:
-            win = int(match.group(1))
-            draw = int(match.group(2))
-            loss = int(match.group(3))
-            
-            total_games = win + draw + loss
-            mining_efficiency = win * 7 - draw * 3 - loss 
-            win_rate = (win / total_games * 100) if total_games > 0 else 0.0
-            
-            current_url_data["승"] = win
-            current_url_data["무"] = draw
-            current_url_data["패"] = loss
-            current_url_data["판수"] = total_games
-            current_url_data["채굴 효율"] = mining_efficiency
-            current_url_data["승률"] = f"{win_rate:.2f}%"
+        if not record_changed:
+            print(f"  [스레드-{threading.current_thread().name}] 감독 모드 전적으로 바뀌지 않아 실패로 기록합니다.")
+            current_url_data["error"] = failures.RECORD_UNCHANGED_MESSAGE
+            current_url_data["error_class"] = failures.TIMEOUT
+        elif match:
+            _apply_record(current_url_data, int(match.group(1)), int(match.group(2)), int(match.group(3)))
         else:
-            print(f"  [스레드-{os.getpid()}] 전적 정보를 찾을 수 없습니다.")
-            current_url_data["error"] = "전적 정보 찾기 실패"
+            print(f"  [스레드-{threading.current_thread().name}] 전적 정보를 찾을 수 없습니다.")
+            current_url_data["error"] = failures.PARSE_FAILURE_MESSAGE
+            current_url_data["error_class"] = failures.PARSE_FAILURE
 
-        coach_name_element = WebDriverWait(driver, 5 + 5).until(
+        stage_started = time.monotonic()
+        coach_name_element = WebDriverWait(driver, 5 + 5, poll_frequency=0.1).until(
             EC.presence_of_element_located((By.CLASS_NAME, "coach"))
         )
         current_url_data["구단주명"] = coach_name_element.text
+        stage_timings["coach"] = time.monotonic() - stage_started
+
+        # 이 페이지에서 받은 데이터량 (lean/full 설정 비교용)
+        transfer = page_transfer_stats(driver)
+        if transfer:
+            current_url_data["page_bytes"] = transfer["bytes"]
+            metrics.observe_page_transfer(BROWSER_PROFILE, transfer["bytes"])
         
     except Exception as e:
-        print(f"  [스레드-{os.getpid()}] URL({url}) 처리 중 오류 발생: {e}")
+        print(f"  [스레드-{threading.current_thread().name}] URL({url}) 처리 중 오류 발생: {e}")
         current_url_data["error"] = str(e)
+        current_url_data["error_class"] = failures.classify_exception(e)
+        # 대기 시간 초과나 요소 없음(페이지 문제)이 아니면 드라이버 상태를 믿을 수 없으므로 교체
+        driver_broken = current_url_data["error_class"] not in (failures.TIMEOUT, failures.ELEMENT_NOT_FOUND)
     
     finally:
-        if driver:
-            driver.quit()
+        if pooled:
+            pool.release(pooled, broken=driver_broken)
+        for stage, seconds in stage_timings.items():
+            metrics.observe_stage(stage, seconds)
+        metrics.count_result(current_url_data.get("error_class", "success"))
+        current_url_data["stage_timings"] = {name: round(seconds, 3) for name, seconds in stage_timings.items()}
+        print(f"  [스레드-{threading.current_thread().name}] 단계별 소요 시간(초): {current_url_data['stage_timings']}")
     
     return current_url_data
 
+# -------------------------------------------------------------
+# 헬퍼 함수: HTTP 요청 자체가 실패한 경우(타임아웃, 429/5xx 등)의 오류 결과
+#  - 같은 사이트에 브라우저로 다시 요청하지 않고 오류로 돌려주어, 스케줄러의 동시 작업 수 조절과
+#    서킷 브레이커가 사이트 과부하/장애에 반응하게 함
+def _http_error_result(item_to_process, error):
+    current_url_data = _new_result(item_to_process['url'], item_to_process['annotation'], item_to_process.get('league'))
+    current_url_data["error"] = str(error)
+    current_url_data["error_class"] = failures.classify_exception(error)
+    metrics.count_result(current_url_data["error_class"])
+    return current_url_data
+
+# -------------------------------------------------------------
+# 단일 URL을 HTTP 요청만으로 크롤링하는 함수
+#  - 응답에서 감독 모드 전적을 확인하지 못하면 None 반환 (Selenium으로 대체)
+#  - 요청 자체가 실패하면 오류 결과 반환
+def _crawl_single_url_http(item_to_process):
+    import http_engine
+
+    url = item_to_process['url']
+    current_url_data = _new_result(url, item_to_process['annotation'], item_to_process.get('league'))
+    player_id = current_url_data["player_id"]
+    if not player_id:
+        return None
+
+    started = time.monotonic()
+    try:
+        record = http_engine.fetch_manager_record(player_id)
+    except (http_engine.RecordParseError, http_engine.EngineUnavailable) as e:
+        print(f"  [스레드-{threading.current_thread().name}] HTTP 응답에서 전적 확인 실패, Selenium으로 재시도합니다 ({url}): {e}")
+        return None
+    except Exception as e:
+        print(f"  [스레드-{threading.current_thread().name}] HTTP 요청 실패 ({url}): {e}")
+        return _http_error_result(item_to_process, e)
+    finally:
+        metrics.observe_stage("http_fetch", time.monotonic() - started)
+
+    current_url_data["stage_timings"] = {"http_fetch": round(time.monotonic() - started, 3)}
+    _apply_record(current_url_data, record["win"], record["draw"], record["loss"])
+    if record["coach"]:
+        current_url_data["구단주명"] = record["coach"]
+    return current_url_data
+
+# -------------------------------------------------------------
+# 헬퍼 함수: HTTP 요청으로 전적만 가볍게 확인해, 이전과 같으면 이전 결과를 그대로 반환
+#  - 바뀌었거나 응답에서 전적을 확인하지 못하면 None (전체 크롤링), 요청 자체가 실패하면 오류 결과
+def _precheck_unchanged(item_to_process):
+    import http_engine
+
+    player_id = _get_player_id_from_url(item_to_process['url'])
+    started = time.monotonic()
+    try:
+        record = http_engine.fetch_manager_record(player_id)
+    except (http_engine.RecordParseError, http_engine.EngineUnavailable) as e:
+        print(f"  [스레드-{threading.current_thread().name}] 사전 확인 실패, 전체 크롤링합니다 ({player_id}): {e}")
+        return None
+    except Exception as e:
+        print(f"  [스레드-{threading.current_thread().name}] 사전 확인 요청 실패 ({player_id}): {e}")
+        return _http_error_result(item_to_process, e)
+    finally:
+        metrics.observe_stage("precheck", time.monotonic() - started)
+
+    if [record["win"], record["draw"], record["loss"]] != item_to_process['precheck_record']:
+        return None
+
+    carried = dict(item_to_process['previous'])
+    carried["URL"] = item_to_process['url']
+    carried["주석"] = item_to_process['annotation']
+    if item_to_process.get('league'):
+        carried["리그명"] = item_to_process['league']
+    carried["unchanged"] = True
+    return carried
+
+# -------------------------------------------------------------
+# 설정된 엔진으로 URL 하나를 크롤링 (HTTP 응답에서 전적을 확인하지 못하면 Selenium으로 대체)
+def _crawl_url(item_to_process):
+    if item_to_process.get('precheck_record'):
+        carried = _precheck_unchanged(item_to_process)
+        if carried is not None:
+            return carried
+
+    if CRAWL_ENGINE == "http":
+        result = _crawl_single_url_http(item_to_process)
+        if result is not None:
+            return result
+    return _crawl_single_url(item_to_process)
+
 # -------------------------------------------------------------
 # 웹 페이지의 초기 로딩을 위한 라우트
-@app.route('/')
+@web_pages.route('/')
 def index():
     return render_template('index.html')
 
-# 결과 테이블 페이지 라우트 (데이터를 파일에서 읽어와 렌더링)
-@app.route('/results_table')
+# 결과 테이블 페이지 라우트 (미리 렌더링해 둔 캐시에서 응답, 변경 없으면 304)
+@web_pages.route('/results_table')
 def results_table_page():
-    try:
-        if os.path.exists(DISPLAY_JSON_FILE):
-            with open(DISPLAY_JSON_FILE, 'r', encoding='utf-8') as f:
-                display_data = json.load(f)
-            
-            results = display_data.get('results', [])
-            last_updated = display_data.get('last_updated', '정보 없음')
-            
-            return render_template('results_table.html', results=results, last_updated=last_updated)
-        else:
-            return render_template('results_table.html', results=[], last_updated='데이터 없음', message='크롤링된 데이터 파일이 없습니다.')
-    except json.JSONDecodeError as e:
-        return render_template('results_table.html', results=[], last_updated='오류', message=f'데이터 파일 손상: {e}')
-    except Exception as e:
-        return render_template('results_table.html', results=[], last_updated='오류', message=f'데이터 로드 중 알 수 없는 오류: {e}')
+    entry = leaderboard_cache.get()
+    return _cached_response(entry, entry.html)
 
+# 리더보드 데이터 API (컬럼 목록 + 행 배열 형태의 압축 JSON)
+@web_pages.route('/api/leaderboard')
+def leaderboard_api():
+    entry = leaderboard_cache.get()
+    return _cached_response(entry, entry.api)
 
-# 크롤링 요청을 처리할 API 라우트
-@app.route('/crawl', methods=['POST'])
-def crawl_data():
-    urls_file = "urls.txt"
+# -------------------------------------------------------------
+# 시계열 API: 일별/주별 집계 조회 (저장소에 미리 만들어 둔 집계를 기간으로 잘라 반환)
+# 공통 쿼리: period=day|week (플레이어 기록은 raw 도 가능: 크롤링 스냅샷 그대로), since/until=YYYY-MM-DD, limit
+def _timeseries_args(allowed_periods):
+    period = request.args.get('period', 'day')
+    if period not in allowed_periods:
+        return None, (jsonify({"status": "error", "message": f"period 는 {', '.join(allowed_periods)} 중 하나여야 합니다."}), 400)
+    try:
+        limit = int(request.args['limit']) if 'limit' in request.args else None
+        for key in ('since', 'until'):
+            if request.args.get(key):
+                datetime.strptime(request.args[key][:10], "%Y-%m-%d")
+    except ValueError:
+        return None, (jsonify({"status": "error", "message": "since/until 은 YYYY-MM-DD, limit 은 정수여야 합니다."}), 400)
+    if limit is not None and not 0 < limit <= DEFAULT_HISTORY_LIMIT.get(period, 1000) * 10:
+        return None, (jsonify({"status": "error", "message": "limit 값이 허용 범위를 벗어났습니다."}), 400)
+    return {"period": period, "since": request.args.get('since'), "until": request.args.get('until'), "limit": limit}, None
 
-    # 이전 결과 로드 (업데이트 및 순위 비교를 위해 모든 데이터 로드)
-    previous_data_by_id = _load_all_previous_data(OUTPUT_JSON_FILE)
-    previous_ranks = {}
-    if previous_data_by_id:
-        # 순위 비교를 위한 이전 순위 맵 생성
-        sorted_previous_data = sorted(
-            [item for item in previous_data_by_id.values() if "error" not in item],
-            key=lambda x: (
-                x.get('채굴 효율', -float('inf')) if isinstance(x.get('채굴 효율'), (int, float)) else -float('inf'),
-                x.get('player_id', '')
-            ),
-            reverse=True
-        )
-        previous_ranks = {item['player_id']: rank for rank, item in enumerate(sorted_previous_data, 1)}
-        print(f"이전 결과 ({len(previous_data_by_id)}명) 로드 완료. 순위 비교를 수행합니다.")
+@web_pages.route('/api/players/<player_id>/history')
+def player_history_api(player_id):
+    args, error_response = _timeseries_args(PERIODS + ("raw",))
+    if error_response:
+        return error_response
+    store = _get_history_store()
+    if args["period"] == "raw":
+        rows = store.player_snapshots(player_id, args["since"], args["until"] and f"{args['until'][:10]} 23:59:59")
+        if args["limit"]:
+            rows = rows[-args["limit"]:]
     else:
-        print("이전 결과 파일이 없거나 읽을 수 없습니다. 새로운 순위로 기록됩니다.")
+        rows = store.player_rollups(player_id, **args)
+    if not rows:
+        return jsonify({"status": "error", "message": "해당 플레이어의 기록이 없습니다."}), 404
+    return jsonify({"player_id": player_id, "period": args["period"], "history": rows})
+
+@web_pages.route('/api/trends')
+def trends_api():
+    args, error_response = _timeseries_args(PERIODS)
+    if error_response:
+        return error_response
+    trends = _get_history_store().league_trends(league=request.args.get('league') or None, **args)
+    return jsonify({"period": args["period"], "trends": trends})
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 결과 페이지 렌더링 (리더보드 캐시가 다시 만들 때만 호출됨)
+def _render_results_table(results, last_updated, message=None):
+    if message:
+        return render_template('results_table.html', results=results, last_updated=last_updated, message=message)
+    return render_template('results_table.html', results=results, last_updated=last_updated)
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 캐시된 본문으로 응답 생성 (ETag/Last-Modified 조건부 요청 및 압축 인코딩 처리)
+def _cached_response(entry, cached_body):
+    encoding, body = cached_body.pick(request.headers.get('Accept-Encoding', ''))
+    response = Response(body, mimetype=cached_body.mimetype)
+    # 인코딩마다 본문이 다르므로 ETag도 구분
+    response.set_etag(cached_body.etag if encoding == "identity" else f"{cached_body.etag}-{encoding}")
+    if entry.last_modified:
+        response.headers['Last-Modified'] = entry.last_modified
+    response.headers['Cache-Control'] = 'public, max-age=0, must-revalidate'
+    response.headers['Vary'] = 'Accept-Encoding'
+    if encoding != "identity":
+        response.headers['Content-Encoding'] = encoding
+    return response.make_conditional(request)
+
+
+# 크롤링 단계별 소요 시간 지표 (Prometheus 텍스트 형식)
+@crawl_api.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+# 크롤링 요청을 처리할 API 라우트 (작업 ID만 바로 반환하고 크롤링은 백그라운드에서 실행)
+@crawl_api.route('/crawl', methods=['POST'])
+def crawl_data():
+    # 이미 실행 중인 작업이 있으면 새로 시작하지 않고 기존 작업에 합류
+    active_job = crawl_jobs.active()
+    if active_job:
+        return jsonify({"status": "accepted", "job_id": active_job.id, "deduplicated": True,
+                        "message": "이미 진행 중인 크롤링 작업이 있어 해당 작업에 연결합니다."}), 202
 
-    urls_data = []
     try:
-        urls_data = _read_urls_from_file(urls_file)
-        if not urls_data: print(f"경고: '{urls_file}' 파일에 유효한 URL이 없습니다.")
+        league_items = _load_league_items()
     except FileNotFoundError as e:
         print(f"오류: {e}")
-        return jsonify({"status": "error", "message": f"{urls_file} 파일을 찾을 수 없습니다."}), 500
+        return jsonify({"status": "error", "message": f"URL 파일을 찾을 수 없습니다: {e}"}), 500
     except Exception as e:
         print(f"오류: {e}")
-        return jsonify({"status": "error", "message": f"{urls_file} 파일 읽기 오류: {str(e)}"}), 500
-    
-    all_urls_to_process = []
-    for url_tuple in urls_data:
-        all_urls_to_process.append({"url": url_tuple[0], "annotation": url_tuple[1]}) 
+        return jsonify({"status": "error", "message": f"URL 파일 읽기 오류: {str(e)}"}), 500
 
-    total_urls_count = len(all_urls_to_process)
+    total_urls_count = sum(len(items) for _, items in league_items)
     if total_urls_count == 0:
          return jsonify({"status": "warning", "message": "유효한 URL이 없습니다."}), 200
 
-    print(f"웹 요청을 받았습니다. 총 {total_urls_count}개의 URL을 로드했습니다. {MAX_WORKERS}개씩 병렬 처리 시작.")
+    # {"full_refresh": true} 로 요청하면 최신성 캐시를 무시하고 전체 크롤링
+    full_refresh = bool((request.get_json(silent=True) or {}).get("full_refresh"))
+    job, created = crawl_jobs.submit(_run_crawl_job, league_items, full_refresh)
+    return jsonify({"status": "accepted", "job_id": job.id, "deduplicated": not created,
+                    "message": f"총 {total_urls_count}개의 URL 크롤링 작업을 시작했습니다."}), 202
 
-    crawled_results = []
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        for result in executor.map(_crawl_single_url, all_urls_to_process):
-            crawled_results.append(result)
+# 재크롤링 목록(지난 크롤링에서 최종 실패한 플레이어)만 다시 크롤링
+# GET: 목록 조회 (오류 종류별 건수 포함), POST: 재크롤링 작업 시작
+@crawl_api.route('/crawl/retry', methods=['GET', 'POST'])
+def crawl_retry():
+    recrawl_queue = RecrawlQueue(RECRAWL_QUEUE_FILE)
+    if request.method == 'GET':
+        return jsonify({"count": len(recrawl_queue), "by_class": recrawl_queue.counts_by_class(),
+                        "players": recrawl_queue.entries})
 
-    # -------------------------------------------------------------
-    # 새로운 데이터와 기존 데이터 비교 및 업데이트 로직
-    # -------------------------------------------------------------
-    updated_results_map = {}
-    
-    # 1. 기존 데이터(이전 크롤링 결과)를 먼저 맵에 채움
-    for item in previous_data_by_id.values():
-        updated_results_map[item['player_id']] = item
-
-    # 2. 크롤링한 데이터(새로운 크롤링 결과)로 맵을 업데이트
-    #    (채굴 효율이 더 높은 경우에만 업데이트)
-    for new_item in crawled_results:
-        player_id = new_item.get('player_id')
+    active_job = crawl_jobs.active()
+    if active_job:
+        return jsonify({"status": "accepted", "job_id": active_job.id, "deduplicated": True,
+                        "message": "이미 진행 중인 크롤링 작업이 있어 해당 작업에 연결합니다."}), 202
+    if not recrawl_queue:
+        return jsonify({"status": "warning", "message": "재크롤링할 플레이어가 없습니다."}), 200
+
+    league_items = recrawl_queue.league_items([league for league, _ in _discover_league_url_files()])
+    job, created = crawl_jobs.submit(_run_crawl_job, league_items, False)
+    return jsonify({"status": "accepted", "job_id": job.id, "deduplicated": not created,
+                    "message": f"재크롤링 목록의 {len(recrawl_queue)}명 크롤링 작업을 시작했습니다."}), 202
+
+# -------------------------------------------------------------
+# 예약 크롤링: 수동 크롤링과 같은 작업 관리자로 시작 (이미 실행 중이면 새로 시작하지 않음)
+# 가벼운 크롤링은 변동 없는 감독의 재확인을 미루고, 전체 크롤링은 최신성 캐시를 무시하고 모두 크롤링
+def _submit_scheduled_crawl(mode):
+    league_items = _load_league_items()
+    if sum(len(items) for _, items in league_items) == 0:
+        return None, False
+    return crawl_jobs.submit(_run_crawl_job, league_items, mode == MODE_DEEP, None, mode == MODE_LIGHT)
+
+crawl_schedule = CrawlSchedule(_submit_scheduled_crawl)
+
+# 예약 크롤링 상태 (다음 실행 시각, 마지막 실행 정보)
+@crawl_api.route('/crawl/schedule', methods=['GET'])
+def crawl_schedule_status():
+    return jsonify(crawl_schedule.to_dict())
+
+# 크롤링 작업 상태 조회 (완료된 작업은 결과 포함)
+@crawl_api.route('/crawl/<job_id>', methods=['GET'])
+def crawl_job_status(job_id):
+    job = crawl_jobs.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "해당 크롤링 작업을 찾을 수 없습니다."}), 404
+    return jsonify(job.to_dict(include_result=job.finished))
+
+# 크롤링 진행 상황 스트림 (Server-Sent Events, URL 하나가 끝날 때마다 이벤트 전송)
+@crawl_api.route('/crawl/<job_id>/events', methods=['GET'])
+def crawl_job_events(job_id):
+    job = crawl_jobs.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "해당 크롤링 작업을 찾을 수 없습니다."}), 404
+    return Response(job.stream(), mimetype='text/event-stream',
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 증분 크롤링 대상 선정
+# 반환값: (크롤링할 항목 리스트, 건너뛴 플레이어 수)
+# 크롤링할 항목은 최근에 전적이 바뀐 감독부터 (변동 시각을 모르는 감독은 뒤로)
+# defer_idle: 재확인 주기가 된 변동 없는 감독도 건너뜀 (예약 크롤링의 '가벼운' 크롤링, 전체 크롤링 때 갱신)
+# moved_player_ids: 건너뛴 감독 중 URL 파일의 리그가 바뀐 감독은 이전 기록의 리그명을 바로 고치고 여기에 모음
+#                   (크롤링하지 않아도 바뀐 리그로 공개/저장되도록)
+def _plan_incremental_crawl(all_urls_to_process, previous_data_by_id, freshness, now, full_refresh, recrawl_queue=(),
+                            defer_idle=False, moved_player_ids=None):
+    def recently_changed_first(item):
+        return freshness.last_changed(_get_player_id_from_url(item['url'])) or ""
+
+    if not INCREMENTAL_CRAWL or full_refresh:
+        return sorted(all_urls_to_process, key=recently_changed_first, reverse=True), 0
+
+    urls_to_crawl = []
+    skipped_count = 0
+    for item in all_urls_to_process:
+        player_id = _get_player_id_from_url(item['url'])
+        previous_item = previous_data_by_id.get(player_id)
+        # 이전 결과가 없거나 오류였던 플레이어, 재크롤링 목록에 있는 플레이어는 항상 크롤링
+        if not player_id or not previous_item or previous_item.has_error or player_id in recrawl_queue:
+            urls_to_crawl.append(item)
+            continue
+
+        decision = freshness.decide(player_id, now)
+        if decision == "skip" or (decision == "precheck" and defer_idle):
+            skipped_count += 1
+            league = item.get('league')
+            if league and previous_item.league != league:
+                previous_item.league = league
+                if moved_player_ids is not None:
+                    moved_player_ids.add(player_id)
+        elif decision == "precheck" and FRESHNESS_PRECHECK and CRAWL_ENGINE != "http":
+            urls_to_crawl.append(dict(item, precheck_record=freshness.get(player_id)["record"],
+                                      previous=previous_item.to_result()))
+        else:
+            urls_to_crawl.append(item)
+    urls_to_crawl.sort(key=recently_changed_first, reverse=True)
+    return urls_to_crawl, skipped_count
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 크롤링 결과를 기존 결과 맵에 병합 (채굴 효율이 더 높은 경우에만 갱신)
+# 맵과 크롤링 결과는 모두 PlayerRecord. 바뀐 플레이어는 changed_player_ids 에 모음 (저장소 기록 및 순위 갱신용)
+def _merge_crawled_results(updated_results_map, crawled_records, changed_player_ids):
+    for new_record in crawled_records:
+        player_id = new_record.player_id
         if not player_id:
             # player_id가 없는 데이터는 건너뜀
             continue
 
-        if "error" in new_item:
+        if new_record.has_error:
             # 새로운 크롤링 결과에 오류가 있다면 기존 데이터를 유지 (덮어쓰지 않음)
-            # 만약 기존 데이터도 없다면, 오류 데이터만 기록
-            if player_id not in updated_results_map:
-                updated_results_map[player_id] = new_item
+            # 만약 기존 데이터도 없다면, 오류 데이터만 기록 (기존 데이터가 있으면 소속 리그만 갱신)
+            prev_record = updated_results_map.get(player_id)
+            if prev_record is None:
+                updated_results_map[player_id] = new_record
+                changed_player_ids.add(player_id)
+            elif new_record.league and prev_record.league != new_record.league:
+                prev_record.league = new_record.league
+                changed_player_ids.add(player_id)
             continue
 
-        # 기존 데이터와 비교
-        if player_id in updated_results_map:
-            prev_item = updated_results_map[player_id]
-            # 채굴 효율이 숫자인지 확인 후 비교
-            prev_efficiency = prev_item.get('채굴 효율')
-            new_efficiency = new_item.get('채굴 효율')
-            
-            is_prev_valid = isinstance(prev_efficiency, (int, float))
-            is_new_valid = isinstance(new_efficiency, (int, float))
-            
-            # 이전 데이터가 유효하지 않으면 새 데이터로 무조건 업데이트
-            if not is_prev_valid:
-                updated_results_map[player_id] = new_item
+        prev_record = updated_results_map.get(player_id)
+        if prev_record is None or prev_record.efficiency is None:
+            # 새로운 플레이어이거나 이전 데이터가 유효하지 않으면 새 데이터로 무조건 업데이트
+            updated_results_map[player_id] = new_record
+            changed_player_ids.add(player_id)
+        elif new_record.efficiency is not None and new_record.efficiency > prev_record.efficiency:
             # 이전 데이터와 새로운 데이터가 모두 유효하면, 더 높은 값으로 업데이트
-            elif is_prev_valid and is_new_valid and new_efficiency > prev_efficiency:
-                updated_results_map[player_id] = new_item
-            # 그 외의 경우 (새로운 데이터가 더 낮거나, 동점이거나)는 기존 데이터 유지
-        else:
-            # 기존 데이터에 없는 새로운 플레이어면 추가
-            updated_results_map[player_id] = new_item
-    
-    all_combined_results = list(updated_results_map.values())
-    
-    # 순위 비교 및 '비고' 필드 계산 (통합 순위 계산)
-    print("\n=== 순위 비교 및 '비고' 필드 계산 시작 (통합) ===")
-    
-    final_processed_results = []
-    
-    current_ranked_data = sorted(
-        [item for item in all_combined_results if "error" not in item],
-        key=lambda x: (
-            x.get('채굴 효율', -float('inf')) if isinstance(x.get('채굴 효율'), (int, float)) else -float('inf'),
-            x.get('player_id', '')
-        ),
-        reverse=True
-    )
-    
-    current_ranks_map = {item['player_id']: rank for rank, item in enumerate(current_ranked_data, 1)}
-
-    for item in all_combined_results:
-        if "error" not in item and item['player_id'] in current_ranks_map:
-            current_rank = current_ranks_map[item['player_id']]
-            if item['player_id'] in previous_ranks:
-                prev_rank = previous_ranks[item['player_id']]
-                rank_diff = prev_rank - current_rank
-                if rank_diff > 0:
-                    item['비고'] = f"↑{rank_diff}"
-                elif rank_diff < 0:
-                    item['비고'] = f"↓{abs(rank_diff)}"
-                else:
-                    item['비고'] = "-"
-            else:
-                item['비고'] = "New"
-        else:
-            item['비고'] = "오류"
+            updated_results_map[player_id] = new_record
+            changed_player_ids.add(player_id)
+        # 그 외의 경우 (새로운 데이터가 더 낮거나, 동점이거나)는 기존 데이터 유지
+        # 단, 소속 리그가 바뀌었으면 리그명만 갱신
+        elif new_record.league and prev_record.league != new_record.league:
+            prev_record.league = new_record.league
+            changed_player_ids.add(player_id)
 
-        final_processed_results.append(item)
-    
-    final_processed_results.sort(
-        key=lambda x: (
-            x.get('채굴 효율', -float('inf')) if isinstance(x.get('채굴 효율'), (int, float)) else -float('inf'),
-            x.get('player_id', '')
-        ),
-        reverse=True
-    )
+# -------------------------------------------------------------
+# 헬퍼 함수: 한 리그의 크롤링 결과로 재크롤링 목록 갱신
+# 최종 실패한 플레이어는 오류 종류와 함께 넣고, 성공한 플레이어는 뺌
+# 결과가 없는 플레이어(크롤링 중단 등)는 circuit_open 으로 넣음. 실패 종류별 건수는 failure_counts 에 누적
+def _update_recrawl_queue(recrawl_queue, league, planned_items, crawled_results, breaker, failure_counts, now):
+    results_by_id = {result.get('player_id'): result for result in crawled_results}
+    for player_id, item in planned_items.items():
+        result = results_by_id.get(player_id)
+        if result is None:
+            error_class = failures.CIRCUIT_OPEN if breaker.aborted else failures.UNKNOWN
+        else:
+            error_class = failures.error_class_of(result)
+        if error_class is None:
+            recrawl_queue.remove(player_id)
+            continue
+        failure_counts[error_class] = failure_counts.get(error_class, 0) + 1
+        recrawl_queue.add(dict(item, player_id=player_id, league=league), error_class, now)
+    recrawl_queue.save()
 
-    success_count = sum(1 for item in final_processed_results if "error" not in item)
-    fail_count = total_urls_count - success_count
+# -------------------------------------------------------------
+# 헬퍼 함수: 현재까지의 결과를 파일로 내보내기 (통합 JSON, 리그별 JSON, 표시용 JSON, HTML)
+# 모든 파일 내용을 먼저 만든 뒤 한 번에 저장 (내용이 같은 파일은 건너뛰고, 바뀐 파일은 임시 파일 -> 이름 바꾸기)
+def _publish_results(final_processed_results, leagues):
+    last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     # -------------------------------------------------------------
-    # 1. JSON 파일 저장
-    output_data_for_json = [] 
-    for item in final_processed_results:
-        json_item = {
-            "player_id": item.get("player_id"),
-            "구단주명": item.get("구단주명"), 
-            "승": item.get("승"),
-            "무": item.get("무"),
-            "패": item.get("패"),
-            "판수": item.get("판수"),
-            "채굴 효율": item.get("채굴 효율"),
-            "승률": item.get("승률")
+    # 1. JSON 파일 내용 (통합 + 리그별)
+    # 표시 형식("N/A", "50.97%")은 여기서만 만듦
+    output_data_for_json = [record.to_json_item() for record in final_processed_results]
+    display_results = [record.to_result() for record in final_processed_results]
+
+    with metrics.phase_timer("json_serialize"):
+        artifacts = [(OUTPUT_JSON_FILE, dumps_json(output_data_for_json))]
+        for league in leagues:
+            if league:
+                artifacts.append((
+                    _league_output_file(league),
+                    dumps_json([json_item for json_item in output_data_for_json if json_item.get("리그명") == league])
+                ))
+
+        # -------------------------------------------------------------
+        # 2. 웹 페이지 표시용 데이터 JSON
+        display_data_for_web = {
+            "results": display_results,
+            "last_updated": last_updated
         }
-        if "error" in item: 
-            json_item["error"] = item["error"]
-        output_data_for_json.append(json_item)
+        artifacts.append((DISPLAY_JSON_FILE, dumps_json(display_data_for_web)))
+    # -------------------------------------------------------------
 
+    # -------------------------------------------------------------
+    # 3. 렌더링된 HTML 페이지
     try:
-        with open(OUTPUT_JSON_FILE, 'w', encoding='utf-8') as f:
-            json.dump(output_data_for_json, f, indent=4, ensure_ascii=False)
-        print(f"\n모든 데이터가 '{OUTPUT_JSON_FILE}' 파일에 성공적으로 저장되었습니다. (기존 파일 덮어쓰기)")
+        # 백그라운드 스레드에서는 요청 컨텍스트가 없으므로 (url_for 사용을 위해) 직접 만들어 렌더링
+        with metrics.phase_timer("html_render"), app.test_request_context('/results_table'):
+            rendered_html = render_template('results_table.html', 
+                                             results=display_data_for_web['results'], 
+                                             last_updated=display_data_for_web['last_updated'])
+        artifacts.append((OUTPUT_HTML_FILE, rendered_html.encode('utf-8')))
     except Exception as e:
-        print(f"JSON 파일 저장 중 오류 발생: {e}")
+        print(f"HTML 페이지 렌더링 중 오류 발생: {e}")
     # -------------------------------------------------------------
 
     # -------------------------------------------------------------
-    # 2. 웹 페이지 표시용 데이터 JSON 파일 저장
-    display_data_for_web = {
-        "results": final_processed_results, 
-        "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    
+    # 4. 한 번에 저장
     try:
-        with open(DISPLAY_JSON_FILE, 'w', encoding='utf-8') as f:
-            json.dump(display_data_for_web, f, indent=4, ensure_ascii=False)
-        print(f"웹 페이지 표시용 데이터가 '{DISPLAY_JSON_FILE}' 파일에 저장되었습니다.")
+        with metrics.phase_timer("file_write"):
+            written, unchanged = output_writer.write_all(artifacts)
+        for path in written:
+            print(f"'{path}' 파일이 저장되었습니다. (기존 파일 교체)")
+        if unchanged:
+            print(f"내용이 같아 다시 쓰지 않은 파일: {', '.join(unchanged)}")
+        if DISPLAY_JSON_FILE in written:
+            leaderboard_cache.invalidate()
     except Exception as e:
-        print(f"웹 페이지 표시용 데이터 파일 저장 중 오류 발생: {e}")
+        print(f"결과 파일 저장 중 오류 발생 (기존 파일은 그대로 유지됨): {e}")
     # -------------------------------------------------------------
 
-    # -------------------------------------------------------------
-    # 3. 렌더링된 HTML 페이지를 파일로 저장
+    return last_updated
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 정적 사이트 내보내기 (크롤링 한 회차에 한 번, 마지막 리그까지 공개한 뒤)
+# 해시 이름 파일 중 새로 생긴 것 + index.html + manifest.json 만 기록
+def _export_static_site(display_results, leagues, last_updated):
+    if static_exporter is None:
+        return
     try:
-        rendered_html = render_template('results_table.html', 
-                                         results=display_data_for_web['results'], 
-                                         last_updated=display_data_for_web['last_updated'])
-        
-        with open(OUTPUT_HTML_FILE, 'w', encoding='utf-8') as f: 
-            f.write(rendered_html)
-        print(f"렌더링된 HTML 페이지가 '{OUTPUT_HTML_FILE}' 파일에 저장되었습니다. (기존 파일 덮어쓰기)")
+        with metrics.phase_timer("static_export"):
+            manifest = static_exporter.export(display_results, leagues, last_updated)
+        last_export = manifest["last_export"]
+        print(f"정적 사이트 내보내기 완료 ('{STATIC_EXPORT_DIR}'): 파일 {len(last_export['written'])}개 기록 "
+              f"({last_export['written_bytes']:,}바이트), {len(last_export['deleted'])}개 삭제 "
+              f"(동기화 대기: 올릴 파일 {len(manifest['written'])}개, 지울 파일 {len(manifest['deleted'])}개)")
     except Exception as e:
-        print(f"HTML 파일 저장 중 오류 발생: {e}")
+        print(f"정적 사이트 내보내기 중 오류 발생: {e}")
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 한 리그의 URL 목록을 asyncio 스케줄러로 크롤링
+# (호스트별 속도 제한, 동시 작업 수 자동 조절, 실패 시 재시도. 스케줄러 통계는 scheduler_stats에 누적)
+def _crawl_with_scheduler(urls_to_crawl, on_result, scheduler_stats, breaker=None):
+    scheduler = CrawlScheduler(
+        _crawl_url,
+        max_workers=MAX_WORKERS,
+        # 앞 리그에서 조절된 동시 작업 수를 이어서 사용
+        initial_workers=scheduler_stats.get("final_concurrency", INITIAL_WORKERS),
+        on_result=on_result,
+        breaker=breaker,
+        skipped_result=lambda item: _new_result(item['url'], item.get('annotation', ""), item.get('league')),
+    )
+    scheduler.run(urls_to_crawl)
+    for key in ("attempts", "retries", "overloads", "circuit_skipped"):
+        scheduler_stats[key] = scheduler_stats.get(key, 0) + scheduler.stats[key]
+    scheduler_stats["peak_concurrency"] = max(scheduler_stats.get("peak_concurrency", 0), scheduler.stats["peak_concurrency"])
+    scheduler_stats["final_concurrency"] = scheduler.stats["final_concurrency"]
+    print(f"스케줄러 현황: 시도 {scheduler.stats['attempts']}회, 재시도 {scheduler.stats['retries']}회, "
+          f"과부하 감지 {scheduler.stats['overloads']}회, 최종 동시 작업 수 {scheduler.stats['final_concurrency']}")
+
+# -------------------------------------------------------------
+# 백그라운드 스레드에서 실행되는 크롤링 작업 본체
+# 리그 순서대로 크롤링 -> 병합 -> 순위 -> 파일 저장을 반복해, 앞 리그 결과는 뒤 리그를 기다리지 않고 먼저 공개
+# crawl_batch(urls_to_crawl, on_result, scheduler_stats, breaker)로 크롤링 방식을 바꿀 수 있음
+# (기본: CRAWL_SHARDS > 1 이면 샤드 워커, 아니면 이 프로세스의 _crawl_with_scheduler)
+def _run_crawl_job(job, league_items, full_refresh=False, crawl_batch=None, defer_idle=False):
+    if crawl_batch is None:
+        if CRAWL_SHARDS > 1:
+            crawl_batch = sharded_crawl_batch(
+                CRAWL_SHARDS, SHARD_LOCAL_WORKERS, lambda item: _get_player_id_from_url(item['url'])
+            )
+        else:
+            crawl_batch = _crawl_with_scheduler
+    metrics.begin_run(job.id)
+    journal = CrawlJournal(CRAWL_JOURNAL_FILE, run_id=job.id)
+    try:
+        summary = _run_crawl_pipeline(job, league_items, full_refresh, journal, crawl_batch, defer_idle)
+    except Exception:
+        # 저널은 남겨 두어 다음 크롤링이 이어서 진행
+        journal.close()
+        metrics.end_run(status="error")
+        raise
+    journal.complete()
+    metrics.end_run(
+        status=summary["status"],
+        urls=summary["total_urls"],
+        success=summary["success_count"],
+        failed=summary["fail_count"],
+        skipped=summary["skipped_count"],
+        resumed=summary["resumed_count"],
+        failure_classes=summary["failure_classes"],
+        circuit=summary["circuit_breaker"]["state"],
+    )
+    return summary
+
+def _run_crawl_pipeline(job, league_items, full_refresh, journal, crawl_batch, defer_idle=False):
+    # 이전 결과 로드 (업데이트 및 순위 비교를 위해 모든 데이터 로드)
+    # 저장소가 비어 있으면 기존 JSON 결과 파일에서 한 번 가져옴
+    store = _get_history_store()
+    with metrics.phase_timer("load_previous"):
+        store.import_json_if_empty(OUTPUT_JSON_FILE)
+        previous_data_by_id = store.load_records()
+        # 이전 결과로 순위 인덱스를 한 번 만들고, 이후에는 바뀐 플레이어만 갱신
+        # 이전 순위는 지난 회차에 저장한 리그별 순위 맵을 사용 (없으면 이전 결과로 계산)
+        ranking = RankingEngine(previous_data_by_id.values())
+        previous_ranks = store.load_ranks() or ranking.rank_map()
+    if previous_data_by_id:
+        print(f"이전 결과 ({len(previous_data_by_id)}명) 로드 완료. 순위 비교를 수행합니다.")
+    else:
+        print("이전 결과 파일이 없거나 읽을 수 없습니다. 새로운 순위로 기록됩니다.")
+
+    leagues = [league for league, _ in league_items]
+    total_urls_count = sum(len(items) for _, items in league_items)
+
+    # 증분 크롤링: 변동 없는 감독은 건너뛰고 (이전 결과는 아래 병합 단계에서 그대로 유지됨)
+    # 중단된 이전 크롤링의 저널이 남아 있으면, 그때 이미 성공한 플레이어는 저널의 결과를 그대로 사용
+    # 지난 크롤링에서 최종 실패한 플레이어(재크롤링 목록)는 변동 여부와 관계없이 다시 크롤링
+    freshness = FreshnessCache()
+    recrawl_queue = RecrawlQueue(RECRAWL_QUEUE_FILE)
+    crawl_started_at = datetime.now()
+    completed_ids = journal.completed_ids()
+    planned_leagues = []
+    skipped_count = 0
+    resumed_count = 0
+    for league, items in league_items:
+        moved_player_ids = set()
+        urls_to_crawl, league_skipped_count = _plan_incremental_crawl(
+            items, previous_data_by_id, freshness, crawl_started_at, full_refresh, recrawl_queue, defer_idle,
+            moved_player_ids
+        )
+        planned_items = {_get_player_id_from_url(item['url']): item for item in urls_to_crawl}
+        urls_to_crawl = [item for item in urls_to_crawl if _get_player_id_from_url(item['url']) not in completed_ids]
+        planned_leagues.append((league, planned_items, urls_to_crawl, moved_player_ids))
+        skipped_count += league_skipped_count
+        resumed_count += len(planned_items) - len(urls_to_crawl)
+    if skipped_count:
+        print(f"최근 변동이 없는 {skipped_count}명은 크롤링을 건너뛰고 이전 결과를 유지합니다.")
+    if journal.resumed_from:
+        print(f"중단된 크롤링({journal.resumed_from})의 저널에서 {resumed_count}명의 결과를 이어받습니다.")
+    job.set_total(sum(len(urls_to_crawl) for _, _, urls_to_crawl, _ in planned_leagues))
+
+    # 프로필 하나가 최종 완료될 때마다 저널에 기록하고 진행 상황을 바로 전송
+    def on_result(result):
+        journal.append(result)
+        job.report_progress({
+            "player_id": result.get("player_id"),
+            "구단주명": result.get("구단주명"),
+            "리그명": result.get("리그명"),
+            "error": result.get("error"),
+        })
+
+    print(f"웹 요청을 받았습니다. 총 {total_urls_count}개의 URL을 로드했습니다. "
+          f"동시 {INITIAL_WORKERS}개(최대 {MAX_WORKERS}개)로 병렬 처리 시작. (엔진: {CRAWL_ENGINE})")
+
     # -------------------------------------------------------------
+    # 새로운 데이터와 기존 데이터 비교 및 업데이트 로직
+    # -------------------------------------------------------------
+    # 기존 데이터(이전 크롤링 결과)를 먼저 맵에 채움
+    updated_results_map = dict(previous_data_by_id)
+    unchanged_player_ids = set()
+    scheduler_stats = {}
+    final_processed_results = []
+    last_updated = None
+    # 사이트 장애로 실패가 몰리면 크롤링을 잠시 멈추거나 (여러 번 반복되면) 이번 회차를 중단
+    breaker = CircuitBreaker()
+    failure_counts = {}
+
+    for league, planned_items, urls_to_crawl, moved_player_ids in planned_leagues:
+        league_label = league or "전체"
+        if breaker.aborted:
+            print(f"\n=== [{league_label}] 크롤링 중단 상태이므로 {len(urls_to_crawl)}개 URL을 재크롤링 목록에 넣습니다 ===")
+        else:
+            print(f"\n=== [{league_label}] {len(urls_to_crawl)}개 URL 크롤링 시작 ===")
+            with metrics.phase_timer("crawl"):
+                crawl_batch(urls_to_crawl, on_result, scheduler_stats, breaker)
+        journal.sync()
+        # 병합은 저널 기준 (이번에 크롤링한 결과 + 이전 시도에서 이어받은 결과)
+        crawled_results = journal.results_for(list(planned_items))
+        _update_recrawl_queue(recrawl_queue, league, planned_items, crawled_results, breaker,
+                              failure_counts, crawl_started_at)
+
+        # 최신성 캐시 갱신 (사전 확인으로 변동 없음이 확인된 경우 확인 시각만 갱신)
+        league_unchanged_ids = set()
+        for result in crawled_results:
+            if result.pop("unchanged", False):
+                league_unchanged_ids.add(result.get("player_id"))
+                freshness.touch(result.get("player_id"), crawl_started_at)
+            else:
+                freshness.update(result, crawl_started_at)
+        freshness.save()
+        unchanged_player_ids |= league_unchanged_ids
+
+        # 크롤링한 데이터(새로운 크롤링 결과)로 맵을 업데이트 (판수/채굴 효율/승률은 리그 단위로 한 번에 계산)
+        # 건너뛰었지만 리그가 바뀐 플레이어도 바뀐 플레이어로 취급 (저장소 기록 및 순위 갱신)
+        changed_player_ids = set(moved_player_ids)
+        with metrics.phase_timer("merge"):
+            crawled_records = records_from_results(crawled_results)
+            _merge_crawled_results(updated_results_map, crawled_records, changed_player_ids)
+
+        # 저장소 기록: 바뀐 플레이어만 갱신하고, 이번에 새로 크롤링한 전적은 스냅샷으로 추가
+        try:
+            with metrics.phase_timer("store_write"):
+                changed_count, snapshot_count = store.save_crawl(
+                    [updated_results_map[player_id] for player_id in changed_player_ids],
+                    [record for record in crawled_records if record.player_id not in league_unchanged_ids],
+                    crawl_started_at.strftime("%Y-%m-%d %H:%M:%S"),
+                )
+            print(f"저장소 기록 완료: 플레이어 {changed_count}명 갱신, 스냅샷 {snapshot_count}건 추가")
+        except Exception as e:
+            print(f"저장소 기록 중 오류 발생: {e}")
+
+        # 순위 비교 및 '비고' 필드 계산 (리그별 순위 계산)
+        print(f"\n=== [{league_label}] 순위 비교 및 '비고' 필드 계산 시작 (리그별) ===")
+        with metrics.phase_timer("rank"):
+            for player_id in changed_player_ids:
+                ranking.update(updated_results_map[player_id])
+
+            final_processed_results = ranking.ordered_items()
+            for record in final_processed_results:
+                record.remark = ranking.remark(record.player_id, previous_ranks)
+
+        # 이 리그까지의 결과를 바로 공개 (다음 리그는 아직 이전 결과로 표시됨)
+        last_updated = _publish_results(final_processed_results, leagues)
+        job.publish("league_done", {"리그명": league, "last_updated": last_updated})
+
+    display_results = [record.to_result() for record in final_processed_results]
+    if last_updated is not None:
+        _export_static_site(display_results, leagues, last_updated)
+
+    try:
+        store.save_ranks(ranking.rank_map(), crawl_started_at.strftime("%Y-%m-%d %H:%M:%S"))
+    except Exception as e:
+        print(f"순위 저장 중 오류 발생: {e}")
+
+    pool_stats = _get_driver_pool().stats()
+    print(f"드라이버 풀 현황: 재사용 {pool_stats['hits']}회, 새로 실행 {pool_stats['launches']}회, "
+          f"교체 {pool_stats['recycled']}회, 폐기 {pool_stats['discarded']}회")
 
-    return jsonify({
-        "status": "success",
-        "message": f"총 {total_urls_count}개 URL 중 {success_count}개 성공, {fail_count}개 실패.",
-        "results": final_processed_results,
-        "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    })
+    # 실패 = 이번 회차에서 최종 실패했거나 크롤링하지 못한 플레이어 (이전 결과가 남아 있어도 실패로 셈)
+    fail_count = sum(failure_counts.values())
+    success_count = total_urls_count - fail_count
+    if failure_counts:
+        print("실패 종류별 건수: " + ", ".join(f"{name} {count}건" for name, count in sorted(failure_counts.items())))
+    if recrawl_queue:
+        print(f"재크롤링 목록에 {len(recrawl_queue)}명이 남아 있습니다. ('/crawl/retry'로 다시 크롤링)")
+
+    return {
+        "status": "aborted" if breaker.aborted else "success",
+        "message": ("사이트 장애로 크롤링을 중단했습니다. " if breaker.aborted else "")
+                   + f"총 {total_urls_count}개 URL 중 {success_count}개 성공, {fail_count}개 실패. "
+                   f"(변동 없음으로 건너뜀 {skipped_count + len(unchanged_player_ids)}개"
+                   + (f", 중단된 크롤링에서 이어받음 {resumed_count}개" if resumed_count else "")
+                   + (f", 재크롤링 목록 {len(recrawl_queue)}명)" if recrawl_queue else ")"),
+        "results": display_results,
+        "last_updated": last_updated,
+        "driver_pool": pool_stats,
+        "scheduler": scheduler_stats,
+        "total_urls": total_urls_count,
+        "success_count": success_count,
+        "fail_count": fail_count,
+        "skipped_count": skipped_count + len(unchanged_player_ids),
+        "resumed_count": resumed_count,
+        "failure_classes": failure_counts,
+        "circuit_breaker": breaker.to_dict(),
+        "recrawl_queue_count": len(recrawl_queue)
+    }
+
+# -------------------------------------------------------------
+# WSGI 앱 생성 (gunicorn/waitress 등에서 사용)
+#  - 웹 워커 여러 개:   gunicorn -w 4 -b 0.0.0.0:5001 'app:create_app("web")'
+#  - 크롤링 서비스 하나: python app.py --role crawler --port 5002
+#    (웹 워커마다 크롤링 작업 관리자가 따로 생기지 않도록 크롤링은 한 프로세스에서만 실행)
+#  - 역할 "web" 은 Selenium을 불러오지 않으므로 빠르게 시작함
+# start_schedule: 예약 크롤링 시작 여부 (크롤링을 실행하는 역할에서만 의미 있음)
+def create_app(role=ROLE_ALL, start_schedule=False):
+    if role not in SERVER_ROLES:
+        raise ValueError(f"알 수 없는 실행 역할입니다: {role} ({', '.join(SERVER_ROLES)} 중 하나)")
+
+    flask_app = Flask(__name__)
+    if role in (ROLE_ALL, ROLE_WEB):
+        flask_app.register_blueprint(web_pages)
+    if role in (ROLE_ALL, ROLE_CRAWLER):
+        flask_app.register_blueprint(crawl_api)
+        if start_schedule and SCHEDULED_CRAWL:
+            crawl_schedule.start()
+    else:
+        from crawl_proxy import make_proxy_blueprint
+        flask_app.register_blueprint(make_proxy_blueprint(CRAWL_SERVICE_URL))
+    return flask_app
+
+# 기존 방식(모듈의 app 객체)과 백그라운드 HTML 렌더링용 앱
+app = create_app()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FC 온라인 감독모드 전적 크롤러 서버")
+    parser.add_argument("--role", choices=SERVER_ROLES, default=ROLE_ALL, help="실행 역할")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--debug", action="store_true", help="개발용 실행 (코드 변경 시 자동 재시작, 디버거)")
+    args = parser.parse_args(argv)
+
+    if args.debug:
+        # 자동 재시작 감시 프로세스에서는 예약 크롤링을 띄우지 않음 (실제 서버 프로세스에서만 실행)
+        flask_app = create_app(args.role, start_schedule=os.environ.get("WERKZEUG_RUN_MAIN") == "true")
+        flask_app.run(debug=True, host=args.host, port=args.port)
+        return 0
+
+    flask_app = create_app(args.role, start_schedule=True)
+    try:
+        from waitress import serve
+    except ImportError:  # waitress가 없으면 Flask 내장 서버 (멀티 스레드, 자동 재시작 없음)
+        serve = None
+    print(f"서버 시작: 역할 {args.role}, http://{args.host}:{args.port}")
+    if serve is not None:
+        serve(flask_app, host=args.host, port=args.port, threads=8)
+    else:
+        flask_app.run(host=args.host, port=args.port, threaded=True)
+    return 0
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5001)
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import failures
+
+# -------------------------------------------------------------
+# asyncio 기반 크롤링 스케줄러
+#  - 블로킹 크롤링 함수(Selenium/HTTP)를 스레드 풀에서 실행하고 이벤트 루프에서 조율
+#  - 호스트별 토큰 버킷으로 요청 속도 제한
+#  - 동시 작업 수 자동 조절 (AIMD): 응답이 빠르고 오류가 없으면 1씩 늘리고,
+#    타임아웃/HTTP 오류(429/5xx 등, 오류 종류는 failures 모듈 기준)가 나면 절반으로 줄임
+#  - URL별 재시도 (지수 백오프 + 지터, 오류 종류별 재시도 횟수는 failures.RETRY_BUDGETS)
+#  - 서킷 브레이커를 주면 사이트 장애 시 새 시도를 멈추거나 남은 URL을 크롤링하지 않고 끝냄
+# -------------------------------------------------------------
+
+# 호스트별 초당 요청 수와 순간 최대 허용량
+HOST_RATE_PER_SECOND = 2.0
+HOST_BURST = 4
+
+# 재시도 설정
+MAX_ATTEMPTS = 3
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# 이 시간(초) 안에 끝난 성공 요청만 '건강한' 응답으로 보고 동시 작업 수를 늘림
+LATENCY_TARGET_SECONDS = 20.0
+
+# 과부하 신호로 볼 오류 종류 (타임아웃, HTTP 오류: 429/5xx 등) -> 동시 작업 수를 절반으로 줄임
+OVERLOAD_ERROR_CLASSES = {failures.TIMEOUT, failures.HTTP_ERROR}
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 결과 분류 ("ok" / "overload" / "error"). 오류 종류는 failures 모듈 기준
+def classify_result(result):
+    error_class = failures.error_class_of(result)
+    if error_class is None:
+        return "ok"
+    if error_class in OVERLOAD_ERROR_CLASSES:
+        return "overload"
+    return "error"
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AdaptiveLimiter:
+    def __init__(self, initial, minimum, maximum):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self._in_flight = 0
+        self._healthy_streak = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    async def acquire(self):
+        async with self._cond:
+            while self._in_flight >= self.limit:
+                await self._cond.wait()
+            self._in_flight += 1
+
+    async def release(self, outcome, latency):
+        async with self._cond:
+            self._in_flight -= 1
+            if outcome == "overload":
+                # 곱셈 감소: 즉시 절반으로
+                self.limit = max(self.minimum, self.limit // 2)
+                self._healthy_streak = 0
+            elif outcome == "ok" and latency <= LATENCY_TARGET_SECONDS:
+                # 덧셈 증가: 현재 한도만큼 연속으로 건강한 응답이 오면 1 증가
+                self._healthy_streak += 1
+                if self._healthy_streak >= self.limit and self.limit < self.maximum:
+                    self.limit += 1
+                    self._healthy_streak = 0
+            self._cond.notify_all()
+
+
+class CrawlScheduler:
+    def __init__(self, crawl_fn, max_workers, initial_workers=None, min_workers=1,
+                 max_attempts=MAX_ATTEMPTS, on_result=None, breaker=None, skipped_result=None):
+        self.crawl_fn = crawl_fn
+        self.max_workers = max_workers
+        self.initial_workers = min(initial_workers or max_workers, max_workers)
+        self.min_workers = min_workers
+        self.max_attempts = max_attempts
+        self.on_result = on_result
+        self.breaker = breaker
+        # 서킷 브레이커로 크롤링하지 못한 URL의 기본 결과를 만드는 함수 (item -> dict)
+        self.skipped_result = skipped_result or (lambda item: {"URL": item["url"]})
+        self.stats = {"attempts": 0, "retries": 0, "overloads": 0, "peak_concurrency": 0, "final_concurrency": 0,
+                      "circuit_skipped": 0}
+
+    # ---------------------------------------------------------
+    # 전체 목록 크롤링 (입력 순서대로 결과 리스트 반환)
+    def run(self, items):
+        return asyncio.run(self._run_all(items))
+
+    async def _run_all(self, items):
+        self._limiter = AdaptiveLimiter(self.initial_workers, self.min_workers, self.max_workers)
+        self._buckets = {}
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crawl") as executor:
+            self._executor = executor
+            tasks = [asyncio.create_task(self._crawl_with_retry(loop, item)) for item in items]
+            results = await asyncio.gather(*tasks)
+        self.stats["final_concurrency"] = self._limiter.limit
+        return results
+
+    def _bucket_for(self, url):
+        host = urlparse(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(HOST_RATE_PER_SECOND, HOST_BURST)
+        return self._buckets[host]
+
+    # 서킷 브레이커가 허용할 때까지 대기 (중단되었으면 False)
+    async def _wait_for_breaker(self):
+        if self.breaker is None:
+            return True
+        while True:
+            wait = self.breaker.wait_seconds()
+            if wait is None:
+                return False
+            if wait <= 0:
+                return True
+            await asyncio.sleep(wait)
+
+    async def _crawl_with_retry(self, loop, item):
+        result = None
+        attempt = 1
+        while True:
+            if not await self._wait_for_breaker():
+                # 이미 한 번 이상 시도했으면 마지막 실패를 그대로 남김
+                if result is None:
+                    self.stats["circuit_skipped"] += 1
+                    result = failures.circuit_open_result(self.skipped_result(item))
+                break
+            await self._limiter.acquire()
+            self.stats["peak_concurrency"] = max(self.stats["peak_concurrency"], self._limiter.in_flight)
+            started = time.monotonic()
+            outcome = "error"
+            try:
+                await self._bucket_for(item["url"]).acquire()
+                self.stats["attempts"] += 1
+                result = await loop.run_in_executor(self._executor, self.crawl_fn, item)
+                outcome = classify_result(result)
+            finally:
+                await self._limiter.release(outcome, time.monotonic() - started)
+
+            result["attempts"] = attempt
+            if self.breaker is not None:
+                self.breaker.record(failures.error_class_of(result))
+            if outcome == "ok":
+                break
+            if outcome == "overload":
+                self.stats["overloads"] += 1
+            if attempt >= failures.max_attempts_for(result, self.max_attempts):
+                break
+            self.stats["retries"] += 1
+            delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** (attempt - 1)))
+            delay += random.uniform(0, delay / 2)
+            print(f"  [스케줄러] {item['url']} {attempt}회차 실패 ({result.get('error')}), {delay:.1f}초 후 재시도")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        if self.on_result:
+            self.on_result(result)
+        return result
@@ -0,0 +1,243 @@
+import hashlib
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# -------------------------------------------------------------
+# 벤치마크용 로컬 FC 온라인 프로필 서버
+#  - nexon.com 대신 '/profile/stat/popup/<player_id>' 팝업 페이지를 흉내 내어 응답
+#  - 실제 팝업과 같은 구조: '.selector_wrap' 안의 '.league' 드롭다운 -> "SetType(52);" 감독 모드 탭
+#    -> 클릭 시 전적 요청 후 '.grade_desc' 텍스트 교체, '.coach' 구단주명
+#  - '?n1Type=52' 요청은 감독 모드 전적이 바로 들어간 페이지를 반환 (HTTP 엔진용, '.league' 모드 표시도 감독 모드)
+#  - 실제 팝업처럼 CSS, 이미지, 폰트 리소스도 함께 요청하게 해 브라우저 설정(lean/full)별 전송량 비교 가능
+#  - 응답 지연과 실패(5xx, 전적 누락, 느린 응답)를 플레이어별로 고정된 비율로 주입
+#    (같은 seed면 어느 엔진으로 돌려도 같은 플레이어가 실패하므로 엔진끼리 비교 가능)
+# -------------------------------------------------------------
+
+POPUP_PATH_PATTERN = re.compile(r'^/profile/stat/popup/(\d+)$')
+
+# 정적 리소스 (경로 -> Content-Type). 본문은 asset_bytes 크기의 더미 데이터
+_ASSETS = {
+    "/static/popup.css": "text/css",
+    "/static/emblem.png": "image/png",
+    "/static/banner.jpg": "image/jpeg",
+    "/static/font.woff2": "font/woff2",
+}
+
+_POPUP_CSS = """@font-face { font-family: 'Popup'; src: url('/static/font.woff2') format('woff2'); }
+body { font-family: 'Popup', sans-serif; }
+.selector_wrap { position: relative; }
+"""
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head><meta charset="utf-8"><title>FC 온라인 프로필</title>
+<link rel="stylesheet" href="/static/popup.css"></head>
+<body>
+<img src="/static/banner.jpg" alt="">
+<div class="selector_wrap">
+    <a href="#" class="league" onclick="toggleLeague(); return false;">{mode}</a>
+    <ul class="league_list" style="display:none">
+        <li><a href="#" onclick="SetType(50);">공식경기</a></li>
+        <li><a href="#" onclick="SetType(52);">감독 모드</a></li>
+    </ul>
+</div>
+<div class="profile">
+    <img src="/static/emblem.png?{player_id}" alt="">
+    <span class="coach">{coach}</span>
+    <div class="grade_desc">{grade}</div>
+</div>
+<script>
+function toggleLeague() {{
+    var list = document.querySelector('.league_list');
+    list.style.display = list.style.display === 'none' ? 'block' : 'none';
+}}
+function SetType(n1Type) {{
+    fetch(location.pathname + '?n1Type=' + n1Type + '&fragment=1')
+        .then(function (response) {{ return response.text(); }})
+        .then(function (text) {{ document.querySelector('.grade_desc').textContent = text; }});
+}}
+</script>
+</body>
+</html>
+"""
+
+
+def _format_record(record):
+    win, draw, loss = record
+    return f"{win}승 {draw}무 {loss}패"
+
+
+class ProfileServerConfig:
+    def __init__(self, latency=0.0, jitter=0.0, record_latency=0.3,
+                 failure_rate=0.0, missing_rate=0.0, slow_rate=0.0, slow_latency=5.0, asset_bytes=50_000, seed=0):
+        self.latency = latency                # 모든 응답의 기본 지연 (초)
+        self.jitter = jitter                  # 기본 지연에 더할 무작위 지연 상한 (초)
+        self.record_latency = record_latency  # SetType(52) 전적 요청 지연 (초)
+        self.failure_rate = failure_rate      # 500 응답을 돌려줄 플레이어 비율
+        self.missing_rate = missing_rate      # 감독 모드 전적이 없는 페이지를 돌려줄 플레이어 비율
+        self.slow_rate = slow_rate            # 전적 요청이 slow_latency 만큼 느린 플레이어 비율
+        self.slow_latency = slow_latency
+        self.asset_bytes = asset_bytes        # 이미지/폰트 리소스 하나의 크기 (바이트)
+        self.seed = seed
+
+
+class ProfileServer:
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or ProfileServerConfig()
+        self.stats = {"requests": 0, "record_requests": 0, "bytes_sent": 0}
+        self._stats_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def profile_url(self, player_id):
+        return f"{self.base_url}/profile/stat/popup/{player_id}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="bench-profile-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # ---------------------------------------------------------
+    # 플레이어별 고정 값 (seed와 player_id로 결정)
+    def _roll(self, player_id, kind):
+        digest = hashlib.sha1(f"{self.config.seed}:{kind}:{player_id}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+    def manager_record(self, player_id):
+        rng = random.Random(f"{self.config.seed}:{player_id}")
+        return rng.randint(0, 400), rng.randint(0, 100), rng.randint(0, 300)
+
+    def coach_name(self, player_id):
+        return f"감독{player_id[-4:]}"
+
+    def expected_failure(self, player_id):
+        if self._roll(player_id, "failure") < self.config.failure_rate:
+            return "http_500"
+        if self._roll(player_id, "missing") < self.config.missing_rate:
+            return "missing_record"
+        return None
+
+    def _is_slow(self, player_id):
+        return self._roll(player_id, "slow") < self.config.slow_rate
+
+    def _sleep(self, seconds):
+        if self.config.jitter:
+            seconds += random.uniform(0, self.config.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    # ---------------------------------------------------------
+    # 요청 처리: (상태 코드, Content-Type, 본문 바이트)
+    def respond(self, path, query):
+        if path in _ASSETS:
+            if path == "/static/popup.css":
+                return 200, _ASSETS[path], _POPUP_CSS.encode("utf-8")
+            return 200, _ASSETS[path], b"\0" * self.config.asset_bytes
+
+        status, text = self._respond_popup(path, query)
+        return status, "text/html; charset=utf-8", text.encode("utf-8")
+
+    def _respond_popup(self, path, query):
+        match = POPUP_PATH_PATTERN.match(path)
+        if not match:
+            return 404, "not found"
+        player_id = match.group(1)
+        n1_type = query.get("n1Type", [None])[0]
+        fragment = query.get("fragment", [None])[0] == "1"
+
+        self._sleep(self.config.latency)
+        if n1_type == "52":
+            with self._stats_lock:
+                self.stats["record_requests"] += 1
+            self._sleep(self.config.slow_latency if self._is_slow(player_id) else self.config.record_latency)
+
+        failure = self.expected_failure(player_id)
+        if failure == "http_500":
+            return 500, "internal server error"
+
+        if n1_type == "52":
+            grade = "" if failure == "missing_record" else _format_record(self.manager_record(player_id))
+        else:
+            # 처음 열었을 때는 공식경기 전적이 보이다가 감독 모드를 누르면 바뀜
+            rng = random.Random(f"{self.config.seed}:official:{player_id}")
+            grade = _format_record((rng.randint(0, 900), rng.randint(0, 200), rng.randint(0, 700)))
+
+        if fragment:
+            return 200, grade
+        mode = "감독 모드" if n1_type == "52" else "공식경기"
+        return 200, _PAGE_TEMPLATE.format(player_id=player_id, coach=self.coach_name(player_id), grade=grade, mode=mode)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                status, content_type, body = server.respond(parsed.path, parse_qs(parsed.query))
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                if not content_type.startswith("text/html"):
+                    # 정적 리소스는 브라우저 디스크 캐시에 남도록 캐시 허용
+                    self.send_header("Cache-Control", "public, max-age=3600")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with server._stats_lock:
+                    server.stats["requests"] += 1
+                    server.stats["bytes_sent"] += len(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+# -------------------------------------------------------------
+# 단독 실행: 브라우저로 직접 확인하거나 다른 도구로 부하를 줄 때 사용
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="로컬 FC 온라인 프로필 팝업 서버 (벤치마크용)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--record-latency", type=float, default=0.3)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--missing-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    profile_server = ProfileServer(
+        ProfileServerConfig(latency=args.latency, record_latency=args.record_latency,
+                            failure_rate=args.failure_rate, missing_rate=args.missing_rate),
+        port=args.port,
+    )
+    print(f"프로필 서버 실행 중: {profile_server.profile_url('1000000000')}")
+    try:
+        profile_server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        profile_server._httpd.server_close()
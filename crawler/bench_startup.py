@@ -0,0 +1,141 @@
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+from benchmark import BENCH_RESULTS_FILE, percentile
+
+# -------------------------------------------------------------
+# 서버 시작 속도 벤치마크
+#  - import 시간: 새 파이썬 프로세스에서 'import app' 에 걸린 시간과, 그때 Selenium이 함께 불러와졌는지
+#    (-X importtime 으로 가장 오래 걸린 모듈도 함께 기록)
+#  - 크롤링 엔진 import 시간: 크롤링을 처음 시작할 때 추가로 불러오는 Selenium 관련 모듈의 시간
+#  - 콜드 스타트: 'python app.py --role web' 을 띄운 뒤 첫 응답('/api/leaderboard')까지 걸린 시간
+#  - 웹 워커 시작 비용이 늘어나지 않았는지 확인하는 용도 (결과는 bench_results.jsonl 에 추가)
+#
+# 사용 예 (crawler 폴더에서 실행):
+#   python bench_startup.py
+#   python bench_startup.py --repeat 10 --role all
+# -------------------------------------------------------------
+
+_CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 콜드 스타트 측정 시 첫 응답을 기다리는 최대 시간 (초)
+STARTUP_TIMEOUT_SECONDS = 30
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import app
+app_seconds = time.perf_counter() - started
+selenium_loaded = "selenium" in sys.modules
+started = time.perf_counter()
+import selenium.webdriver, browser_profile, readiness
+engine_seconds = time.perf_counter() - started
+print(json.dumps({"app": app_seconds, "engine": engine_seconds, "selenium_loaded": selenium_loaded}))
+"""
+
+
+def _run_python(args):
+    return subprocess.run([sys.executable, *args], cwd=_CRAWLER_DIR, capture_output=True, text=True, check=True)
+
+
+# -------------------------------------------------------------
+# import 시간 (프로세스마다 새로 측정)
+def measure_imports(repeat):
+    samples = [json.loads(_run_python(["-c", _IMPORT_SCRIPT]).stdout.strip().splitlines()[-1]) for _ in range(repeat)]
+    return {
+        "import_app_p50": round(percentile([s["app"] for s in samples], 50), 4),
+        "import_app_max": round(max(s["app"] for s in samples), 4),
+        "import_engine_p50": round(percentile([s["engine"] for s in samples], 50), 4),
+        "selenium_loaded_by_app": any(s["selenium_loaded"] for s in samples),
+    }
+
+
+# -X importtime 결과에서 누적 시간이 가장 긴 모듈 (app 자신 제외)
+def slowest_imports(top):
+    stderr = _run_python(["-X", "importtime", "-c", "import app"]).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [part.strip() for part in line[len("import time:"):].split("|")]
+        if not parts[1].isdigit():
+            continue
+        modules.append((int(parts[1]), parts[2].strip()))
+    modules = [module for module in modules if module[1] != "app"]
+    modules.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(us / 1000, 1)} for us, name in modules[:top]]
+
+
+# -------------------------------------------------------------
+# 콜드 스타트: 서버 프로세스 시작 -> 첫 응답까지
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_cold_start(role, path):
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(_CRAWLER_DIR, "app.py"), "--role", role, "--host", "127.0.0.1", "--port", str(port)],
+        cwd=_CRAWLER_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < STARTUP_TIMEOUT_SECONDS:
+            if process.poll() is not None:
+                raise RuntimeError(f"서버가 바로 종료되었습니다 (종료 코드 {process.returncode})")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5) as response:
+                    response.read()
+                return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise RuntimeError(f"{STARTUP_TIMEOUT_SECONDS}초 안에 서버가 응답하지 않았습니다.")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="웹 서버 import 시간 / 콜드 스타트 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수")
+    parser.add_argument("--role", choices=["web", "all", "crawler"], default="web", help="콜드 스타트를 잴 실행 역할")
+    parser.add_argument("--path", default="/api/leaderboard", help="첫 응답을 확인할 주소")
+    parser.add_argument("--top", type=int, default=8, help="기록할 느린 import 모듈 수")
+    parser.add_argument("--output", default=BENCH_RESULTS_FILE, help="결과를 한 줄씩 추가할 JSONL 파일")
+    args = parser.parse_args(argv)
+
+    summary = {"benchmark": "startup", "run_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+               "role": args.role, "repeat": args.repeat}
+    summary.update(measure_imports(args.repeat))
+    cold_starts = [measure_cold_start(args.role, args.path) for _ in range(args.repeat)]
+    summary["cold_start_p50"] = round(percentile(cold_starts, 50), 4)
+    summary["cold_start_max"] = round(max(cold_starts), 4)
+    summary["slowest_imports"] = slowest_imports(args.top)
+
+    print(f"import app: p50 {summary['import_app_p50'] * 1000:.0f}ms "
+          f"(Selenium {'함께 로드됨' if summary['selenium_loaded_by_app'] else '로드 안 됨'}), "
+          f"크롤링 엔진 추가 import: p50 {summary['import_engine_p50'] * 1000:.0f}ms")
+    print(f"콜드 스타트 ({args.role}, {args.path}): p50 {summary['cold_start_p50'] * 1000:.0f}ms, "
+          f"최대 {summary['cold_start_max'] * 1000:.0f}ms")
+    for module in summary["slowest_imports"]:
+        print(f"  {module['cumulative_ms']:>8.1f}ms  {module['module']}")
+
+    if args.output:
+        with open(args.output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+        print(f"결과가 '{args.output}' 파일에 추가되었습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+try:
+    import psutil
+except ImportError:  # psutil이 없으면 /proc 에서 직접 읽음 (리눅스 전용)
+    psutil = None
+
+from bench_server import ProfileServer, ProfileServerConfig
+
+# -------------------------------------------------------------
+# 오프라인 크롤링 벤치마크
+#  - 로컬 프로필 서버(bench_server.py)를 띄우고 가상의 프로필 N개를 크롤링
+#  - 엔진별로 처리량(프로필/초), 프로필당 지연 p50/p99, Chrome 프로세스 최대 RSS를 측정
+#  - 동시성/대기 방식을 바꿀 때마다 같은 조건으로 돌려 회귀 여부를 확인하는 용도
+#
+# 사용 예 (crawler 폴더에서 실행, chromedriver가 같은 폴더에 있어야 함):
+#   python benchmark.py --engine selenium --profiles 50 --workers 3
+#   python benchmark.py --engine selenium --profiles 50 --browser-profile full
+#   python benchmark.py --engine http --profiles 200 --failure-rate 0.05
+#   python benchmark.py --engine standalone --profiles 20 --workers 4
+#   python benchmark.py --engine sharded --profiles 100 --workers 4 --shard-engine http
+# -------------------------------------------------------------
+
+# 결과를 한 줄씩 누적할 파일
+BENCH_RESULTS_FILE = "bench_results.jsonl"
+
+# 가상 플레이어 ID 시작 값
+FIRST_PLAYER_ID = 1000000000
+
+# Chrome 메모리 측정 간격 (초)
+RSS_SAMPLE_INTERVAL = 0.2
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 백분위수 (nearest-rank)
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+# -------------------------------------------------------------
+# 이 프로세스의 자식 중 Chrome/chromedriver 프로세스의 RSS 합계 (바이트)
+def _descendant_pids_from_proc(root_pid):
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", 'r') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # "pid (comm) state ppid ..." (comm에 공백이 있을 수 있으므로 마지막 ')' 기준으로 자름)
+        comm = stat[stat.find("(") + 1:stat.rfind(")")]
+        ppid = int(stat[stat.rfind(")") + 2:].split()[1])
+        children.setdefault(ppid, []).append((int(entry), comm))
+
+    found = []
+    stack = [root_pid]
+    while stack:
+        for pid, comm in children.get(stack.pop(), []):
+            found.append((pid, comm))
+            stack.append(pid)
+    return found
+
+
+def _proc_rss(pid):
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def chrome_rss_bytes(root_pid=None):
+    root_pid = root_pid or os.getpid()
+    if psutil is not None:
+        total = 0
+        try:
+            processes = psutil.Process(root_pid).children(recursive=True)
+        except psutil.Error:
+            return 0
+        for process in processes:
+            try:
+                if "chrome" in process.name().lower():
+                    total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+    if not os.path.isdir("/proc"):
+        return None
+    return sum(_proc_rss(pid) for pid, comm in _descendant_pids_from_proc(root_pid) if "chrome" in comm.lower())
+
+
+class RssSampler:
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak = 0
+        self.supported = True
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="bench-rss", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = chrome_rss_bytes()
+            if rss is None:
+                self.supported = False
+                return
+            self.peak = max(self.peak, rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+# -------------------------------------------------------------
+# 엔진별 실행 함수: (server, items, args) -> [(결과 dict, 소요 시간(초)), ...]
+def _timed(crawl_fn, samples, lock):
+    def run(item):
+        started = time.monotonic()
+        result = crawl_fn(item)
+        with lock:
+            samples.append((result, time.monotonic() - started))
+        return result
+    return run
+
+
+def _run_app_engine(crawl_fn, items, args):
+    import app
+    from async_scheduler import CrawlScheduler
+
+    samples = []
+    scheduler = CrawlScheduler(
+        _timed(crawl_fn, samples, threading.Lock()),
+        max_workers=args.workers,
+        initial_workers=args.workers,
+        max_attempts=args.attempts,
+    )
+    scheduler.run(items)
+    if app._driver_pool is not None:
+        app._driver_pool.close()
+        app._driver_pool = None
+    return samples
+
+
+def run_selenium_engine(server, items, args):
+    import app
+    app.BROWSER_PROFILE = args.browser_profile
+    return _run_app_engine(app._crawl_single_url, items, args)
+
+
+def run_http_engine(server, items, args):
+    import app
+    import http_engine
+    # 전적 요청 주소를 로컬 서버로 돌림 (http_engine 설정값)
+    http_engine.RECORD_ENDPOINT = server.base_url + "/profile/stat/popup/{player_id}"
+
+    # HTTP 엔진은 응답에서 전적을 확인하지 못하면 None을 반환하므로 (app에서는 Selenium으로 재시도) 실패 결과로 바꿔 기록
+    def crawl_http_only(item):
+        return app._crawl_single_url_http(item) or {"error": "HTTP 요청/파싱 실패"}
+
+    return _run_app_engine(crawl_http_only, items, args)
+
+
+# fconline_crawler.py 의 탭 방식 (Chrome 하나에 탭 여러 개, --workers 를 탭 수로 사용)
+def run_standalone_engine(server, items, args):
+    import app
+    import fconline_crawler
+    app.BROWSER_PROFILE = args.browser_profile
+    results = fconline_crawler.crawl_profiles(items, tabs=args.workers, max_attempts=args.attempts)
+    return [(result, result["stage_timings"]["total"]) for result in results]
+
+
+# sharding.py 의 샤드 워커 프로세스 (--workers 개의 로컬 워커, 워커마다 --shard-concurrency 개씩 동시 처리)
+# 워커는 별도 프로세스이므로 프로필별 시간은 결과의 단계별 시간 합계로 계산
+def run_sharded_engine(server, items, args):
+    import tempfile
+    import app
+    from sharding import sharded_crawl_batch
+
+    worker_args = ["--engine", args.shard_engine]
+    if args.shard_engine == "http":
+        worker_args += ["--record-endpoint", server.base_url + "/profile/stat/popup/{player_id}"]
+    results = []
+    with tempfile.TemporaryDirectory(prefix="fconline_bench_queue_") as queue_dir:
+        crawl_batch = sharded_crawl_batch(
+            args.shards or args.workers, args.workers, lambda item: app._get_player_id_from_url(item['url']),
+            queue_dir=queue_dir, concurrency=args.shard_concurrency, worker_args=worker_args,
+        )
+        crawl_batch(items, results.append, {})
+    return [(result, sum(result.get("stage_timings", {}).values())) for result in results]
+
+
+ENGINES = {
+    "selenium": run_selenium_engine,
+    "http": run_http_engine,
+    "standalone": run_standalone_engine,
+    "sharded": run_sharded_engine,
+}
+
+
+# -------------------------------------------------------------
+# 벤치마크 한 번 실행 후 요약 반환
+def run_benchmark(args):
+    config = ProfileServerConfig(
+        latency=args.latency, jitter=args.jitter, record_latency=args.record_latency,
+        failure_rate=args.failure_rate, missing_rate=args.missing_rate,
+        slow_rate=args.slow_rate, slow_latency=args.slow_latency, asset_bytes=args.asset_bytes, seed=args.seed,
+    )
+    with ProfileServer(config) as server:
+        items = [
+            {"url": server.profile_url(str(FIRST_PLAYER_ID + i)), "annotation": f"bench {i}"}
+            for i in range(args.profiles)
+        ]
+        expected_failures = sum(
+            1 for i in range(args.profiles) if server.expected_failure(str(FIRST_PLAYER_ID + i))
+        )
+
+        with RssSampler() as sampler:
+            started = time.monotonic()
+            samples = ENGINES[args.engine](server, items, args)
+            wall_seconds = time.monotonic() - started
+        server_stats = dict(server.stats)
+
+    latencies = [seconds for _, seconds in samples]
+    failed = sum(1 for result, _ in samples if "error" in result)
+    page_bytes = [result["page_bytes"] for result, _ in samples if isinstance(result.get("page_bytes"), int)]
+    return {
+        "engine": args.engine,
+        "run_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "profiles": args.profiles,
+        "workers": args.workers,
+        "browser_profile": args.browser_profile if args.engine != "http" else None,
+        "completed": len(samples),
+        "success": len(samples) - failed,
+        "failed": failed,
+        "expected_failures": expected_failures,
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_per_second": round(len(samples) / wall_seconds, 3) if wall_seconds > 0 else None,
+        "latency_p50": round(percentile(latencies, 50), 3) if latencies else None,
+        "latency_p99": round(percentile(latencies, 99), 3) if latencies else None,
+        "latency_max": round(max(latencies), 3) if latencies else None,
+        "page_bytes_avg": round(sum(page_bytes) / len(page_bytes)) if page_bytes else None,
+        "peak_chrome_rss_mb": round(sampler.peak / (1024 * 1024), 1) if sampler.supported else None,
+        "server": server_stats,
+        "config": vars(config),
+    }
+
+
+def _print_summary(summary):
+    print("\n--- 벤치마크 결과 ---")
+    print(f"엔진: {summary['engine']} (동시 작업 {summary['workers']})")
+    print(f"프로필: {summary['completed']}/{summary['profiles']} 처리, 성공 {summary['success']}, "
+          f"실패 {summary['failed']} (주입된 실패 {summary['expected_failures']})")
+    print(f"전체 소요 시간: {summary['wall_seconds']}초, 처리량: {summary['throughput_per_second']} 프로필/초")
+    print(f"프로필당 지연: p50 {summary['latency_p50']}초, p99 {summary['latency_p99']}초, 최대 {summary['latency_max']}초")
+    if summary['page_bytes_avg'] is not None:
+        print(f"페이지당 평균 전송량: {summary['page_bytes_avg']} 바이트 (브라우저 설정: {summary['browser_profile']})")
+    print(f"서버 응답 총량: {summary['server']['bytes_sent']} 바이트 ({summary['server']['requests']}건)")
+    rss = summary['peak_chrome_rss_mb']
+    print(f"Chrome 최대 RSS: {rss} MB" if rss is not None else "Chrome 최대 RSS: 측정 불가")
+    print("------------------")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 프로필 서버를 사용한 오프라인 크롤링 벤치마크")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="selenium")
+    parser.add_argument("--profiles", type=int, default=20, help="가상 프로필 수")
+    parser.add_argument("--workers", type=int, default=3, help="동시 작업 수 (standalone 엔진은 탭 수)")
+    parser.add_argument("--browser-profile", choices=["lean", "full"], default="lean",
+                        help="selenium/standalone 엔진의 Chrome 설정 (browser_profile.py)")
+    parser.add_argument("--shards", type=int, default=0, help="sharded 엔진의 샤드 수 (기본: --workers 와 같음)")
+    parser.add_argument("--shard-concurrency", type=int, default=2, help="sharded 엔진의 워커당 동시 작업 수")
+    parser.add_argument("--shard-engine", choices=["selenium", "http"], default="selenium",
+                        help="sharded 엔진의 워커가 사용할 크롤링 엔진")
+    parser.add_argument("--attempts", type=int, default=1, help="프로필당 최대 시도 횟수")
+    parser.add_argument("--latency", type=float, default=0.0, help="모든 응답의 기본 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="응답마다 더할 무작위 지연 상한 (초)")
+    parser.add_argument("--record-latency", type=float, default=0.3, help="감독 모드 전적 요청 지연 (초)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="500 응답을 받을 프로필 비율")
+    parser.add_argument("--missing-rate", type=float, default=0.0, help="감독 모드 전적이 없는 프로필 비율")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="전적 요청이 느린 프로필 비율")
+    parser.add_argument("--slow-latency", type=float, default=5.0, help="느린 프로필의 전적 요청 지연 (초)")
+    parser.add_argument("--asset-bytes", type=int, default=50_000, help="이미지/폰트 리소스 하나의 크기 (바이트)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=BENCH_RESULTS_FILE, help="결과를 한 줄씩 추가할 JSONL 파일")
+    args = parser.parse_args(argv)
+
+    summary = run_benchmark(args)
+    _print_summary(summary)
+    if args.output:
+        with open(args.output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+        print(f"결과가 '{args.output}' 파일에 추가되었습니다.")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import os
+from selenium.webdriver.chrome.options import Options
+
+# -------------------------------------------------------------
+# 크롤링용 Chrome 설정
+#  - "full": 기존과 같은 기본 설정 (페이지의 모든 리소스를 받음)
+#  - "lean": 전적/구단주명 텍스트를 읽는 데 필요 없는 리소스를 받지 않는 가벼운 설정
+#      * 이미지 로딩 끔, pageLoadStrategy=eager (DOM 준비되면 바로 진행)
+#      * CDP Network.setBlockedURLs 로 이미지/폰트/미디어/광고·분석 스크립트 요청 차단
+#      * 풀의 모든 드라이버가 같은 디스크 캐시 폴더를 사용 (공통 CSS/JS를 한 번만 받음)
+#    드롭다운/감독 모드 탭의 표시 여부(클릭 가능 여부)가 CSS에 달려 있으므로 사이트 CSS/JS는 막지 않음
+# -------------------------------------------------------------
+
+PROFILE_FULL = "full"
+PROFILE_LEAN = "lean"
+
+# 차단할 요청 URL 패턴 ('*' 와일드카드)
+BLOCKED_URL_PATTERNS = [
+    # 이미지
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp",
+    # 폰트
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # 동영상/오디오
+    "*.mp4", "*.webm", "*.mp3",
+    # 광고/분석
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*googleadservices.com*", "*facebook.net*",
+    "*connect.facebook.*", "*wcs.naver.net*", "*analytics.*", "*hotjar.com*", "*criteo.*",
+]
+
+# 공유 디스크 캐시 최대 크기 (바이트)
+DISK_CACHE_SIZE = 200 * 1024 * 1024
+
+
+# -------------------------------------------------------------
+# Chrome 옵션 생성
+def build_chrome_options(profile=PROFILE_FULL, cache_dir=None):
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920x1080")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+
+    if profile == PROFILE_LEAN:
+        options.page_load_strategy = "eager"
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-background-networking")
+        options.add_argument("--mute-audio")
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            options.add_argument(f"--disk-cache-dir={os.path.abspath(cache_dir)}")
+            options.add_argument(f"--disk-cache-size={DISK_CACHE_SIZE}")
+    elif profile != PROFILE_FULL:
+        raise ValueError(f"알 수 없는 브라우저 프로필입니다: {profile}")
+    return options
+
+
+# -------------------------------------------------------------
+# 드라이버 생성 직후 호출: lean 프로필이면 CDP로 불필요한 요청 차단
+def apply_request_blocking(driver, profile=PROFILE_FULL):
+    if profile != PROFILE_LEAN:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
+
+# 현재 페이지에서 받은 데이터량과 로드 시간 (Resource Timing API 기준)
+# transferSize는 캐시에서 읽은 리소스는 0, Timing-Allow-Origin 이 없는 다른 도메인 리소스도 0으로 집계됨
+_TRANSFER_STATS_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var bytes = nav ? (nav.transferSize || 0) : 0;
+for (var i = 0; i < resources.length; i++) { bytes += resources[i].transferSize || 0; }
+return {
+    bytes: bytes,
+    requests: resources.length + (nav ? 1 : 0),
+    dom_content_loaded: nav ? nav.domContentLoadedEventEnd / 1000 : null
+};
+"""
+
+
+def page_transfer_stats(driver):
+    try:
+        return driver.execute_script(_TRANSFER_STATS_SCRIPT)
+    except Exception:
+        return None
@@ -0,0 +1,151 @@
+import threading
+import uuid
+import json
+import time
+from datetime import datetime
+
+# -------------------------------------------------------------
+# 백그라운드 크롤링 작업 관리
+#  - POST /crawl 은 작업 ID만 바로 돌려주고, 실제 크롤링은 백그라운드 스레드에서 실행
+#  - 동시에 하나의 작업만 실행 (실행 중에 다시 요청하면 기존 작업 ID를 돌려줌)
+#  - 진행 상황은 이벤트 목록에 쌓이고, SSE 스트림으로 순서대로 전달
+# -------------------------------------------------------------
+
+# 완료된 작업을 몇 개까지 메모리에 보관할지
+MAX_FINISHED_JOBS = 20
+
+# SSE 연결 유지용 주석을 보내는 간격 (초) - 프록시 타임아웃 방지
+SSE_HEARTBEAT_SECONDS = 15
+
+
+class CrawlJob:
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = "queued"  # queued -> running -> success / error
+        self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.started_at = None
+        self.finished_at = None
+        self.total = 0
+        self.completed = 0
+        self.message = ""
+        self.result = None
+        self._events = []
+        self._cond = threading.Condition()
+
+    # ---------------------------------------------------------
+    # 이벤트 기록 (대기 중인 SSE 스트림을 깨움)
+    def publish(self, event, data):
+        with self._cond:
+            self._events.append((event, data))
+            self._cond.notify_all()
+
+    def set_total(self, total):
+        self.total = total
+        self.publish("start", {"total": total})
+
+    def report_progress(self, data):
+        with self._cond:
+            self.completed += 1
+            payload = dict(data, completed=self.completed, total=self.total)
+        self.publish("progress", payload)
+
+    @property
+    def finished(self):
+        return self.status in ("success", "error")
+
+    def to_dict(self, include_result=False):
+        job_dict = {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "total": self.total,
+            "completed": self.completed,
+            "message": self.message,
+        }
+        if include_result and self.result is not None:
+            job_dict["result"] = self.result
+        return job_dict
+
+    # ---------------------------------------------------------
+    # SSE 스트림 생성기: 지금까지의 이벤트를 먼저 보내고, 작업이 끝날 때까지 새 이벤트를 전달
+    def stream(self):
+        index = 0
+        while True:
+            with self._cond:
+                if index >= len(self._events):
+                    self._cond.wait(timeout=SSE_HEARTBEAT_SECONDS)
+                pending = self._events[index:]
+                index += len(pending)
+
+            if not pending:
+                yield ": heartbeat\n\n"
+            for event, data in pending:
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+                # 모든 작업은 마지막에 반드시 'done' 이벤트를 남김
+                if event == "done":
+                    return
+
+
+class CrawlJobManager:
+    def __init__(self):
+        self._jobs = {}
+        self._order = []
+        self._active = None
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------
+    # 작업 시작. 이미 실행 중인 작업이 있으면 새로 만들지 않고 그 작업을 돌려줌
+    # 반환값: (작업, 새로 만들었는지 여부)
+    def submit(self, runner, *args):
+        with self._lock:
+            if self._active is not None and not self._active.finished:
+                return self._active, False
+
+            job = CrawlJob(uuid.uuid4().hex[:12])
+            self._jobs[job.id] = job
+            self._order.append(job.id)
+            self._active = job
+            self._trim()
+
+        thread = threading.Thread(target=self._run, args=(job, runner, args), name=f"crawl-job-{job.id}", daemon=True)
+        thread.start()
+        return job, True
+
+    def _run(self, job, runner, args):
+        job.status = "running"
+        job.started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        started = time.monotonic()
+        try:
+            job.result = runner(job, *args)
+            job.message = job.result.get("message", "")
+            status = "error" if job.result.get("status") == "error" else "success"
+        except Exception as e:
+            print(f"크롤링 작업({job.id}) 실행 중 오류 발생: {e}")
+            job.message = f"크롤링 작업 실행 중 오류: {e}"
+            status = "error"
+        job.finished_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        job.status = status
+        # 스트림은 'done' 이벤트를 받으면 종료되므로, 상태를 먼저 바꾼 뒤 마지막 이벤트를 보냄
+        job.publish("done", {
+            "status": status,
+            "message": job.message,
+            "elapsed_seconds": round(time.monotonic() - started, 1),
+        })
+
+    def _trim(self):
+        finished_ids = [job_id for job_id in self._order if self._jobs[job_id].finished]
+        for job_id in finished_ids[:max(0, len(finished_ids) - MAX_FINISHED_JOBS)]:
+            self._order.remove(job_id)
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active(self):
+        with self._lock:
+            if self._active is not None and not self._active.finished:
+                return self._active
+            return None
@@ -0,0 +1,130 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+# -------------------------------------------------------------
+# 크롤링 회차 기록(저널) - 중단된 크롤링 이어서 하기
+#  - 프로필 하나가 끝날 때마다 결과를 JSONL 파일에 한 줄씩 바로 추가
+#  - fsync는 FSYNC_BATCH_SIZE 건 또는 FSYNC_INTERVAL_SECONDS 초마다 한 번씩 묶어서 수행
+#  - 크롤링이 정상 종료되면 저널 파일을 지우고, 도중에 죽으면 파일이 남음
+#  - 다음 크롤링은 남은 저널을 읽어 이미 성공한 player_id는 건너뛰고 실패한 것만 다시 크롤링
+# -------------------------------------------------------------
+
+# 저널 파일 경로
+JOURNAL_FILE = "crawl_journal.jsonl"
+
+# fsync 묶음 단위 (건수 / 초)
+FSYNC_BATCH_SIZE = 10
+FSYNC_INTERVAL_SECONDS = 2.0
+
+# 이보다 오래된 저널은 이어서 하지 않고 버림 (너무 오래된 결과를 재사용하지 않도록)
+RESUME_MAX_AGE_HOURS = 12
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 저널 파일 읽기 -> (헤더 dict 또는 None, 결과 dict 리스트)
+# 마지막 줄이 쓰다 만 상태로 잘려 있을 수 있으므로 읽을 수 없는 줄은 무시
+def read_journal(path):
+    header = None
+    results = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("type") == "run":
+                    header = record
+                elif record.get("type") == "result" and isinstance(record.get("result"), dict):
+                    results.append(record["result"])
+    except OSError:
+        pass
+    return header, results
+
+
+class CrawlJournal:
+    def __init__(self, path=JOURNAL_FILE, run_id=None, now=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._latest = {}  # player_id -> 마지막으로 기록된 결과
+
+        now = now or datetime.now()
+        header, results = read_journal(path) if os.path.exists(path) else (None, [])
+        self.resumed_from = None
+        if header and self._resumable(header, now):
+            # 이전 회차가 끝나지 않고 남긴 저널 -> 이어서 기록
+            self.resumed_from = header.get("run_id")
+            for result in results:
+                if result.get("player_id"):
+                    self._latest[result["player_id"]] = result
+            self._file = open(path, 'a', encoding='utf-8')
+        else:
+            if header:
+                print(f"오래된 크롤링 저널({header.get('started_at')})은 이어서 하지 않고 새로 시작합니다.")
+            self._file = open(path, 'w', encoding='utf-8')
+            self._write({"type": "run", "run_id": run_id, "started_at": now.strftime(TIME_FORMAT)})
+            self.sync()
+
+    @staticmethod
+    def _resumable(header, now):
+        try:
+            started_at = datetime.strptime(header["started_at"], TIME_FORMAT)
+        except (KeyError, TypeError, ValueError):
+            return False
+        return now - started_at <= timedelta(hours=RESUME_MAX_AGE_HOURS)
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    # ---------------------------------------------------------
+    # 결과 한 건 기록 (파일에는 바로 쓰고, fsync는 묶어서)
+    def append(self, result):
+        with self._lock:
+            self._write({"type": "result", "result": result})
+            self._file.flush()
+            if result.get("player_id"):
+                self._latest[result["player_id"]] = dict(result)
+            self._pending += 1
+            if self._pending >= FSYNC_BATCH_SIZE or time.monotonic() - self._last_sync >= FSYNC_INTERVAL_SECONDS:
+                self._sync_locked()
+
+    def sync(self):
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    # ---------------------------------------------------------
+    # 이전 시도에서 이미 성공한 player_id (다시 크롤링하지 않음)
+    def completed_ids(self):
+        return {player_id for player_id, result in self._latest.items() if "error" not in result}
+
+    # 저널에 기록된 결과 중 주어진 player_id들의 마지막 결과 (병합 단계 입력)
+    def results_for(self, player_ids):
+        return [dict(self._latest[player_id]) for player_id in player_ids if player_id in self._latest]
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._sync_locked()
+            self._file.close()
+
+    # 크롤링이 끝까지 완료되면 저널 삭제 (다음 회차는 처음부터)
+    def complete(self):
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError as e:
+            print(f"크롤링 저널 삭제 중 오류 발생: {e}")
@@ -0,0 +1,67 @@
+import json
+import urllib.error
+import urllib.request
+
+from flask import Blueprint, Response, request
+
+# -------------------------------------------------------------
+# 웹 워커 -> 크롤링 서비스 요청 전달
+#  - 웹 페이지만 제공하는 프로세스(역할 "web")는 크롤링을 직접 실행하지 않고,
+#    '/crawl...', '/metrics' 요청을 크롤링 서비스(역할 "crawler", 한 프로세스)로 그대로 넘김
+#  - 브라우저 입장에서는 주소가 같으므로 index.html/script.js 는 그대로 사용
+#  - 진행 상황 스트림(SSE)은 받는 대로 바로 흘려보냄
+# -------------------------------------------------------------
+
+# 일반 요청 타임아웃 (초). SSE는 하트비트 간격보다 길어야 함
+REQUEST_TIMEOUT = 30
+STREAM_TIMEOUT = 60
+
+# 그대로 전달할 응답 헤더
+_FORWARD_HEADERS = ("Content-Type", "Cache-Control", "X-Accel-Buffering", "ETag", "Last-Modified")
+
+
+def _error_response(status, message):
+    body = json.dumps({"status": "error", "message": message}, ensure_ascii=False)
+    return Response(body, status=status, mimetype="application/json")
+
+
+def make_proxy_blueprint(service_url):
+    proxy = Blueprint('crawl_proxy', __name__)
+
+    @proxy.route('/crawl', methods=['POST'])
+    @proxy.route('/crawl/<path:subpath>', methods=['GET', 'POST'])
+    @proxy.route('/metrics')
+    def forward(subpath=None):
+        upstream_url = service_url.rstrip('/') + request.full_path.rstrip('?')
+        headers = {"Accept": request.headers.get("Accept", "*/*")}
+        data = None
+        if request.method == 'POST':
+            data = request.get_data()
+            headers["Content-Type"] = request.headers.get("Content-Type", "application/json")
+        streaming = request.path.endswith('/events')
+        upstream_request = urllib.request.Request(upstream_url, data=data, headers=headers, method=request.method)
+        try:
+            upstream = urllib.request.urlopen(upstream_request,
+                                              timeout=STREAM_TIMEOUT if streaming else REQUEST_TIMEOUT)
+        except urllib.error.HTTPError as e:
+            upstream = e
+        except (urllib.error.URLError, OSError) as e:
+            print(f"크롤링 서비스({service_url}) 연결 실패: {e}")
+            return _error_response(503, "크롤링 서비스에 연결할 수 없습니다. 잠시 후 다시 시도해 주세요.")
+
+        response_headers = {name: upstream.headers[name] for name in _FORWARD_HEADERS if upstream.headers.get(name)}
+        if not streaming:
+            with upstream:
+                return Response(upstream.read(), status=upstream.status, headers=response_headers)
+
+        def stream():
+            with upstream:
+                while True:
+                    line = upstream.readline()
+                    if not line:
+                        return
+                    yield line
+
+        return Response(stream(), status=upstream.status, headers=response_headers)
+
+    return proxy
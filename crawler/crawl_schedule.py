@@ -0,0 +1,174 @@
+import json
+import os
+import random
+import threading
+from datetime import datetime, timedelta
+
+from output_writer import write_json_atomic
+
+# -------------------------------------------------------------
+# 정해진 간격으로 크롤링을 시작하는 백그라운드 스케줄러
+#  - 매 CRAWL_INTERVAL_MINUTES 분마다 크롤링 (시작 시각에 0~JITTER 초의 무작위 지연을 더해 요청을 분산)
+#  - 조용한 시간(QUIET_HOURS)에는 크롤링하지 않고, 끝나는 시각으로 다음 크롤링을 미룸
+#  - 평소에는 '가벼운' 크롤링: 최근 전적이 바뀐 감독(과 재크롤링 목록)만 크롤링하고,
+#    한동안 변동이 없는 감독의 재확인은 미룸
+#  - 이용자가 적은 시간대(DEEP_REFRESH_HOURS)에는 하루 한 번 '전체' 크롤링으로 변동 없는 감독까지 모두 갱신
+#  - 수동 크롤링('/crawl')과 같은 작업 관리자를 쓰므로 동시에 두 크롤링이 돌지 않음
+#    (이미 크롤링 중이면 이번 예약 크롤링은 건너뜀)
+# -------------------------------------------------------------
+
+# 크롤링 간격 (분)
+CRAWL_INTERVAL_MINUTES = 60
+
+# 시작 시각에 더할 무작위 지연 상한 (초)
+JITTER_SECONDS = 300
+
+# 크롤링하지 않는 시간대 (시작 시, 끝 시) - 끝 시각은 포함하지 않음, 자정을 넘겨도 됨 (예: (23, 6))
+QUIET_HOURS = (3, 7)
+
+# 하루 한 번 전체 크롤링을 하는 시간대 (시작 시, 끝 시)
+DEEP_REFRESH_HOURS = (7, 11)
+
+# 마지막 실행 정보를 남기는 파일 (앱을 다시 켜도 오늘 전체 크롤링을 했는지 기억)
+SCHEDULE_STATE_FILE = "crawl_schedule_state.json"
+
+MODE_LIGHT = "light"
+MODE_DEEP = "deep"
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 시각이 (시작 시, 끝 시) 시간대 안에 있는지 (자정을 넘기는 시간대 포함)
+def in_hours(moment, hours):
+    if not hours:
+        return False
+    start, end = hours
+    if start == end:
+        return False
+    if start < end:
+        return start <= moment.hour < end
+    return moment.hour >= start or moment.hour < end
+
+
+# 시간대가 끝나는 다음 시각
+def hours_end(moment, hours):
+    end = moment.replace(hour=hours[1], minute=0, second=0, microsecond=0)
+    if end <= moment:
+        end += timedelta(days=1)
+    return end
+
+
+class CrawlSchedule:
+    # submit(mode) -> (작업, 새로 시작했는지 여부). 크롤링 대상이 없으면 (None, False)
+    def __init__(self, submit, interval_minutes=CRAWL_INTERVAL_MINUTES, jitter_seconds=JITTER_SECONDS,
+                 quiet_hours=QUIET_HOURS, deep_refresh_hours=DEEP_REFRESH_HOURS, state_path=SCHEDULE_STATE_FILE):
+        self.submit = submit
+        self.interval = timedelta(minutes=interval_minutes)
+        self.jitter_seconds = jitter_seconds
+        self.quiet_hours = quiet_hours
+        self.deep_refresh_hours = deep_refresh_hours
+        self.state_path = state_path
+        self.next_run_at = None
+        self.state = {}
+        if os.path.exists(state_path):
+            try:
+                with open(state_path, 'r', encoding='utf-8') as f:
+                    self.state = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"경고: 스케줄러 상태 파일을 읽지 못했습니다: {e}")
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+    # ---------------------------------------------------------
+    def start(self):
+        if self._thread is not None:
+            return self
+        self.next_run_at = self._next_time(datetime.now())
+        self._thread = threading.Thread(target=self._loop, name="crawl-schedule", daemon=True)
+        self._thread.start()
+        print(f"[예약 크롤링] {self.interval.total_seconds() / 60:.0f}분 간격으로 실행합니다. "
+              f"다음 실행: {self.next_run_at.strftime(TIME_FORMAT)}")
+        return self
+
+    def stop(self):
+        self._stopped = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    # 다음 실행 시각: 기준 시각 + 간격 + 지터, 조용한 시간대면 끝나는 시각 + 지터
+    def _next_time(self, now):
+        jitter = timedelta(seconds=random.uniform(0, self.jitter_seconds))
+        candidate = now + self.interval + jitter
+        if in_hours(candidate, self.quiet_hours):
+            candidate = hours_end(candidate, self.quiet_hours) + jitter
+        return candidate
+
+    # 이번 실행 종류: 전체 크롤링 시간대이고 오늘 아직 전체 크롤링을 하지 않았으면 전체, 아니면 가벼운 크롤링
+    def mode_for(self, now):
+        if in_hours(now, self.deep_refresh_hours) and self.state.get("last_deep_date") != now.strftime("%Y-%m-%d"):
+            return MODE_DEEP
+        return MODE_LIGHT
+
+    def _loop(self):
+        while not self._stopped:
+            wait = (self.next_run_at - datetime.now()).total_seconds()
+            if wait > 0:
+                self._wakeup.wait(wait)
+                self._wakeup.clear()
+                continue
+            self.run_once(datetime.now())
+            self.next_run_at = self._next_time(datetime.now())
+
+    # ---------------------------------------------------------
+    # 예약 크롤링 한 번 (조용한 시간대면 건너뜀)
+    def run_once(self, now):
+        if in_hours(now, self.quiet_hours):
+            return None
+        mode = self.mode_for(now)
+        try:
+            job, created = self.submit(mode)
+        except Exception as e:
+            print(f"[예약 크롤링] 크롤링 시작 중 오류 발생: {e}")
+            return None
+        if job is None:
+            print("[예약 크롤링] 크롤링할 URL이 없어 건너뜁니다.")
+            return None
+        if not created:
+            print(f"[예약 크롤링] 이미 진행 중인 크롤링({job.id})이 있어 이번 예약 크롤링은 건너뜁니다.")
+            return None
+
+        print(f"[예약 크롤링] {'전체' if mode == MODE_DEEP else '가벼운'} 크롤링을 시작했습니다. (작업 {job.id})")
+        self.state["last_run_at"] = now.strftime(TIME_FORMAT)
+        self.state["last_job_id"] = job.id
+        self.state["last_mode"] = mode
+        if mode == MODE_DEEP:
+            self.state["last_deep_date"] = now.strftime("%Y-%m-%d")
+        self._save_state()
+        return job
+
+    # 임시 파일에 쓴 뒤 교체 (저장 도중 중단되어 마지막 실행 시각을 잃으면 예정에 없던 전체 크롤링이 시작되므로)
+    def _save_state(self):
+        try:
+            write_json_atomic(self.state_path, self.state, indent=2)
+        except OSError as e:
+            print(f"스케줄러 상태 저장 중 오류 발생: {e}")
+
+    def to_dict(self):
+        return {
+            "enabled": self.running,
+            "interval_minutes": self.interval.total_seconds() / 60,
+            "jitter_seconds": self.jitter_seconds,
+            "quiet_hours": list(self.quiet_hours) if self.quiet_hours else None,
+            "deep_refresh_hours": list(self.deep_refresh_hours) if self.deep_refresh_hours else None,
+            "next_run_at": self.next_run_at.strftime(TIME_FORMAT) if self.next_run_at else None,
+            "next_mode": self.mode_for(self.next_run_at) if self.next_run_at else None,
+            **self.state,
+        }
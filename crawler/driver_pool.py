@@ -0,0 +1,132 @@
+import threading
+import queue
+import time
+
+# -------------------------------------------------------------
+# 재사용 가능한 Selenium 드라이버 풀
+#  - URL마다 Chrome을 새로 띄우고 종료하던 방식을 대신해, 미리 띄운 드라이버를 빌려주고 돌려받음
+#  - 반납 시 쿠키/스토리지를 정리하고 빈 페이지로 돌려놓아 다음 프로필에 상태가 넘어가지 않게 함
+#  - 일정 횟수 사용했거나 오류(크래시)가 난 드라이버는 종료하고 새로 띄움
+# -------------------------------------------------------------
+
+# 드라이버 하나를 최대 몇 개의 프로필에 재사용할지 (메모리 누수 방지용)
+DEFAULT_MAX_USES = 20
+
+
+class _PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.time()
+
+
+class DriverPool:
+    def __init__(self, factory, size, max_uses=DEFAULT_MAX_USES):
+        self._factory = factory
+        self._size = size
+        self._max_uses = max_uses
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(size)
+        self._closed = False
+        self._stats = {
+            "acquired": 0,   # 드라이버를 빌려준 총 횟수
+            "hits": 0,       # 이미 떠 있는 드라이버를 재사용한 횟수
+            "launches": 0,   # Chrome을 새로 띄운 횟수
+            "recycled": 0,   # 사용 횟수 초과로 교체한 횟수
+            "discarded": 0,  # 오류/리셋 실패로 버린 횟수
+        }
+
+    # ---------------------------------------------------------
+    # 드라이버 대여 (풀이 가득 차 있으면 반납될 때까지 대기)
+    def acquire(self, timeout=None):
+        if self._closed:
+            raise RuntimeError("드라이버 풀이 이미 종료되었습니다.")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("사용 가능한 드라이버를 기다리다 시간이 초과되었습니다.")
+
+        try:
+            pooled = self._idle.get_nowait()
+            self._count("hits")
+        except queue.Empty:
+            try:
+                pooled = _PooledDriver(self._factory())
+            except Exception:
+                self._slots.release()
+                raise
+            self._count("launches")
+
+        pooled.uses += 1
+        self._count("acquired")
+        return pooled
+
+    # ---------------------------------------------------------
+    # 드라이버 반납 (broken=True 이면 재사용하지 않고 종료)
+    def release(self, pooled, broken=False):
+        try:
+            if self._closed or broken:
+                self._quit(pooled)
+                self._count("discarded")
+                return
+
+            if pooled.uses >= self._max_uses:
+                self._quit(pooled)
+                self._count("recycled")
+                return
+
+            if not self._reset(pooled):
+                self._quit(pooled)
+                self._count("discarded")
+                return
+
+            self._idle.put(pooled)
+        finally:
+            self._slots.release()
+
+    # ---------------------------------------------------------
+    # 다음 프로필에 상태가 넘어가지 않도록 쿠키/스토리지 정리
+    def _reset(self, pooled):
+        driver = pooled.driver
+        try:
+            driver.delete_all_cookies()
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            # 팝업 등으로 열린 추가 창은 닫고 첫 창만 남김
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            print(f"  [드라이버 풀] 드라이버 초기화 실패, 교체합니다: {e}")
+            return False
+
+    def _quit(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            print(f"  [드라이버 풀] 드라이버 종료 중 오류 (무시): {e}")
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["idle"] = self._idle.qsize()
+        stats["size"] = self._size
+        return stats
+
+    # ---------------------------------------------------------
+    # 풀 종료: 대기 중인 드라이버를 모두 종료 (대여 중인 드라이버는 반납 시 종료됨)
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(pooled)
+
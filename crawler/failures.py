@@ -0,0 +1,278 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+
+from output_writer import write_json_atomic
+
+# -------------------------------------------------------------
+# 크롤링 실패 분류, 서킷 브레이커, 실패한 플레이어 재크롤링 목록
+#  - 오류를 종류별로 나눔: 대기 시간 초과 / 요소 없음 / 전적 파싱 실패 / 드라이버 크래시 / HTTP 오류
+#  - 종류마다 재시도 횟수를 다르게 둠 (파싱 실패는 다시 해도 같은 경우가 많으므로 적게)
+#  - 사이트 장애처럼 보이는 실패(시간 초과, 크래시, HTTP 오류)가 최근 요청 중 일정 비율을 넘으면
+#    새 크롤링을 잠시 멈추고(open), 쉬었다가 몇 건만 시험해 보고(half-open), 계속 실패하면 회차를 중단
+#  - 최종 실패했거나 중단으로 크롤링하지 못한 플레이어는 재크롤링 목록에 남겨 따로 다시 크롤링
+# -------------------------------------------------------------
+
+TIMEOUT = "timeout"
+ELEMENT_NOT_FOUND = "element_not_found"
+PARSE_FAILURE = "parse_failure"
+DRIVER_CRASH = "driver_crash"
+HTTP_ERROR = "http_error"
+CIRCUIT_OPEN = "circuit_open"
+UNKNOWN = "unknown"
+
+# 오류 종류별 최대 시도 횟수 (첫 시도 포함)
+RETRY_BUDGETS = {
+    TIMEOUT: 2,
+    ELEMENT_NOT_FOUND: 2,
+    PARSE_FAILURE: 1,
+    DRIVER_CRASH: 3,
+    HTTP_ERROR: 3,
+    CIRCUIT_OPEN: 1,
+    UNKNOWN: 2,
+}
+
+# 사이트 장애로 볼 오류 종류 (서킷 브레이커 집계 대상)
+OUTAGE_CLASSES = {TIMEOUT, DRIVER_CRASH, HTTP_ERROR}
+
+# 서킷 브레이커 설정
+BREAKER_WINDOW = 20             # 최근 몇 건의 결과로 실패율을 볼지
+BREAKER_MIN_SAMPLES = 8         # 이 건수 이상 쌓여야 판단
+BREAKER_FAILURE_RATIO = 0.6     # 장애성 실패 비율이 이 값 이상이면 멈춤
+BREAKER_COOLDOWN_SECONDS = 60   # 멈춘 뒤 다시 시험해 보기까지 대기 시간
+BREAKER_PROBES = 2              # half-open 상태에서 시험할 건수
+BREAKER_MAX_TRIPS = 3           # 이 횟수만큼 멈추면 이번 회차는 중단
+
+# 재크롤링 목록 파일
+RECRAWL_QUEUE_FILE = "crawl_recrawl_queue.json"
+
+PARSE_FAILURE_MESSAGE = "전적 정보 찾기 실패"
+
+# 감독 모드 탭을 눌러도 전적 텍스트가 바뀌지 않은 경우 (화면에는 클릭 전 공식 경기 전적이 남아 있음)
+RECORD_UNCHANGED_MESSAGE = "감독 모드 전적 변경 감지 시간 초과"
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_DRIVER_CRASH_PATTERN = re.compile(
+    r'invalid session id|chrome not reachable|disconnected|session deleted|tab crashed|'
+    r'target window already closed|no such window|crashed|connection refused|max retries exceeded',
+    re.IGNORECASE,
+)
+_TIMEOUT_PATTERN = re.compile(r'timeout|timed out|시간 초과', re.IGNORECASE)
+_ELEMENT_PATTERN = re.compile(r'no such element|unable to locate|stale element|not clickable|not interactable',
+                              re.IGNORECASE)
+_HTTP_PATTERN = re.compile(r'\b(429|5\d\d)\b|too many requests|service unavailable')
+
+
+# -------------------------------------------------------------
+# 예외 -> 오류 종류 (selenium/requests 를 직접 import 하지 않고 예외 클래스 이름으로 판단)
+def classify_exception(exc):
+    names = {cls.__name__ for cls in type(exc).__mro__}
+    if "RecordParseError" in names:
+        return PARSE_FAILURE
+    if names & {"InvalidSessionIdException", "NoSuchWindowException"}:
+        return DRIVER_CRASH
+    if names & {"NoSuchElementException", "StaleElementReferenceException",
+                "ElementNotInteractableException", "ElementClickInterceptedException"}:
+        return ELEMENT_NOT_FOUND
+    if names & {"TimeoutException", "Timeout", "TimeoutError", "ReadTimeout", "ConnectTimeout"}:
+        return TIMEOUT
+    if "HTTPError" in names:
+        return HTTP_ERROR
+    return classify_error_message(str(exc))
+
+
+# 오류 메시지 문자열 -> 오류 종류 (저널 등에서 예외 없이 메시지만 남은 경우)
+def classify_error_message(message):
+    if not message:
+        return UNKNOWN
+    if PARSE_FAILURE_MESSAGE in message:
+        return PARSE_FAILURE
+    if _DRIVER_CRASH_PATTERN.search(message):
+        return DRIVER_CRASH
+    if _TIMEOUT_PATTERN.search(message):
+        return TIMEOUT
+    if _ELEMENT_PATTERN.search(message):
+        return ELEMENT_NOT_FOUND
+    if _HTTP_PATTERN.search(message):
+        return HTTP_ERROR
+    return UNKNOWN
+
+
+# 결과 dict의 오류 종류 (성공이면 None)
+def error_class_of(result):
+    if "error" not in result:
+        return None
+    return result.get("error_class") or classify_error_message(str(result.get("error")))
+
+
+def max_attempts_for(result, default):
+    error_class = error_class_of(result)
+    if error_class is None:
+        return default
+    return min(default, RETRY_BUDGETS.get(error_class, default))
+
+
+# -------------------------------------------------------------
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    ABORTED = "aborted"
+
+    def __init__(self, window=BREAKER_WINDOW, min_samples=BREAKER_MIN_SAMPLES, failure_ratio=BREAKER_FAILURE_RATIO,
+                 cooldown_seconds=BREAKER_COOLDOWN_SECONDS, probes=BREAKER_PROBES, max_trips=BREAKER_MAX_TRIPS):
+        self.min_samples = min_samples
+        self.failure_ratio = failure_ratio
+        self.cooldown_seconds = cooldown_seconds
+        self.probes = probes
+        self.max_trips = max_trips
+        self.state = self.CLOSED
+        self.trips = 0
+        self._recent = deque(maxlen=window)
+        self._opened_at = None
+        self._probes_left = 0
+        self._lock = threading.Lock()
+
+    @property
+    def aborted(self):
+        return self.state == self.ABORTED
+
+    # ---------------------------------------------------------
+    # 새 크롤링을 시작해도 되는지: 0이면 바로 진행, 양수면 그만큼 기다린 뒤 다시 확인, None이면 중단됨
+    def wait_seconds(self):
+        with self._lock:
+            if self.state == self.ABORTED:
+                return None
+            remaining = self._cooldown_remaining()
+            if remaining > 0:
+                return remaining
+            if self.state == self.HALF_OPEN:
+                if self._probes_left <= 0:
+                    return 1.0
+                self._probes_left -= 1
+            return 0
+
+    # 결과만 지켜보는 쪽(샤드 코디네이터)용: 대기가 끝났으면 반열림으로만 바꾸고 확인 시도 수는 쓰지 않음
+    # (반열림 상태에서 들어오는 다음 결과로 재개/재차단이 정해짐). 남은 대기 시간(초) 반환
+    def cooldown_remaining(self):
+        with self._lock:
+            return self._cooldown_remaining()
+
+    def _cooldown_remaining(self):
+        if self.state != self.OPEN:
+            return 0
+        remaining = self._opened_at + self.cooldown_seconds - time.monotonic()
+        if remaining > 0:
+            return remaining
+        self.state = self.HALF_OPEN
+        self._probes_left = self.probes
+        print(f"  [서킷 브레이커] 대기 종료, {self.probes}건으로 사이트 상태를 확인합니다.")
+        return 0
+
+    # 시도 결과 기록 (error_class가 None이면 성공)
+    def record(self, error_class):
+        with self._lock:
+            failed = error_class in OUTAGE_CLASSES
+            if self.state == self.HALF_OPEN:
+                if failed:
+                    self._trip()
+                else:
+                    print("  [서킷 브레이커] 사이트가 정상으로 돌아와 크롤링을 재개합니다.")
+                    self.state = self.CLOSED
+                    self._recent.clear()
+                return
+            if self.state != self.CLOSED:
+                return
+            self._recent.append(failed)
+            if len(self._recent) >= self.min_samples and sum(self._recent) / len(self._recent) >= self.failure_ratio:
+                self._trip()
+
+    def _trip(self):
+        self.trips += 1
+        self._recent.clear()
+        if self.trips >= self.max_trips:
+            self.state = self.ABORTED
+            print(f"  [서킷 브레이커] {self.trips}회 연속 장애로 이번 크롤링을 중단합니다. 남은 플레이어는 재크롤링 목록에 넣습니다.")
+        else:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            print(f"  [서킷 브레이커] 실패율이 높아 {self.cooldown_seconds}초 동안 새 크롤링을 멈춥니다. ({self.trips}/{self.max_trips})")
+
+    def to_dict(self):
+        with self._lock:
+            return {"state": self.state, "trips": self.trips}
+
+
+# -------------------------------------------------------------
+# 크롤링하지 못한 결과 (서킷 브레이커 중단 등)
+def circuit_open_result(base_result):
+    result = dict(base_result)
+    result["error"] = "사이트 장애로 크롤링을 중단해 처리하지 못했습니다."
+    result["error_class"] = CIRCUIT_OPEN
+    return result
+
+
+# -------------------------------------------------------------
+# 실패한 플레이어 재크롤링 목록 {player_id: {"url", "annotation", "league", "error_class", "failed_at", "failures"}}
+class RecrawlQueue:
+    def __init__(self, path=RECRAWL_QUEUE_FILE):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"경고: 재크롤링 목록 파일을 읽지 못했습니다: {e}")
+                self.entries = {}
+
+    # 임시 파일에 쓴 뒤 교체 (저장 도중 중단되거나 '/crawl/retry'가 동시에 읽어도 깨진 파일을 보지 않음)
+    def save(self):
+        try:
+            write_json_atomic(self.path, self.entries, indent=2)
+        except OSError as e:
+            print(f"재크롤링 목록 저장 중 오류 발생: {e}")
+
+    def __contains__(self, player_id):
+        return player_id in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, item, error_class, now):
+        player_id = item.get("player_id")
+        if not player_id:
+            return
+        previous = self.entries.get(player_id, {})
+        self.entries[player_id] = {
+            "url": item.get("url"),
+            "annotation": item.get("annotation", ""),
+            "league": item.get("league"),
+            "error_class": error_class,
+            "failed_at": now.strftime(TIME_FORMAT),
+            "failures": previous.get("failures", 0) + 1,
+        }
+
+    def remove(self, player_id):
+        self.entries.pop(player_id, None)
+
+    # 재크롤링용 리그별 항목 [(리그명, [{"url", "annotation", "league"}, ...]), ...] (리그 순서 유지)
+    def league_items(self, league_order):
+        by_league = {}
+        for entry in self.entries.values():
+            by_league.setdefault(entry.get("league"), []).append(
+                {"url": entry["url"], "annotation": entry.get("annotation", ""), "league": entry.get("league")}
+            )
+        ordered = [league for league in league_order if league in by_league]
+        ordered += [league for league in by_league if league not in ordered]
+        return [(league, by_league[league]) for league in ordered]
+
+    def counts_by_class(self):
+        counts = {}
+        for entry in self.entries.values():
+            counts[entry["error_class"]] = counts.get(entry["error_class"], 0) + 1
+        return counts
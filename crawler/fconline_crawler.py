@@ -1,186 +1,308 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options # Options 모듈 임포트 추가
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    JavascriptException, NoSuchElementException, StaleElementReferenceException, TimeoutException
+)
+from collections import deque
+from readiness import RECORD_PATTERN, POLL_INTERVAL, read_grade_text
+import argparse
+import sys
 import time
-import re
-import os
-import json
+import uuid
 
-# 웹드라이버 경로
-driver_path = "./chromedriver"
+import app
+import failures
+import metrics
+from crawl_jobs import CrawlJob
 
 # -------------------------------------------------------------
-# 처리할 URL 목록을 파일에서 읽어오기
+# 단독 실행용 크롤러 (CLI + 라이브러리)
+#  - Chrome 하나에 탭 여러 개를 열고, 각 탭의 크롤링 단계를 돌아가며(round-robin) 진행
+#    -> 한 탭이 페이지 로딩/전적 로딩을 기다리는 동안 다른 탭이 진행되어 Chrome 하나로 동시 처리
+#  - crawl_profiles(urls): URL 목록을 받아 결과 리스트를 반환 (app.py와 같은 결과 형식)
+#  - 명령줄 실행 시 app.py와 같은 병합/순위/저장 과정을 거쳐 결과 파일을 만듦
+#
+# 사용 예 (crawler 폴더에서 실행):
+#   python fconline_crawler.py                      # league*_urls.txt (없으면 urls.txt)
+#   python fconline_crawler.py --urls urls.txt --tabs 4
+#   python fconline_crawler.py --full-refresh
 # -------------------------------------------------------------
-url_file_name = "urls.txt"
-target_urls = []
 
-if not os.path.exists(url_file_name):
-    print(f"오류: '{url_file_name}' 파일을 찾을 수 없습니다. 파일을 생성하고 URL을 입력해 주세요.")
-    exit()
+# Chrome 하나에서 동시에 진행할 탭 수
+DEFAULT_TABS = 4
 
-try:
-    with open(url_file_name, 'r', encoding='utf-8') as f:
-        for line in f:
-            url = line.strip()
-            if url:
-                target_urls.append(url)
-except Exception as e:
-    print(f"URL 파일을 읽는 중 오류 발생: {e}")
-    exit()
+# 프로필 하나당 최대 시도 횟수 (실패한 프로필은 목록 끝에 다시 넣음, 오류 종류별 상한은 failures.RETRY_BUDGETS)
+MAX_ATTEMPTS = 2
 
-if not target_urls:
-    print(f"경고: '{url_file_name}' 파일에 유효한 URL이 없습니다.")
-    exit()
+# 단계별 최대 대기 시간 (초) - app.py의 _crawl_single_url과 같은 값
+PAGE_LOAD_TIMEOUT = 10 + 5
+ELEMENT_TIMEOUT = 5 + 5
+
+_PENDING_MARKER_SCRIPT = "window.__fconlineCrawlPending = true; window.location.href = arguments[0];"
+_NAVIGATED_SCRIPT = "return window.__fconlineCrawlPending !== true && document.readyState !== 'loading';"
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 조건을 한 번만 확인 (요소가 아직 없거나 페이지 이동 중이면 False)
+def _check(driver, condition):
+    try:
+        return condition(driver)
+    except (NoSuchElementException, StaleElementReferenceException, JavascriptException):
+        return False
+
+
+# 조건이 만족될 때까지 다른 탭에 차례를 넘기며 대기 (yield 한 번 = 차례 넘김)
+def _wait_until(driver, condition, timeout, description):
+    deadline = time.monotonic() + timeout
+    while True:
+        value = _check(driver, condition)
+        if value:
+            return value
+        if time.monotonic() >= deadline:
+            raise TimeoutException(f"{description} 대기 시간 초과 ({timeout}초)")
+        yield
+
+
+def _record_changed(previous_text):
+    def condition(driver):
+        elements = driver.find_elements(By.CLASS_NAME, "grade_desc")
+        if elements and elements[0].text != previous_text and RECORD_PATTERN.search(elements[0].text):
+            return elements[0]
+        return False
+    return condition
+
+
+# -------------------------------------------------------------
+# 탭 하나에서 프로필 하나를 처리하는 단계들 (제너레이터: 기다릴 때마다 yield)
+def _profile_steps(driver, item, current_url_data, stage_timings):
+    stage_started = time.monotonic()
+    # 페이지 이동은 기다리지 않고 시작만 함 (이전 페이지의 표식이 사라지면 새 페이지로 넘어간 것)
+    driver.execute_script(_PENDING_MARKER_SCRIPT, item['url'])
+    yield from _wait_until(driver, lambda d: d.execute_script(_NAVIGATED_SCRIPT), PAGE_LOAD_TIMEOUT, "페이지 이동")
+    stage_timings["page_load"] = time.monotonic() - stage_started
+
+    stage_started = time.monotonic()
+    yield from _wait_until(
+        driver, EC.presence_of_element_located((By.CLASS_NAME, "selector_wrap")), PAGE_LOAD_TIMEOUT, "프로필 팝업"
+    )
+    stage_timings["selector_wrap"] = time.monotonic() - stage_started
+
+    stage_started = time.monotonic()
+    league_selector_link = yield from _wait_until(
+        driver, EC.element_to_be_clickable((By.CLASS_NAME, "league")), ELEMENT_TIMEOUT, "리그 선택 드롭다운"
+    )
+    league_selector_link.click()
+    stage_timings["dropdown"] = time.monotonic() - stage_started
+
+    stage_started = time.monotonic()
+    manager_mode_tab = yield from _wait_until(
+        driver, EC.element_to_be_clickable((By.CSS_SELECTOR, "a[onclick='SetType(52);']")), ELEMENT_TIMEOUT, "감독 모드 탭"
+    )
+    previous_grade_text = read_grade_text(driver)
+    manager_mode_tab.click()
+    stage_timings["manager_tab"] = time.monotonic() - stage_started
+
+    # 전적 텍스트가 감독 모드 값으로 바뀌면 바로 진행
+    # 상한 시간까지 바뀌지 않으면 화면의 값은 클릭 전 공식 경기 전적이므로 사용하지 않고 실패로 기록
+    stage_started = time.monotonic()
+    try:
+        grade_desc_element = yield from _wait_until(
+            driver, _record_changed(previous_grade_text), app.MANAGER_RECORD_TIMEOUT, "감독 모드 전적"
+        )
+    except TimeoutException:
+        grade_desc_element = None
+    stage_timings["grade_desc"] = time.monotonic() - stage_started
+
+    match = RECORD_PATTERN.search(grade_desc_element.text) if grade_desc_element is not None else None
+    if grade_desc_element is None:
+        current_url_data["error"] = failures.RECORD_UNCHANGED_MESSAGE
+        current_url_data["error_class"] = failures.TIMEOUT
+    elif match:
+        app._apply_record(current_url_data, int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    else:
+        current_url_data["error"] = failures.PARSE_FAILURE_MESSAGE
+        current_url_data["error_class"] = failures.PARSE_FAILURE
+
+    stage_started = time.monotonic()
+    coach_name_element = yield from _wait_until(
+        driver, EC.presence_of_element_located((By.CLASS_NAME, "coach")), ELEMENT_TIMEOUT, "구단주명"
+    )
+    current_url_data["구단주명"] = coach_name_element.text
+    stage_timings["coach"] = time.monotonic() - stage_started
+
+
+class _TabTask:
+    def __init__(self, driver, item, attempt):
+        self.item = item
+        self.attempt = attempt
+        self.started = time.monotonic()
+        self.stage_timings = {}
+        self.result = app._new_result(item['url'], item.get('annotation', ""), item.get('league'))
+        self.steps = _profile_steps(driver, item, self.result, self.stage_timings)
+
+    def finish(self, error=None):
+        if error is not None:
+            self.result["error"] = str(error)
+            self.result["error_class"] = failures.classify_exception(error)
+        elif "error" in self.result:
+            # 단계에서 오류 종류를 정하지 않은 경우에만 기본값 (예: 전적 변경 감지 시간 초과는 TIMEOUT 유지)
+            self.result.setdefault("error_class", failures.PARSE_FAILURE)
+        self.result["attempts"] = self.attempt
+        self.stage_timings["total"] = time.monotonic() - self.started
+        for stage, seconds in self.stage_timings.items():
+            metrics.observe_stage(stage, seconds)
+        metrics.count_result(self.result.get("error_class", "success"))
+        self.result["stage_timings"] = {name: round(seconds, 3) for name, seconds in self.stage_timings.items()}
+        return self.result
 
-print(f"'{url_file_name}'에서 총 {len(target_urls)}개의 URL을 로드했습니다.")
 
 # -------------------------------------------------------------
-# 모든 URL에서 추출된 결과를 저장할 리스트 초기화
-all_results = []
-# 결과 요약 변수 추가
-success_count = 0
-fail_count = 0
+# 헬퍼 함수: URL 문자열 또는 {"url", "annotation", "league"} 항목을 항목 dict로 통일
+def _as_item(url_or_item):
+    if isinstance(url_or_item, dict):
+        return url_or_item
+    return {"url": url_or_item, "annotation": ""}
+
+
+# -------------------------------------------------------------
+# URL 목록 크롤링 -> 결과 리스트 (입력 순서대로)
+#  - driver를 주지 않으면 app.py와 같은 설정으로 Chrome을 띄우고 끝나면 종료
+#  - on_result(result): 프로필 하나가 최종 완료될 때마다 호출 (진행 상황 표시/저널 기록용)
+#  - breaker(failures.CircuitBreaker): 사이트 장애 시 새 프로필 시작을 멈추고, 중단되면 남은 프로필은 circuit_open 결과로 끝냄
+def crawl_profiles(urls, tabs=DEFAULT_TABS, driver=None, on_result=None, max_attempts=MAX_ATTEMPTS, breaker=None):
+    items = [_as_item(url) for url in urls]
+    if not items:
+        return []
+
+    own_driver = driver is None
+    if own_driver:
+        driver = app._initialize_driver()
+
+    results = [None] * len(items)
+    pending = deque((index, 1) for index in range(len(items)))
+    active = {}
+
+    def complete(index, result):
+        results[index] = result
+        if on_result:
+            on_result(result)
+
+    try:
+        handles = [driver.current_window_handle]
+        for _ in range(min(tabs, len(items)) - 1):
+            driver.switch_to.new_window('tab')
+            handles.append(driver.current_window_handle)
+
+        while pending or active:
+            progressed = False
+            for handle in handles:
+                if handle not in active:
+                    if not pending:
+                        continue
+                    wait = breaker.wait_seconds() if breaker else 0
+                    if wait is None:
+                        # 크롤링 중단: 아직 시작하지 않은 프로필은 크롤링하지 않고 끝냄
+                        while pending:
+                            index, _ = pending.popleft()
+                            item = items[index]
+                            complete(index, failures.circuit_open_result(
+                                app._new_result(item['url'], item.get('annotation', ""), item.get('league'))
+                            ))
+                        progressed = True
+                        continue
+                    if wait > 0:
+                        continue
+                    index, attempt = pending.popleft()
+                    item = items[index]
+                    # 재확인 주기가 된 감독은 HTTP 요청으로 전적만 먼저 확인 (같으면 브라우저 크롤링 생략)
+                    if item.get('precheck_record'):
+                        carried = app._precheck_unchanged(item)
+                        if carried is not None:
+                            complete(index, carried)
+                            progressed = True
+                            continue
+                    driver.switch_to.window(handle)
+                    active[handle] = (index, _TabTask(driver, item, attempt))
+                else:
+                    driver.switch_to.window(handle)
+
+                index, task = active[handle]
+                try:
+                    next(task.steps)
+                    continue
+                except StopIteration:
+                    result = task.finish()
+                except Exception as e:
+                    result = task.finish(e)
+                del active[handle]
+                progressed = True
+                if breaker:
+                    breaker.record(failures.error_class_of(result))
+
+                if "error" in result and task.attempt < failures.max_attempts_for(result, max_attempts):
+                    print(f"  [탭] {task.item['url']} {task.attempt}회차 실패 ({result['error']}), 목록 끝에서 다시 시도합니다.")
+                    pending.append((index, task.attempt + 1))
+                else:
+                    print(f"  [탭] 처리 완료: {task.item['url']} "
+                          f"({'오류: ' + result['error'] if 'error' in result else result.get('구단주명', 'N/A')})")
+                    complete(index, result)
+
+            if not progressed:
+                time.sleep(POLL_INTERVAL / len(handles))
+    finally:
+        if own_driver:
+            driver.quit()
+    return results
+
+
 # -------------------------------------------------------------
+# app.py 크롤링 작업에 끼워 넣는 리그 단위 크롤링 함수 (탭 방식)
+def _tab_crawl_batch(tabs):
+    def crawl_batch(urls_to_crawl, on_result, scheduler_stats, breaker=None):
+        crawl_profiles(urls_to_crawl, tabs=tabs, on_result=on_result, breaker=breaker)
+        scheduler_stats["tabs"] = tabs
+    return crawl_batch
+
+
+def _load_items_from_files(filenames):
+    items = []
+    for filename in filenames:
+        for url, annotation in app._read_urls_from_file(filename):
+            items.append({"url": url, "annotation": annotation, "league": None})
+    return [(None, items)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FC 온라인 감독 모드 전적 크롤러 (Chrome 하나, 탭 여러 개)")
+    parser.add_argument("--urls", nargs="+", help="URL 파일 (지정하지 않으면 league*_urls.txt, 없으면 urls.txt)")
+    parser.add_argument("--tabs", type=int, default=DEFAULT_TABS, help="동시에 진행할 탭 수")
+    parser.add_argument("--full-refresh", action="store_true", help="최신성 캐시를 무시하고 전체 크롤링")
+    args = parser.parse_args(argv)
 
-try:
-    # -------------------------------------------------------------
-    # Headless 모드 설정 추가
-    options = Options()
-    options.add_argument("--headless")         # 브라우저 창을 띄우지 않음
-    options.add_argument("--disable-gpu")      # GPU 사용 비활성화 (Headless 모드에서 권장)
-    options.add_argument("--window-size=1920x1080") # 창 크기 설정 (Headless에서도 유효)
-    # -------------------------------------------------------------
-
-    service = Service(executable_path=driver_path)
-    driver = webdriver.Chrome(service=service, options=options) # options 적용
-
-    for url in target_urls:
-        print(f"\n--- URL 처리 시작: {url} ---")
-
-        current_url_data = {
-            "구단주명": "N/A",
-            "승": "N/A",
-            "무": "N/A",
-            "패": "N/A"
-        }
-        
-        # -------------------------------------------------------------
-        # 각 URL 처리 성공 여부 트래킹
-        url_processed_successfully = False
-        # -------------------------------------------------------------
-
-        print("FC 온라인 프로필 페이지로 이동합니다...")
-        try: # 전체 크롤링 로직을 다시 한 번 try-except로 감싸서 특정 URL 실패 시 스킵 및 카운트
-            driver.get(url)
-
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "selector_wrap"))
-            )
-            print("프로필 팝업이 로드되었습니다.")
-
-            print("리그 선택 드롭다운을 펼칩니다...")
-            league_selector_link = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.CLASS_NAME, "league"))
-            )
-            league_selector_link.click()
-            print("드롭다운이 펼쳐졌습니다.")
-
-            time.sleep(1)
-
-            print("감독 모드 탭을 찾고 클릭합니다...")
-            manager_mode_tab = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "a[onclick='SetType(52);']"))
-            )
-            manager_mode_tab.click()
-            print("감독 모드 탭을 클릭했습니다.")
-
-            print("감독 모드 데이터 로딩을 위해 10초 대기합니다...") # 이전 요청대로 10초 유지
-            time.sleep(10) # 10초 대기 (고정)
-
-            # -------------------------------------------------------------
-            # 4. '감독 모드' 선택 후 보이는 승/무/패 정보 가져오기
-            # -------------------------------------------------------------
-            print("감독 모드 전적 정보 추출 중...")
-            # grade_desc_element의 WebDriverWait 대기 시간을 1초에서 10초로 다시 늘립니다.
-            # 데이터 로딩 후 요소가 나타나는 시간은 충분히 주어야 합니다.
-            grade_desc_element = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "grade_desc"))
-            )
-            full_text = grade_desc_element.text
-            match = re.search(r'(\d+)승\s*(\d+)무\s*(\d+)패', full_text)
-
-            if match:
-                current_url_data["승"] = int(match.group(1))
-                current_url_data["무"] = int(match.group(2))
-                current_url_data["패"] = int(match.group(3))
-            else:
-                print("전적 정보를 찾을 수 없습니다.")
-
-            # -------------------------------------------------------------
-            # 5. 구단주명 가져오기
-            # -------------------------------------------------------------
-            print("구단주명 추출 중...")
-            # coach_name_element의 WebDriverWait 대기 시간을 1초에서 5초로 다시 늘립니다.
-            coach_name_element = WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "coach"))
-            )
-            current_url_data["구단주명"] = coach_name_element.text
-
-            url_processed_successfully = True # 이 URL 처리 성공으로 표시
-
-        except Exception as e:
-            print(f"URL({url}) 처리 중 오류 발생: {e}")
-            # 이 URL에 대한 데이터는 기본값인 N/A로 남거나, 오류 메시지를 추가할 수 있습니다.
-            current_url_data["error"] = str(e) # 오류 메시지 저장
-            fail_count += 1
-            # continue # 오류가 나면 다음 URL로 넘어가기 (이 바깥 try-except가 처리)
-
-
-        # 최종 결과 출력 (콘솔)
-        print("\n--- FC 온라인 감독모드 전적 결과 ---")
-        print(f"URL: {url}") # URL은 터미널 출력용으로만 남겨둠
-        print(f"구단주명: {current_url_data['구단주명']}")
-        print(f"승: {current_url_data['승']}")
-        print(f"무: {current_url_data['무']}")
-        print(f"패: {current_url_data['패']}")
-        if "error" in current_url_data:
-            print(f"오류: {current_url_data['error']}")
-        print("----------------------------------")
-
-        # 현재 URL의 결과 데이터를 all_results 리스트에 추가
-        all_results.append(current_url_data)
-
-        if url_processed_successfully:
-            success_count += 1 # 성공 카운트 증가
-
-
-except Exception as e:
-    print(f"스크립트 실행 중 치명적인 오류 발생: {e}")
-
-finally:
-    print("\n모든 URL 처리 완료. 브라우저를 닫습니다.")
-    if 'driver' in locals():
-        driver.quit()
-
-    # -------------------------------------------------------------
-    # 추출된 모든 데이터를 JSON 파일로 저장 (기존 파일 자동 덮어쓰기)
-    # -------------------------------------------------------------
-    output_json_file = "fconline_manager_stats.json"
     try:
-        with open(output_json_file, 'w', encoding='utf-8') as f: # 'w' 모드는 항상 덮어씁니다.
-            json.dump(all_results, f, indent=4, ensure_ascii=False)
-        print(f"\n모든 데이터가 '{output_json_file}' 파일에 성공적으로 저장되었습니다. (기존 파일 덮어쓰기)")
+        league_items = _load_items_from_files(args.urls) if args.urls else app._load_league_items()
+    except FileNotFoundError as e:
+        print(f"오류: {e} 파일을 생성하고 URL을 입력해 주세요.")
+        return 1
     except Exception as e:
-        print(f"JSON 파일 저장 중 오류 발생: {e}")
+        print(f"URL 파일을 읽는 중 오류 발생: {e}")
+        return 1
+
+    total_urls_count = sum(len(items) for _, items in league_items)
+    if total_urls_count == 0:
+        print("경고: URL 파일에 유효한 URL이 없습니다.")
+        return 1
+    print(f"총 {total_urls_count}개의 URL을 로드했습니다. 탭 {args.tabs}개로 크롤링을 시작합니다.")
+
+    # app.py의 크롤링 작업과 같은 과정 (증분 계획, 저널, 병합, 순위, 저장소 기록, 결과 파일)
+    job = CrawlJob(uuid.uuid4().hex[:12])
+    summary = app._run_crawl_job(job, league_items, args.full_refresh, crawl_batch=_tab_crawl_batch(args.tabs))
 
-    # -------------------------------------------------------------
-    # 종합 결과 보고
     print("\n--- 크롤링 요약 ---")
-    print(f"총 처리 요청 URL 수: {len(target_urls)}")
-    print(f"성공적으로 처리된 URL 수: {success_count}")
-    print(f"처리 실패한 URL 수: {fail_count}")
-    print("------------------")
\ No newline at end of file
+    print(summary["message"])
+    print("------------------")
+    return 0 if summary["fail_count"] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+
+from output_writer import write_json_atomic
+
+# -------------------------------------------------------------
+# 증분 크롤링용 플레이어별 최신성 캐시
+#  - player_id 별로 마지막 크롤링 시각, 마지막 전적(승/무/패), 전적 지문, 마지막 변동 시각을 기록
+#  - 최근에 전적이 바뀐 '활동 중' 감독은 매번 크롤링
+#  - 한동안 변동이 없는 감독은 TTL 동안 크롤링을 건너뛰고 이전 결과를 그대로 사용
+#  - TTL이 지난 감독은 (가능하면) 가벼운 사전 확인 후 바뀐 경우에만 브라우저로 크롤링
+# -------------------------------------------------------------
+
+# 캐시 파일 경로
+FRESHNESS_FILE = "crawl_freshness.json"
+
+# 이 시간 안에 전적이 바뀐 감독은 '활동 중'으로 보고 매번 크롤링
+ACTIVE_WINDOW_HOURS = 48
+
+# 변동 없는 감독을 다시 확인하기까지의 간격
+IDLE_TTL_HOURS = 24
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 전적 지문 (승/무/패가 같으면 같은 값)
+def record_fingerprint(win, draw, loss):
+    return hashlib.sha1(f"{win}/{draw}/{loss}".encode("utf-8")).hexdigest()[:16]
+
+
+class FreshnessCache:
+    def __init__(self, path=FRESHNESS_FILE):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"경고: 최신성 캐시 파일을 읽지 못해 전체 크롤링합니다: {e}")
+                self.entries = {}
+
+    # 임시 파일에 쓴 뒤 교체 (저장 도중 중단되어도 기존 캐시 파일이 깨지지 않음)
+    def save(self):
+        try:
+            write_json_atomic(self.path, self.entries)
+        except OSError as e:
+            print(f"최신성 캐시 저장 중 오류 발생: {e}")
+
+    def get(self, player_id):
+        return self.entries.get(player_id)
+
+    def is_active(self, player_id, now):
+        entry = self.entries.get(player_id)
+        if not entry or not entry.get("last_changed"):
+            return False
+        last_changed = datetime.strptime(entry["last_changed"], TIME_FORMAT)
+        return now - last_changed <= timedelta(hours=ACTIVE_WINDOW_HOURS)
+
+    # ---------------------------------------------------------
+    # 크롤링 필요 여부 판단
+    # 반환값: "crawl" (바로 크롤링), "precheck" (사전 확인 후 판단), "skip" (이전 결과 유지)
+    def decide(self, player_id, now):
+        entry = self.entries.get(player_id)
+        if not entry or not entry.get("record"):
+            return "crawl"
+        if self.is_active(player_id, now):
+            return "crawl"
+        last_crawled = datetime.strptime(entry["last_crawled"], TIME_FORMAT)
+        if now - last_crawled < timedelta(hours=IDLE_TTL_HOURS):
+            return "skip"
+        return "precheck"
+
+    # ---------------------------------------------------------
+    # 크롤링 결과 반영 (성공한 결과만 기록, 전적이 바뀐 경우 변동 시각 갱신)
+    def update(self, result, now):
+        player_id = result.get("player_id")
+        if not player_id or "error" in result:
+            return
+        win, draw, loss = result.get("승"), result.get("무"), result.get("패")
+        if not all(isinstance(value, int) for value in (win, draw, loss)):
+            return
+
+        timestamp = now.strftime(TIME_FORMAT)
+        fingerprint = record_fingerprint(win, draw, loss)
+        entry = self.entries.get(player_id)
+        # 처음 보는 플레이어는 변동 시각을 알 수 없으므로 비워 둠 (활동 중으로 취급하지 않음)
+        if entry is None:
+            last_changed = None
+        elif entry.get("fingerprint") != fingerprint:
+            last_changed = timestamp
+        else:
+            last_changed = entry.get("last_changed")
+        self.entries[player_id] = {
+            "last_crawled": timestamp,
+            "last_changed": last_changed,
+            "record": [win, draw, loss],
+            "fingerprint": fingerprint,
+        }
+
+    # ---------------------------------------------------------
+    # 사전 확인 결과 전적이 그대로인 경우: 확인 시각만 갱신
+    def touch(self, player_id, now):
+        entry = self.entries.get(player_id)
+        if entry:
+            entry["last_crawled"] = now.strftime(TIME_FORMAT)
+
+    def last_changed(self, player_id):
+        entry = self.entries.get(player_id)
+        return entry.get("last_changed") if entry else None
@@ -0,0 +1,363 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from player_record import PlayerRecord, STATUS_MISSING, STATUS_OK, derive_stats, format_win_rate, parse_win_rate, \
+    records_from_results
+
+# -------------------------------------------------------------
+# SQLite 기반 전적 저장소
+#  - players: 플레이어별 현재 대표 기록 (기존 fconline_manager_stats.json 한 줄에 해당)
+#  - snapshots: 크롤링할 때마다 쌓이는 전적 기록 (추가만 함)
+#  - WAL 모드로 열어 읽기(웹 페이지)와 쓰기(크롤링)가 서로 막지 않게 함
+#  - 한 번의 크롤링 결과는 하나의 트랜잭션으로 묶어 바뀐 행만 기록
+#  - rollups: 스냅샷을 쌓을 때 일별/주별 집계(기간 말 전적, 직전 기간 대비 Δ승/Δ판수/Δ채굴 효율, 순위)를
+#    함께 갱신해 두어, 기간 조회가 스냅샷 전체를 다시 훑지 않고 (기간, 플레이어, 기간 시작) 인덱스만 읽음
+# -------------------------------------------------------------
+
+# 데이터베이스 파일 경로
+HISTORY_DB_FILE = "fconline_history.db"
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    player_id   TEXT PRIMARY KEY,
+    coach_name  TEXT,
+    league      TEXT,
+    win         INTEGER,
+    draw        INTEGER,
+    loss        INTEGER,
+    games       INTEGER,
+    efficiency  INTEGER,
+    win_rate    TEXT,
+    error       TEXT,
+    updated_at  TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_id   TEXT NOT NULL,
+    crawled_at  TEXT NOT NULL,
+    win         INTEGER NOT NULL,
+    draw        INTEGER NOT NULL,
+    loss        INTEGER NOT NULL,
+    efficiency  INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_snapshots_player_time ON snapshots (player_id, crawled_at);
+
+CREATE TABLE IF NOT EXISTS ranks (
+    league      TEXT NOT NULL,
+    player_id   TEXT NOT NULL,
+    rank        INTEGER NOT NULL,
+    PRIMARY KEY (league, player_id)
+);
+
+-- base_*: 직전 기간 말 값 (직전 기간이 없으면 이 기간의 첫 스냅샷 값), d_* = 현재 값 - base_*
+-- d_rank = base_rank - rank (양수면 순위 상승)
+CREATE TABLE IF NOT EXISTS rollups (
+    period          TEXT NOT NULL,
+    period_start    TEXT NOT NULL,
+    player_id       TEXT NOT NULL,
+    league          TEXT,
+    win             INTEGER NOT NULL,
+    draw            INTEGER NOT NULL,
+    loss            INTEGER NOT NULL,
+    games           INTEGER NOT NULL,
+    efficiency      INTEGER NOT NULL,
+    rank            INTEGER,
+    base_win        INTEGER NOT NULL,
+    base_games      INTEGER NOT NULL,
+    base_efficiency INTEGER NOT NULL,
+    base_rank       INTEGER,
+    d_win           INTEGER NOT NULL DEFAULT 0,
+    d_games         INTEGER NOT NULL DEFAULT 0,
+    d_efficiency    INTEGER NOT NULL DEFAULT 0,
+    d_rank          INTEGER,
+    last_crawled_at TEXT NOT NULL,
+    PRIMARY KEY (period, player_id, period_start)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rollups_league_period ON rollups (period, league, period_start);
+"""
+
+# 집계 기간 종류
+PERIOD_DAY = "day"
+PERIOD_WEEK = "week"
+PERIODS = (PERIOD_DAY, PERIOD_WEEK)
+
+# 기간 조회 시 한 번에 돌려줄 최대 기간 수 (since 를 주지 않은 경우 최근 기간부터)
+DEFAULT_HISTORY_LIMIT = {PERIOD_DAY: 90, PERIOD_WEEK: 52}
+
+_ROLLUP_FIELDS = ("period_start", "league", "win", "draw", "loss", "games", "efficiency", "rank",
+                  "d_win", "d_games", "d_efficiency", "d_rank", "last_crawled_at")
+
+# players 테이블 컬럼 (player_id 제외)
+_PLAYER_COLUMNS = ["coach_name", "league", "win", "draw", "loss", "games", "efficiency", "win_rate"]
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 크롤링 시각("YYYY-MM-DD HH:MM:SS") -> 기간 시작일 (일: 그날, 주: 그 주 월요일)
+def period_start(crawled_at, period):
+    day = crawled_at[:10]
+    if period == PERIOD_DAY:
+        return day
+    date = datetime.strptime(day, "%Y-%m-%d")
+    return (date - timedelta(days=date.weekday())).strftime("%Y-%m-%d")
+
+
+class HistoryStore:
+    def __init__(self, path=HISTORY_DB_FILE):
+        self.path = path
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        self._backfill_rollups()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    # ---------------------------------------------------------
+    # 기존 JSON 결과 파일 가져오기 (DB가 비어 있을 때만)
+    def import_json_if_empty(self, json_file_path):
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM players LIMIT 1").fetchone():
+                return 0
+        if not os.path.exists(json_file_path):
+            return 0
+
+        try:
+            with open(json_file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"경고: 기존 JSON 파일을 가져오지 못했습니다 ({json_file_path}): {e}")
+            return 0
+
+        imported_at = datetime.fromtimestamp(os.path.getmtime(json_file_path)).strftime(TIME_FORMAT)
+        records = records_from_results(item for item in data if item.get("player_id"))
+        self.save_crawl(records, records, imported_at)
+        print(f"기존 결과 파일 '{json_file_path}'에서 {len(records)}명을 SQLite 저장소로 가져왔습니다.")
+        return len(records)
+
+    # ---------------------------------------------------------
+    # 모든 플레이어의 대표 기록을 {player_id: PlayerRecord} 로 반환 (판수/채굴 효율/승률은 한 번에 계산)
+    def load_records(self):
+        records = {}
+        with self._connect() as conn:
+            for row in conn.execute("SELECT * FROM players"):
+                record = PlayerRecord(row["player_id"], coach_name=row["coach_name"], league=row["league"],
+                                      win=row["win"], draw=row["draw"], loss=row["loss"], error=row["error"])
+                # 승/무/패 없이 저장된 예전 기록은 저장된 값을 그대로 사용
+                if record.status == STATUS_MISSING:
+                    record.games = row["games"]
+                    record.efficiency = row["efficiency"]
+                    record.win_rate = parse_win_rate(row["win_rate"])
+                records[record.player_id] = record
+        derive_stats(records.values())
+        return records
+
+    # ---------------------------------------------------------
+    # 크롤링 한 회차 저장 (하나의 트랜잭션)
+    #  - changed_records: 대표 기록이 바뀐 플레이어만 players 테이블에 upsert
+    #  - snapshot_records: 이번에 새로 크롤링에 성공한 기록을 snapshots 테이블에 추가
+    def save_crawl(self, changed_records, snapshot_records, crawled_at):
+        player_rows = [
+            (record.player_id, record.coach_name, record.league, record.win, record.draw, record.loss,
+             record.games, record.efficiency, None if record.win_rate is None else format_win_rate(record.win_rate),
+             record.error, crawled_at)
+            for record in changed_records
+        ]
+
+        snapshot_records = [record for record in snapshot_records if record.status == STATUS_OK]
+        snapshot_rows = [
+            (record.player_id, crawled_at, record.win, record.draw, record.loss, record.efficiency)
+            for record in snapshot_records
+        ]
+        leagues = {record.player_id: record.league for record in snapshot_records}
+
+        columns = ["player_id"] + _PLAYER_COLUMNS + ["error", "updated_at"]
+        updates = ", ".join(f"{column}=excluded.{column}" for column in columns[1:])
+        with self._write_lock, self._connect() as conn:
+            conn.executemany(
+                f"INSERT INTO players ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT(player_id) DO UPDATE SET {updates}",
+                player_rows,
+            )
+            conn.executemany(
+                "INSERT INTO snapshots (player_id, crawled_at, win, draw, loss, efficiency) VALUES (?, ?, ?, ?, ?, ?)",
+                snapshot_rows,
+            )
+            self._update_rollups(conn, snapshot_rows, leagues)
+        return len(player_rows), len(snapshot_rows)
+
+    # ---------------------------------------------------------
+    # 일별/주별 집계 갱신 (save_crawl 과 같은 트랜잭션)
+    # 기간의 첫 스냅샷이면 직전 기간 말 값을 기준값(base_*)으로 새 행을 만들고, 이후 스냅샷은 현재 값과 Δ만 갱신
+    def _update_rollups(self, conn, snapshot_rows, leagues):
+        for player_id, crawled_at, win, draw, loss, efficiency in snapshot_rows:
+            games = win + draw + loss
+            for period in PERIODS:
+                start = period_start(crawled_at, period)
+                updated = conn.execute(
+                    "UPDATE rollups SET win = ?, draw = ?, loss = ?, games = ?, efficiency = ?, "
+                    "d_win = ? - base_win, d_games = ? - base_games, d_efficiency = ? - base_efficiency, "
+                    "league = COALESCE(?, league), last_crawled_at = ? "
+                    "WHERE period = ? AND player_id = ? AND period_start = ? AND last_crawled_at <= ?",
+                    (win, draw, loss, games, efficiency, win, games, efficiency,
+                     leagues.get(player_id), crawled_at, period, player_id, start, crawled_at),
+                ).rowcount
+                if updated:
+                    continue
+                previous = conn.execute(
+                    "SELECT win, games, efficiency, rank FROM rollups "
+                    "WHERE period = ? AND player_id = ? AND period_start < ? ORDER BY period_start DESC LIMIT 1",
+                    (period, player_id, start),
+                ).fetchone()
+                base = (previous["win"], previous["games"], previous["efficiency"], previous["rank"]) \
+                    if previous else (win, games, efficiency, None)
+                conn.execute(
+                    "INSERT OR IGNORE INTO rollups (period, period_start, player_id, league, win, draw, loss, games, "
+                    "efficiency, base_win, base_games, base_efficiency, base_rank, d_win, d_games, d_efficiency, "
+                    "last_crawled_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (period, start, player_id, leagues.get(player_id), win, draw, loss, games, efficiency,
+                     *base, win - base[0], games - base[1], efficiency - base[2], crawled_at),
+                )
+
+    # 순위 기록: 이번 기간 행에 순위를 남김
+    # 이번 회차에 스냅샷이 없는 플레이어(변동 없음으로 건너뜀 등)는 직전 기간 값을 이어받은 행을 만들어 순위만 기록
+    def _record_rollup_ranks(self, conn, rows, ranked_at):
+        for period in PERIODS:
+            start = period_start(ranked_at, period)
+            for league, player_id, rank in rows:
+                conn.execute(
+                    "INSERT OR IGNORE INTO rollups (period, period_start, player_id, league, win, draw, loss, games, "
+                    "efficiency, base_win, base_games, base_efficiency, base_rank, last_crawled_at) "
+                    "SELECT period, ?, player_id, league, win, draw, loss, games, efficiency, "
+                    "win, games, efficiency, rank, last_crawled_at FROM rollups "
+                    "WHERE period = ? AND player_id = ? AND period_start < ? ORDER BY period_start DESC LIMIT 1",
+                    (start, period, player_id, start),
+                )
+                conn.execute(
+                    "UPDATE rollups SET rank = ?, d_rank = base_rank - ?, league = COALESCE(league, ?) "
+                    "WHERE period = ? AND player_id = ? AND period_start = ?",
+                    (rank, rank, league, period, player_id, start),
+                )
+
+    # 집계가 비어 있고 스냅샷이 있으면 (이 기능 이전의 저장소) 스냅샷으로 한 번 채움 (순위 기록은 없음)
+    def _backfill_rollups(self):
+        with self._write_lock, self._connect() as conn:
+            if conn.execute("SELECT 1 FROM rollups LIMIT 1").fetchone():
+                return
+            snapshot_rows = [
+                tuple(row) for row in conn.execute(
+                    "SELECT player_id, crawled_at, win, draw, loss, efficiency FROM snapshots ORDER BY crawled_at, id"
+                )
+            ]
+            if not snapshot_rows:
+                return
+            leagues = {row["player_id"]: row["league"] for row in conn.execute("SELECT player_id, league FROM players")}
+            self._update_rollups(conn, snapshot_rows, leagues)
+        print(f"기존 스냅샷 {len(snapshot_rows)}건으로 일별/주별 집계를 만들었습니다.")
+
+    # ---------------------------------------------------------
+    # 지난 회차의 리그별 순위 맵 {리그명: {player_id: 순위}} (저장된 적 없으면 빈 dict)
+    def load_ranks(self):
+        ranks = {}
+        with self._connect() as conn:
+            for row in conn.execute("SELECT league, player_id, rank FROM ranks"):
+                ranks.setdefault(row["league"], {})[row["player_id"]] = row["rank"]
+        return ranks
+
+    # 이번 회차의 순위 맵으로 교체 (ranked_at 을 주면 일별/주별 집계에도 순위 기록)
+    def save_ranks(self, rank_map, ranked_at=None):
+        rows = [
+            (league, player_id, rank)
+            for league, ranks in rank_map.items()
+            for player_id, rank in ranks.items()
+        ]
+        with self._write_lock, self._connect() as conn:
+            conn.execute("DELETE FROM ranks")
+            conn.executemany("INSERT INTO ranks (league, player_id, rank) VALUES (?, ?, ?)", rows)
+            if ranked_at:
+                self._record_rollup_ranks(conn, rows, ranked_at)
+
+    # ---------------------------------------------------------
+    # 플레이어 한 명의 전적 기록 (시간순)
+    def player_snapshots(self, player_id, since=None, until=None):
+        query = "SELECT crawled_at, win, draw, loss, efficiency FROM snapshots WHERE player_id = ?"
+        params = [player_id]
+        if since:
+            query += " AND crawled_at >= ?"
+            params.append(since)
+        if until:
+            query += " AND crawled_at <= ?"
+            params.append(until)
+        query += " ORDER BY crawled_at"
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(query, params)]
+
+    # ---------------------------------------------------------
+    # 플레이어 한 명의 일별/주별 집계 (기간순). since/until 은 "YYYY-MM-DD"
+    # since 를 주지 않으면 최근 limit 개 기간
+    def player_rollups(self, player_id, period=PERIOD_DAY, since=None, until=None, limit=None):
+        query = f"SELECT {', '.join(_ROLLUP_FIELDS)} FROM rollups WHERE period = ? AND player_id = ?"
+        params = [period, player_id]
+        query, params = self._range_clause(query, params, period, since, until)
+        query += " ORDER BY period_start DESC LIMIT ?"
+        params.append(limit or DEFAULT_HISTORY_LIMIT[period])
+        with self._connect() as conn:
+            rows = [dict(row) for row in conn.execute(query, params)]
+        rows.reverse()
+        return rows
+
+    # 리그별 기간 추이 (기간순): 집계 대상 인원, 경기한 인원, Δ승/Δ판수/Δ채굴 효율 합계, Δ채굴 효율 1위 플레이어
+    # since 를 주지 않으면 가장 최근 기간부터 limit 개 기간
+    def league_trends(self, period=PERIOD_DAY, league=None, since=None, until=None, limit=None):
+        with self._connect() as conn:
+            if not since:
+                latest = conn.execute("SELECT MAX(period_start) FROM rollups WHERE period = ?", (period,)).fetchone()[0]
+                if latest is None:
+                    return []
+                count = (limit or DEFAULT_HISTORY_LIMIT[period]) - 1
+                since = (datetime.strptime(latest, "%Y-%m-%d")
+                         - timedelta(days=count * (7 if period == PERIOD_WEEK else 1))).strftime("%Y-%m-%d")
+            query = (
+                "SELECT period_start, league, COUNT(*) AS players, SUM(d_games > 0) AS active_players, "
+                "SUM(d_win) AS d_win, SUM(d_games) AS d_games, SUM(d_efficiency) AS d_efficiency, "
+                # MAX()와 함께 고른 player_id 는 SQLite에서 최댓값을 가진 행의 값
+                "MAX(d_efficiency) AS top_d_efficiency, player_id AS top_player_id "
+                "FROM rollups WHERE period = ?"
+            )
+            params = [period]
+            if league:
+                query += " AND league = ?"
+                params.append(league)
+            query, params = self._range_clause(query, params, period, since, until)
+            query += " GROUP BY period_start, league ORDER BY period_start, league"
+            return [dict(row) for row in conn.execute(query, params)]
+
+    @staticmethod
+    def _range_clause(query, params, period, since, until):
+        if since:
+            query += " AND period_start >= ?"
+            params.append(period_start(since, period))
+        if until:
+            query += " AND period_start <= ?"
+            params.append(period_start(until, period))
+        return query, params
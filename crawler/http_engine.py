@@ -0,0 +1,139 @@
+from html.parser import HTMLParser
+import re
+import threading
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:  # requests가 없으면 HTTP 엔진은 사용 불가 (Selenium으로 대체)
+    requests = None
+
+# -------------------------------------------------------------
+# 브라우저 없이 감독 모드 전적을 직접 요청하는 HTTP 크롤링 엔진
+#  - 프로필 팝업에서 'SetType(52)'를 누르면 호출되는 요청을 그대로 보내고,
+#    응답의 '.grade_desc' / '.coach' 텍스트에서 전적과 구단주명을 추출
+#  - 응답의 모드 표시('.league')가 감독 모드가 아니면 (파라미터가 무시되어 공식경기 전적이 온 경우 등)
+#    전적을 쓰지 않고 RecordParseError -> Selenium 엔진으로 대체
+#  - keep-alive 세션을 공유해 연결을 재사용
+# -------------------------------------------------------------
+
+# 감독 모드 전적 요청 주소와 파라미터
+# (사이트 개편으로 바뀌면 브라우저 개발자도구 Network 탭에서 SetType(52) 클릭 시 요청을 확인해 수정)
+RECORD_ENDPOINT = "https://fconline.nexon.com/profile/stat/popup/{player_id}"
+RECORD_PARAMS = {"n1Type": 52}
+
+# 감독 모드 응답인지 확인할 모드 표시 ('.league' 드롭다운에 표시되는 현재 모드 이름)
+MANAGER_MODE_LABEL = "감독 모드"
+
+# 요청 타임아웃 (연결, 응답) 초
+REQUEST_TIMEOUT = (5, 15)
+
+# 커넥션 풀 크기 (동시 작업 수 이상으로 설정)
+POOL_SIZE = 10
+
+# 전적 텍스트 형식 ('N승 N무 N패'). readiness.py(Selenium 엔진)도 같은 패턴 사용
+RECORD_PATTERN = re.compile(r'(\d+)승\s*(\d+)무\s*(\d+)패')
+
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "X-Requested-With": "XMLHttpRequest",
+}
+
+
+# 응답에서 감독 모드 전적을 확인하지 못한 경우 (Selenium 엔진으로 대체할 대상)
+class RecordParseError(Exception):
+    pass
+
+
+# requests 가 없어 HTTP 엔진을 쓸 수 없는 경우 (Selenium 엔진으로 대체할 대상)
+class EngineUnavailable(RuntimeError):
+    pass
+
+
+# -------------------------------------------------------------
+# 지정한 class를 가진 요소들의 텍스트를 모으는 간단한 파서
+class _ClassTextParser(HTMLParser):
+    def __init__(self, class_names):
+        super().__init__()
+        self.class_names = set(class_names)
+        self.texts = {name: [] for name in class_names}
+        self._stack = []  # 현재 열려 있는 태그마다 수집 중인 class 이름 (없으면 None)
+
+    def handle_starttag(self, tag, attrs):
+        classes = (dict(attrs).get("class") or "").split()
+        matched = next((name for name in classes if name in self.class_names), None)
+        if tag in ("br", "img", "input", "meta", "link", "hr"):
+            return
+        self._stack.append(matched)
+
+    def handle_startendtag(self, tag, attrs):
+        # <br/> 처럼 스스로 닫히는 태그는 텍스트를 갖지 않으므로 무시
+        pass
+
+    def handle_endtag(self, tag):
+        if self._stack:
+            self._stack.pop()
+
+    def handle_data(self, data):
+        for name in self._stack:
+            if name:
+                self.texts[name].append(data)
+
+    def text_of(self, class_name):
+        return " ".join(" ".join(self.texts[class_name]).split())
+
+
+# -------------------------------------------------------------
+# 응답 HTML에서 (승, 무, 패, 구단주명) 추출 (감독 모드 응답이 아니면 RecordParseError)
+def parse_manager_record(html):
+    parser = _ClassTextParser(["grade_desc", "coach", "league"])
+    parser.feed(html)
+    parser.close()
+
+    mode_label = parser.text_of("league")
+    if MANAGER_MODE_LABEL not in mode_label:
+        raise RecordParseError(f"감독 모드 응답이 아닙니다 (모드 표시: {mode_label or '없음'})")
+
+    match = RECORD_PATTERN.search(parser.text_of("grade_desc"))
+    if not match:
+        raise RecordParseError("전적 정보 찾기 실패")
+
+    return {
+        "win": int(match.group(1)),
+        "draw": int(match.group(2)),
+        "loss": int(match.group(3)),
+        "coach": parser.text_of("coach") or None,
+    }
+
+
+# -------------------------------------------------------------
+# 공유 HTTP 세션 (최초 사용 시 생성)
+_session = None
+_session_lock = threading.Lock()
+
+def _get_session():
+    global _session
+    if requests is None:
+        raise EngineUnavailable("requests 패키지가 설치되어 있지 않아 HTTP 엔진을 사용할 수 없습니다.")
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(REQUEST_HEADERS)
+            _session = session
+        return _session
+
+
+# -------------------------------------------------------------
+# 플레이어 한 명의 감독 모드 전적 요청 및 파싱
+def fetch_manager_record(player_id):
+    session = _get_session()
+    response = session.get(
+        RECORD_ENDPOINT.format(player_id=player_id),
+        params=RECORD_PARAMS,
+        timeout=REQUEST_TIMEOUT,
+    )
+    response.raise_for_status()
+    return parse_manager_record(response.text)
@@ -0,0 +1,115 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from email.utils import formatdate
+
+try:
+    import brotli
+except ImportError:  # brotli 패키지가 없으면 gzip만 제공
+    brotli = None
+
+# -------------------------------------------------------------
+# 결과 페이지(리더보드) 응답 캐시
+#  - 표시용 JSON 파일을 한 번만 읽어 HTML과 API용 JSON을 미리 만들어 두고 메모리에 보관
+#  - gzip(+brotli) 압축본도 미리 만들어 요청마다 압축하지 않음
+#  - 파일 수정 시각이 바뀌거나 크롤링 완료 시 invalidate()가 호출되면 다시 만듦
+# -------------------------------------------------------------
+
+# API 응답에 포함할 컬럼 (행은 이 순서의 배열로 전달)
+API_COLUMNS = ["player_id", "리그명", "구단주명", "판수", "승", "무", "패", "채굴 효율", "승률", "비고", "URL", "error"]
+
+
+class CachedBody:
+    def __init__(self, body, mimetype, etag):
+        self.mimetype = mimetype
+        self.etag = etag
+        self.bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(body)
+
+    # 클라이언트가 받을 수 있는 가장 작은 인코딩 선택
+    def pick(self, accept_encoding):
+        accepted = accept_encoding.lower()
+        for encoding in ("br", "gzip"):
+            if encoding in self.bodies and encoding in accepted:
+                return encoding, self.bodies[encoding]
+        return "identity", self.bodies["identity"]
+
+
+class LeaderboardEntry:
+    def __init__(self, display_data, html, mtime, message=None):
+        self.display_data = display_data
+        self.mtime = mtime
+        self.message = message
+        self.last_modified = formatdate(mtime, usegmt=True) if mtime else None
+
+        html_bytes = html.encode("utf-8")
+        self.html = CachedBody(html_bytes, "text/html; charset=utf-8", hashlib.sha1(html_bytes).hexdigest()[:20])
+
+        api_bytes = json.dumps(_compact(display_data), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.api = CachedBody(api_bytes, "application/json", hashlib.sha1(api_bytes).hexdigest()[:20])
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: API용 압축 형식 {"last_updated", "columns", "rows": [[...], ...]}
+def _compact(display_data):
+    return {
+        "last_updated": display_data.get("last_updated"),
+        "columns": API_COLUMNS,
+        "rows": [[item.get(column) for column in API_COLUMNS] for item in display_data.get("results", [])],
+    }
+
+
+class LeaderboardCache:
+    def __init__(self, data_file, render_fn):
+        self.data_file = data_file
+        self.render_fn = render_fn  # render_fn(results, last_updated, message) -> HTML 문자열
+        self._entry = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "builds": 0}
+
+    def invalidate(self):
+        with self._lock:
+            self._entry = None
+
+    # ---------------------------------------------------------
+    # 현재 캐시 항목 반환 (파일이 바뀌었으면 다시 생성)
+    def get(self):
+        try:
+            mtime = os.path.getmtime(self.data_file)
+        except OSError:
+            mtime = None
+
+        with self._lock:
+            entry = self._entry
+            if entry is not None and entry.mtime == mtime:
+                self.stats["hits"] += 1
+                return entry
+
+            entry = self._build(mtime)
+            self._entry = entry
+            self.stats["builds"] += 1
+            return entry
+
+    def _build(self, mtime):
+        if mtime is None:
+            display_data = {"results": [], "last_updated": "데이터 없음"}
+            message = "크롤링된 데이터 파일이 없습니다."
+        else:
+            try:
+                with open(self.data_file, 'r', encoding='utf-8') as f:
+                    display_data = json.load(f)
+                message = None
+            except json.JSONDecodeError as e:
+                display_data = {"results": [], "last_updated": "오류"}
+                message = f"데이터 파일 손상: {e}"
+            except Exception as e:
+                display_data = {"results": [], "last_updated": "오류"}
+                message = f"데이터 로드 중 알 수 없는 오류: {e}"
+
+        results = display_data.get('results', [])
+        last_updated = display_data.get('last_updated', '정보 없음')
+        html = self.render_fn(results, last_updated, message)
+        return LeaderboardEntry(display_data, html, mtime, message)
@@ -0,0 +1,187 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# -------------------------------------------------------------
+# 크롤링 단계별 소요 시간 측정
+#  - 단계별 히스토그램을 메모리에 모아 /metrics (Prometheus 텍스트 형식)로 노출
+#  - 크롤링 회차마다 단계별 합계/최대값 요약을 crawl_runs.jsonl 에 한 줄씩 기록
+# -------------------------------------------------------------
+
+# 회차별 요약 기록 파일
+RUN_SUMMARY_FILE = "crawl_runs.jsonl"
+
+# 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 15, 20, 30, 60)
+
+# 페이지당 받은 데이터량 구간 (바이트)
+BYTES_BUCKETS = (10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000)
+
+_lock = threading.Lock()
+
+
+class Histogram:
+    def __init__(self, name, help_text, label_name, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_name = label_name
+        self.buckets = tuple(buckets)
+        self._series = {}  # label -> [버킷별 개수..., 합계, 개수]
+
+    def observe(self, label, value):
+        with _lock:
+            series = self._series.get(label)
+            if series is None:
+                series = self._series[label] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with _lock:
+            items = sorted((label, list(series)) for label, series in self._series.items())
+        for label, series in items:
+            prefix = f'{self.label_name}="{label}"'
+            for i, bound in enumerate(self.buckets):
+                lines.append(f'{self.name}_bucket{{{prefix},le="{bound}"}} {series[i]}')
+            lines.append(f'{self.name}_bucket{{{prefix},le="+Inf"}} {series[-1]}')
+            lines.append(f'{self.name}_sum{{{prefix}}} {series[-2]:.6f}')
+            lines.append(f'{self.name}_count{{{prefix}}} {series[-1]}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label_name):
+        self.name = name
+        self.help_text = help_text
+        self.label_name = label_name
+        self._values = {}
+
+    def inc(self, label, amount=1):
+        with _lock:
+            self._values[label] = self._values.get(label, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with _lock:
+            items = sorted(self._values.items())
+        for label, value in items:
+            lines.append(f'{self.name}{{{self.label_name}="{label}"}} {value}')
+        return lines
+
+
+# 프로필 한 개 크롤링의 단계 (드라이버 준비, 페이지 로드, 각 요소 대기 등)
+CRAWL_STAGE_SECONDS = Histogram(
+    "fconline_crawl_stage_seconds", "Time spent in each stage of a single profile crawl.", "stage"
+)
+# 크롤링 후처리 단계 (병합, 순위, 저장, 렌더링 등)
+PIPELINE_PHASE_SECONDS = Histogram(
+    "fconline_pipeline_phase_seconds", "Time spent in each post-processing phase of a crawl run.", "phase"
+)
+# 프로필 페이지 하나를 여는 동안 받은 데이터량 (브라우저 프로필별)
+PAGE_TRANSFER_BYTES = Histogram(
+    "fconline_page_transfer_bytes", "Bytes transferred while loading one profile page.", "browser_profile",
+    buckets=BYTES_BUCKETS,
+)
+# 프로필 크롤링 결과 (success / error)
+CRAWL_RESULTS = Counter("fconline_crawl_results_total", "Profile crawl outcomes.", "outcome")
+
+_current_run = None
+
+
+# -------------------------------------------------------------
+# 회차 요약용 누적기 (한 번에 하나의 크롤링만 실행되므로 전역 하나로 충분)
+class _RunStats:
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.started_at = datetime.now()
+        self.started = time.monotonic()
+        self.stages = {}
+
+    def add(self, kind, name, seconds):
+        with _lock:
+            stats = self.stages.setdefault(f"{kind}:{name}", {"count": 0, "sum": 0.0, "max": 0.0})
+            stats["count"] += 1
+            stats["sum"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+
+
+def observe_stage(stage, seconds):
+    CRAWL_STAGE_SECONDS.observe(stage, seconds)
+    run = _current_run
+    if run is not None:
+        run.add("stage", stage, seconds)
+
+
+def observe_phase(phase, seconds):
+    PIPELINE_PHASE_SECONDS.observe(phase, seconds)
+    run = _current_run
+    if run is not None:
+        run.add("phase", phase, seconds)
+
+
+@contextmanager
+def phase_timer(phase):
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        observe_phase(phase, time.monotonic() - started)
+
+
+def observe_page_transfer(browser_profile, transferred_bytes):
+    PAGE_TRANSFER_BYTES.observe(browser_profile, transferred_bytes)
+    run = _current_run
+    if run is not None:
+        run.add("bytes", browser_profile, transferred_bytes)
+
+
+def count_result(outcome):
+    CRAWL_RESULTS.inc(outcome)
+
+
+# -------------------------------------------------------------
+# 회차 시작/종료 (종료 시 요약을 파일에 한 줄 추가하고 반환)
+def begin_run(run_id):
+    global _current_run
+    _current_run = _RunStats(run_id)
+
+
+def end_run(**extra):
+    global _current_run
+    run = _current_run
+    _current_run = None
+    if run is None:
+        return None
+
+    summary = {
+        "run_id": run.run_id,
+        "started_at": run.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "total_seconds": round(time.monotonic() - run.started, 3),
+        "stages": {
+            name: {"count": stats["count"], "sum": round(stats["sum"], 3),
+                   "avg": round(stats["sum"] / stats["count"], 3), "max": round(stats["max"], 3)}
+            for name, stats in sorted(run.stages.items())
+        },
+    }
+    summary.update(extra)
+    try:
+        with open(RUN_SUMMARY_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"크롤링 회차 요약 저장 중 오류 발생: {e}")
+    return summary
+
+
+# -------------------------------------------------------------
+# Prometheus 텍스트 형식으로 전체 지표 출력
+def render_prometheus():
+    lines = []
+    for metric in (CRAWL_STAGE_SECONDS, PIPELINE_PHASE_SECONDS, PAGE_TRANSFER_BYTES, CRAWL_RESULTS):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
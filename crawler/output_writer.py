@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 모듈 사용 (출력 형식은 동일)
+    orjson = None
+
+# -------------------------------------------------------------
+# 결과 파일 일괄 저장
+#  - 저장할 파일(통합 JSON, 리그별 JSON, 표시용 JSON, HTML)을 먼저 모두 메모리에서 만들고
+#  - 내용 해시가 이전과 같은 파일은 다시 쓰지 않음
+#  - 바뀐 파일은 같은 폴더의 임시 파일에 모두 쓴 뒤(fsync) 한꺼번에 이름을 바꿔 교체
+#    -> 읽는 쪽(결과 페이지, 정적 호스팅)은 항상 완성된 파일만 보게 됨
+# -------------------------------------------------------------
+
+# JSON 들여쓰기 (orjson은 2칸만 지원하므로 표준 json도 2칸으로 맞춤)
+JSON_INDENT = 2
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: JSON 직렬화 (UTF-8 바이트)
+def dumps_json(data, pretty=True):
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, indent=JSON_INDENT, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def content_hash(body):
+    return hashlib.sha256(body).hexdigest()
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: JSON 파일 하나를 원자적으로 저장 (상태/목록 파일용)
+#  - 같은 폴더의 임시 파일에 쓰고 fsync 한 뒤 이름을 바꿔 교체
+#    -> 저장 도중 중단되거나 다른 쪽이 동시에 읽어도 이전 파일 또는 완성된 새 파일만 보임
+def write_json_atomic(path, data, indent=None):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class OutputWriter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 경로 -> (파일 크기, 수정 시각, 내용 해시). 파일이 밖에서 바뀌면 다시 읽어 비교
+        self._known = {}
+
+    def _current_hash(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        known = self._known.get(path)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+        try:
+            with open(path, 'rb') as f:
+                digest = content_hash(f.read())
+        except OSError:
+            return None
+        self._known[path] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    # ---------------------------------------------------------
+    # 파일 묶음 저장: artifacts = [(경로, 바이트), ...]
+    # 반환값: (새로 쓴 경로 리스트, 내용이 같아 건너뛴 경로 리스트)
+    def write_all(self, artifacts):
+        with self._lock:
+            changed = []
+            unchanged = []
+            for path, body in artifacts:
+                digest = content_hash(body)
+                if self._current_hash(path) == digest:
+                    unchanged.append(path)
+                else:
+                    changed.append((path, body, digest))
+
+            # 1단계: 바뀐 파일을 모두 임시 파일로 기록 (하나라도 실패하면 아무것도 교체하지 않음)
+            staged = []
+            try:
+                for path, body, digest in changed:
+                    directory = os.path.dirname(os.path.abspath(path))
+                    fd, temp_path = tempfile.mkstemp(
+                        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+                    )
+                    staged.append((path, temp_path, digest))
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(body)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    # mkstemp는 소유자만 읽을 수 있게 만들므로 일반 파일 권한으로 맞춤 (웹 서버가 읽을 수 있도록)
+                    os.chmod(temp_path, 0o644)
+            except Exception:
+                for _, temp_path, _ in staged:
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+                raise
+
+            # 2단계: 이름 바꾸기로 한꺼번에 교체 (파일 하나하나는 원자적으로 바뀜)
+            for path, temp_path, digest in staged:
+                os.replace(temp_path, path)
+                stat = os.stat(path)
+                self._known[path] = (stat.st_size, stat.st_mtime_ns, digest)
+
+            return [path for path, _, _ in staged], unchanged
@@ -0,0 +1,164 @@
+# -------------------------------------------------------------
+# 플레이어 기록 (병합/순위 계산용 내부 표현)
+#  - 결과 dict("승": "N/A", "승률": "50.97%" 등) 대신 숫자 필드와 명시적 상태를 가진 __slots__ 객체
+#    -> 값이 없으면 None, 정렬 키는 숫자 여부를 매번 검사하지 않음, 객체당 메모리도 작음
+#  - 판수/채굴 효율/승률은 derive_stats()로 여러 기록을 한 번에 계산 (불러오기/병합 단계에서 리그 단위로 한 번)
+#  - "N/A", "50.97%" 같은 표시 형식은 결과 파일/화면으로 내보낼 때(to_result)만 만듦
+# -------------------------------------------------------------
+
+STATUS_OK = "ok"            # 전적이 있는 정상 기록
+STATUS_ERROR = "error"      # 크롤링 실패 기록
+STATUS_MISSING = "missing"  # 오류는 없지만 전적 값이 없는 기록 (예: 예전 JSON의 "N/A")
+
+NEGATIVE_INFINITY = -float('inf')
+
+NOT_AVAILABLE = "N/A"
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 결과 dict 값 -> 숫자 (정수가 아니면 None)
+def _int_or_none(value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def parse_win_rate(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str) and value.endswith("%"):
+        try:
+            return float(value[:-1])
+        except ValueError:
+            return None
+    return None
+
+
+def format_win_rate(win_rate):
+    return NOT_AVAILABLE if win_rate is None else f"{win_rate:.2f}%"
+
+
+def _display(value):
+    return NOT_AVAILABLE if value is None else value
+
+
+# 한 명의 파생 지표 (판수, 채굴 효율 = 7승 - 3무 - 패, 승률 %)
+def derive_one(win, draw, loss):
+    games = win + draw + loss
+    return games, win * 7 - draw * 3 - loss, (win / games * 100) if games > 0 else 0.0
+
+
+class PlayerRecord:
+    __slots__ = ("player_id", "coach_name", "league", "win", "draw", "loss", "games", "efficiency", "win_rate",
+                 "status", "error", "url", "annotation", "remark")
+
+    def __init__(self, player_id, coach_name=None, league=None, win=None, draw=None, loss=None, status=None,
+                 error=None, url=None, annotation=None, remark=None):
+        self.player_id = player_id
+        self.coach_name = coach_name
+        self.league = league
+        self.win = win
+        self.draw = draw
+        self.loss = loss
+        self.games = None
+        self.efficiency = None
+        self.win_rate = None
+        self.error = error
+        if status is None:
+            if error is not None:
+                status = STATUS_ERROR
+            elif None in (win, draw, loss):
+                status = STATUS_MISSING
+            else:
+                status = STATUS_OK
+        self.status = status
+        self.url = url
+        self.annotation = annotation
+        self.remark = remark
+
+    @property
+    def has_error(self):
+        return self.status == STATUS_ERROR
+
+    # 정렬 키 (채굴 효율이 없으면 가장 아래)
+    def sort_key(self):
+        return (NEGATIVE_INFINITY if self.efficiency is None else self.efficiency, self.player_id)
+
+    # ---------------------------------------------------------
+    # 결과 dict(크롤링 결과, 저널, 예전 JSON 파일) -> 기록. 파생 지표는 derive_stats()로 다시 계산
+    @classmethod
+    def from_result(cls, result):
+        coach_name = result.get("구단주명")
+        record = cls(
+            result.get("player_id"),
+            coach_name=None if coach_name == NOT_AVAILABLE else coach_name,
+            league=result.get("리그명"),
+            win=_int_or_none(result.get("승")),
+            draw=_int_or_none(result.get("무")),
+            loss=_int_or_none(result.get("패")),
+            error=str(result["error"]) if "error" in result else None,
+            url=result.get("URL"),
+            annotation=result.get("주석"),
+            remark=result.get("비고"),
+        )
+        # 승/무/패 없이 파생 값만 있는 예전 기록은 그 값을 그대로 사용
+        if record.status == STATUS_MISSING:
+            record.games = _int_or_none(result.get("판수"))
+            record.efficiency = _int_or_none(result.get("채굴 효율"))
+            record.win_rate = parse_win_rate(result.get("승률"))
+        return record
+
+    # 기록 -> 결과 dict (결과 파일/화면 표시 형식: 값이 없으면 "N/A", 승률은 "50.97%")
+    def to_result(self):
+        result = {}
+        if self.url is not None:
+            result["URL"] = self.url
+        result["player_id"] = self.player_id
+        if self.annotation is not None:
+            result["주석"] = self.annotation
+        result["구단주명"] = self.coach_name or NOT_AVAILABLE
+        result["승"] = _display(self.win)
+        result["무"] = _display(self.draw)
+        result["패"] = _display(self.loss)
+        result["판수"] = _display(self.games)
+        result["채굴 효율"] = _display(self.efficiency)
+        result["승률"] = format_win_rate(self.win_rate)
+        result["비고"] = self.remark or "-"
+        if self.league:
+            result["리그명"] = self.league
+        if self.error is not None:
+            result["error"] = self.error
+        return result
+
+    # 기록 -> 결과 JSON 파일 한 줄 (fconline_manager_stats.json 형식: URL/주석/비고 없음)
+    def to_json_item(self):
+        json_item = {
+            "player_id": self.player_id,
+            "구단주명": self.coach_name or NOT_AVAILABLE,
+        }
+        if self.league:
+            json_item["리그명"] = self.league
+        json_item["승"] = _display(self.win)
+        json_item["무"] = _display(self.draw)
+        json_item["패"] = _display(self.loss)
+        json_item["판수"] = _display(self.games)
+        json_item["채굴 효율"] = _display(self.efficiency)
+        json_item["승률"] = format_win_rate(self.win_rate)
+        if self.error is not None:
+            json_item["error"] = self.error
+        return json_item
+
+
+# -------------------------------------------------------------
+# 여러 기록의 판수/채굴 효율/승률을 한 번에 계산 (승/무/패가 모두 있는 기록만)
+def derive_stats(records):
+    rows = [record for record in records if record.status != STATUS_MISSING and None not in (record.win, record.draw, record.loss)]
+    for record in rows:
+        record.games, record.efficiency, record.win_rate = derive_one(record.win, record.draw, record.loss)
+    return rows
+
+
+def records_from_results(results):
+    records = [PlayerRecord.from_result(result) for result in results]
+    derive_stats(records)
+    return records
@@ -0,0 +1,69 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+import time
+
+from http_engine import RECORD_PATTERN
+
+# -------------------------------------------------------------
+# 감독 모드 전적 로딩 완료 감지
+#  - 고정 time.sleep 대신, '.grade_desc' 텍스트가 클릭 전 값과 달라지고
+#    'N승 N무 N패' 형식이 되는 순간 바로 반환
+#  - timeout은 최대 대기 시간(상한)으로만 사용
+# -------------------------------------------------------------
+
+# 상태 확인 간격 (초)
+POLL_INTERVAL = 0.1
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 현재 화면의 전적 텍스트 (요소가 없으면 빈 문자열)
+def read_grade_text(driver):
+    try:
+        elements = driver.find_elements(By.CLASS_NAME, "grade_desc")
+        return elements[0].text if elements else ""
+    except StaleElementReferenceException:
+        return ""
+
+
+class _RecordChanged:
+    def __init__(self, previous_text):
+        self.previous_text = previous_text
+
+    def __call__(self, driver):
+        elements = driver.find_elements(By.CLASS_NAME, "grade_desc")
+        if not elements:
+            return False
+        text = elements[0].text
+        if text != self.previous_text and RECORD_PATTERN.search(text):
+            return elements[0]
+        return False
+
+
+# -------------------------------------------------------------
+# 감독 모드 전적이 표시될 때까지 대기
+# 반환값: (grade_desc 요소, 실제 대기 시간(초), 텍스트 변경 감지 여부)
+def wait_for_manager_record(driver, previous_text, timeout):
+    started = time.monotonic()
+    try:
+        element = WebDriverWait(
+            driver, timeout,
+            poll_frequency=POLL_INTERVAL,
+            ignored_exceptions=(StaleElementReferenceException,)
+        ).until(_RecordChanged(previous_text))
+        return element, time.monotonic() - started, True
+    except TimeoutException:
+        # 상한 시간까지 텍스트가 바뀌지 않음 -> 표시된 값은 클릭 전 전적이므로 호출하는 쪽에서 실패로 처리
+        # (요소가 없으면 예외 전파)
+        elements = driver.find_elements(By.CLASS_NAME, "grade_desc")
+        if not elements:
+            raise
+        return elements[0], time.monotonic() - started, False
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: WebDriverWait 호출을 감싸 실제 대기 시간을 함께 반환
+def timed_wait(driver, timeout, condition):
+    started = time.monotonic()
+    result = WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(condition)
+    return result, time.monotonic() - started
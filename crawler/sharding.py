@@ -0,0 +1,377 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+import failures
+from crawl_journal import CrawlJournal
+from output_writer import write_json_atomic
+
+# -------------------------------------------------------------
+# 샤드 단위 분산 크롤링
+#  - 크롤링 대상을 player_id 해시로 N개 샤드로 나누고, 샤드마다 작업 파일을 큐 폴더에 넣음
+#  - 워커 프로세스(같은 서버의 여러 프로세스 또는 큐 폴더를 공유하는 다른 서버)가
+#    작업 파일을 이름 바꾸기(rename)로 하나씩 가져가 크롤링하고, 결과는 샤드별 저널에 기록
+#  - 크롤링을 요청한 쪽(코디네이터)은 샤드 저널을 읽어 결과를 모으고 기존 병합/순위 단계로 넘김
+#
+# 큐 폴더 구조:
+#   <큐 폴더>/<배치 ID>/tasks/shard-N.json     아직 아무도 가져가지 않은 샤드
+#   <큐 폴더>/<배치 ID>/claimed/shard-N.json   워커가 처리 중인 샤드
+#   <큐 폴더>/<배치 ID>/done/shard-N.json      처리가 끝난 샤드
+#   <큐 폴더>/<배치 ID>/journals/shard-N.jsonl 샤드별 결과 저널
+#
+# 다른 서버에서 워커 실행 (큐 폴더를 NFS 등으로 공유):
+#   python sharding.py worker --queue /shared/crawl_queue --concurrency 3
+# -------------------------------------------------------------
+
+# 큐 폴더 기본 경로
+QUEUE_DIR = "crawl_queue"
+
+# 워커 하나(프로세스)의 동시 크롤링 작업 수 상한
+WORKER_CONCURRENCY = 2
+
+# 처리 중인 샤드의 저널이 이 시간 동안 갱신되지 않으면 워커가 죽은 것으로 보고 다시 큐에 넣음
+SHARD_LEASE_SECONDS = 300
+
+# 큐/저널 확인 간격 (초)
+POLL_SECONDS = 1.0
+
+# 모든 샤드가 끝난 뒤 로컬 워커가 스스로 종료(드라이버 풀 정리)하기를 기다리는 시간 (초)
+# 이 시간이 지나도 남아 있으면 SIGTERM, 그래도 안 끝나면 강제 종료
+WORKER_EXIT_TIMEOUT = 30
+
+# 로컬 워커가 비정상 종료했을 때 다시 띄우는 최대 횟수 (샤드 수 대비 배수)
+MAX_WORKER_RESTARTS_PER_SHARD = 2
+
+_SHARD_PREFIX = "shard-"
+_CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: player_id -> 샤드 번호 (프로세스/서버가 달라도 같은 값이 나오도록 sha1 사용)
+def shard_of(player_id, shard_count):
+    digest = hashlib.sha1(str(player_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+def partition_items(items, shard_count, player_id_of):
+    shards = [[] for _ in range(shard_count)]
+    for item in items:
+        shards[shard_of(player_id_of(item), shard_count)].append(item)
+    return shards
+
+
+class WorkQueue:
+    def __init__(self, root=QUEUE_DIR):
+        self.root = root
+
+    def _dir(self, batch_id, kind):
+        return os.path.join(self.root, batch_id, kind)
+
+    def journal_path(self, batch_id, shard_name):
+        return os.path.join(self._dir(batch_id, "journals"), shard_name.replace(".json", ".jsonl"))
+
+    # ---------------------------------------------------------
+    # 코디네이터: 샤드 작업 파일 생성 -> 배치 ID
+    def create_batch(self, shards):
+        batch_id = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        for kind in ("tasks", "claimed", "done", "journals"):
+            os.makedirs(self._dir(batch_id, kind), exist_ok=True)
+        shard_names = []
+        for index, items in enumerate(shards):
+            if not items:
+                continue
+            shard_name = f"{_SHARD_PREFIX}{index}.json"
+            write_json_atomic(os.path.join(self._dir(batch_id, "tasks"), shard_name), items)
+            shard_names.append(shard_name)
+        return batch_id, shard_names
+
+    def shard_state(self, batch_id, shard_name):
+        for kind in ("done", "claimed", "tasks"):
+            if os.path.exists(os.path.join(self._dir(batch_id, kind), shard_name)):
+                return kind
+        return None
+
+    def pending_count(self, batch_id):
+        try:
+            return len(os.listdir(self._dir(batch_id, "tasks")))
+        except OSError:
+            return 0
+
+    # 처리 중이던 워커가 죽어 저널이 오래 갱신되지 않은 샤드를 다시 큐에 넣음
+    def requeue_stale(self, batch_id, lease_seconds=SHARD_LEASE_SECONDS):
+        requeued = []
+        claimed_dir = self._dir(batch_id, "claimed")
+        for shard_name in os.listdir(claimed_dir):
+            claimed_path = os.path.join(claimed_dir, shard_name)
+            journal_path = self.journal_path(batch_id, shard_name)
+            try:
+                heartbeat = max(
+                    os.path.getmtime(claimed_path),
+                    os.path.getmtime(journal_path) if os.path.exists(journal_path) else 0,
+                )
+            except OSError:
+                continue
+            if time.time() - heartbeat > lease_seconds:
+                try:
+                    os.rename(claimed_path, os.path.join(self._dir(batch_id, "tasks"), shard_name))
+                    requeued.append(shard_name)
+                except OSError:
+                    continue
+        return requeued
+
+    def remove_batch(self, batch_id):
+        shutil.rmtree(os.path.join(self.root, batch_id), ignore_errors=True)
+
+    # ---------------------------------------------------------
+    # 워커: 샤드 하나 가져오기 (rename은 원자적이므로 여러 워커가 동시에 시도해도 한 명만 성공)
+    # 반환값: (배치 ID, 샤드 이름, 항목 리스트) 또는 None
+    def claim(self):
+        try:
+            batch_ids = sorted(os.listdir(self.root))
+        except OSError:
+            return None
+        for batch_id in batch_ids:
+            tasks_dir = self._dir(batch_id, "tasks")
+            try:
+                shard_names = sorted(os.listdir(tasks_dir))
+            except OSError:
+                continue
+            for shard_name in shard_names:
+                if not shard_name.startswith(_SHARD_PREFIX) or not shard_name.endswith(".json"):
+                    continue
+                claimed_path = os.path.join(self._dir(batch_id, "claimed"), shard_name)
+                try:
+                    os.rename(os.path.join(tasks_dir, shard_name), claimed_path)
+                except OSError:
+                    continue
+                os.utime(claimed_path)
+                with open(claimed_path, 'r', encoding='utf-8') as f:
+                    return batch_id, shard_name, json.load(f)
+        return None
+
+    def mark_done(self, batch_id, shard_name):
+        os.rename(
+            os.path.join(self._dir(batch_id, "claimed"), shard_name),
+            os.path.join(self._dir(batch_id, "done"), shard_name),
+        )
+
+
+# -------------------------------------------------------------
+# 저널 파일에서 새로 추가된 결과만 읽기 (마지막 줄이 아직 쓰는 중이면 다음에 읽음)
+class JournalTail:
+    def __init__(self, path):
+        self.path = path
+        self._offset = 0
+
+    def read_new(self):
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return []
+        end = data.rfind(b"\n")
+        if end < 0:
+            return []
+        self._offset += end + 1
+        results = []
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("type") == "result" and isinstance(record.get("result"), dict):
+                results.append(record["result"])
+        return results
+
+
+# -------------------------------------------------------------
+# 워커: 큐에서 샤드를 가져와 크롤링 (exit_when_idle이면 남은 샤드가 없을 때 종료)
+def run_worker(queue_dir=QUEUE_DIR, concurrency=WORKER_CONCURRENCY, exit_when_idle=False,
+               engine=None, record_endpoint=None):
+    import app
+    import http_engine
+
+    if engine:
+        app.CRAWL_ENGINE = engine
+    if record_endpoint:
+        http_engine.RECORD_ENDPOINT = record_endpoint
+    app.MAX_WORKERS = concurrency
+    app.INITIAL_WORKERS = min(app.INITIAL_WORKERS, concurrency)
+    worker_name = f"{socket.gethostname()}:{os.getpid()}"
+
+    # 코디네이터가 멈추라고 하면(SIGTERM) 드라이버 풀을 닫고 종료 (Chrome/chromedriver가 남지 않도록)
+    # 대여 중인 드라이버는 진행 중인 프로필이 끝나 반납될 때 종료됨
+    def stop(signum, frame):
+        print(f"[워커 {worker_name}] 종료 요청을 받아 드라이버를 정리하고 종료합니다.")
+        if app._driver_pool is not None:
+            app._driver_pool.close()
+        raise SystemExit(128 + signum)
+
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, stop)
+
+    queue = WorkQueue(queue_dir)
+    processed = 0
+    while True:
+        claimed = queue.claim()
+        if claimed is None:
+            if exit_when_idle:
+                break
+            time.sleep(POLL_SECONDS * 5)
+            continue
+
+        batch_id, shard_name, items = claimed
+        # 다른 워커가 하다 만 샤드면 저널에서 이미 성공한 플레이어는 건너뜀
+        journal = CrawlJournal(queue.journal_path(batch_id, shard_name), run_id=f"{batch_id}/{shard_name}")
+        completed_ids = journal.completed_ids()
+        todo = [item for item in items if app._get_player_id_from_url(item['url']) not in completed_ids]
+        print(f"[워커 {worker_name}] {batch_id}/{shard_name}: {len(todo)}개 크롤링 시작 "
+              f"(이어받음 {len(items) - len(todo)}개)")
+        try:
+            # 워커마다 자체 서킷 브레이커로 장애 시 잠시 멈춤 (회차 중단 여부는 코디네이터가 판단)
+            app._crawl_with_scheduler(todo, journal.append, {}, failures.CircuitBreaker(max_trips=float("inf")))
+        finally:
+            journal.close()
+        try:
+            queue.mark_done(batch_id, shard_name)
+        except OSError as e:
+            # 코디네이터가 이미 배치를 정리한 경우 (재할당된 샤드를 다른 워커가 먼저 끝냄 등)
+            print(f"[워커 {worker_name}] {batch_id}/{shard_name} 완료 표시 실패 (무시): {e}")
+        processed += 1
+    return processed
+
+
+# 헬퍼 함수: 로컬 워커 정리
+# graceful=True (모든 샤드 완료): 워커가 드라이버 풀을 닫고 스스로 끝나길 먼저 기다림
+# 남은 워커는 SIGTERM(워커가 드라이버 풀을 닫음) -> 그래도 안 끝나면 강제 종료
+def _stop_workers(workers, graceful, timeout=WORKER_EXIT_TIMEOUT):
+    if graceful:
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            try:
+                worker.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                pass
+    running = [worker for worker in workers if worker.poll() is None]
+    for worker in running:
+        worker.terminate()
+    deadline = time.monotonic() + timeout
+    for worker in running:
+        try:
+            worker.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            print(f"[샤드] 워커(pid {worker.pid})가 종료되지 않아 강제 종료합니다.")
+            worker.kill()
+            worker.wait()
+
+
+def _spawn_local_worker(queue_dir, concurrency, worker_args=()):
+    return subprocess.Popen(
+        [sys.executable, os.path.join(_CRAWLER_DIR, "sharding.py"), "worker",
+         "--queue", os.path.abspath(queue_dir), "--concurrency", str(concurrency), "--exit-when-idle",
+         *worker_args],
+        cwd=os.getcwd(),
+    )
+
+
+# -------------------------------------------------------------
+# 코디네이터: app.py 크롤링 작업의 crawl_batch로 사용
+# 샤드를 큐에 넣고 로컬 워커 프로세스를 띄운 뒤, 샤드 저널을 읽어 결과를 on_result로 넘김
+# worker_args: 로컬 워커 명령줄에 덧붙일 인자 (예: ["--engine", "http"])
+# breaker: 샤드 저널에서 읽은 결과로 실패율을 보고, 중단되면 워커를 멈추고 남은 샤드를 포기
+def sharded_crawl_batch(shard_count, local_workers, player_id_of, queue_dir=QUEUE_DIR,
+                        concurrency=WORKER_CONCURRENCY, worker_args=()):
+    def crawl_batch(urls_to_crawl, on_result, scheduler_stats, breaker=None):
+        if not urls_to_crawl:
+            return
+        queue = WorkQueue(queue_dir)
+        shards = partition_items(urls_to_crawl, shard_count, player_id_of)
+        batch_id, shard_names = queue.create_batch(shards)
+        tails = {shard_name: JournalTail(queue.journal_path(batch_id, shard_name)) for shard_name in shard_names}
+        print(f"[샤드] {len(urls_to_crawl)}개 URL을 {len(shard_names)}개 샤드로 나눠 큐에 넣었습니다 ({batch_id}). "
+              f"로컬 워커 {local_workers}개 실행")
+
+        workers = [
+            _spawn_local_worker(queue_dir, concurrency, worker_args)
+            for _ in range(min(local_workers, len(shard_names)))
+        ]
+        restarts_left = MAX_WORKER_RESTARTS_PER_SHARD * len(shard_names)
+        finished = False
+
+        def collect(result):
+            if breaker:
+                breaker.record(failures.error_class_of(result))
+            on_result(result)
+
+        try:
+            while True:
+                for tail in tails.values():
+                    for result in tail.read_new():
+                        collect(result)
+
+                # 결과만 지켜봄 (일시 정지는 워커마다 자체 브레이커로 처리, 여기서는 회차 중단만 판단)
+                # (반열림 전환만 하고 확인 시도 수는 쓰지 않음 -> 반열림 뒤 들어오는 결과로 재개/재차단)
+                if breaker:
+                    breaker.cooldown_remaining()
+                    if breaker.aborted:
+                        print("[샤드] 사이트 장애로 크롤링이 중단되어 남은 샤드를 포기합니다.")
+                        break
+
+                if all(queue.shard_state(batch_id, shard_name) == "done" for shard_name in shard_names):
+                    # 완료 표시 직전에 쓰인 줄까지 마저 읽음
+                    for tail in tails.values():
+                        for result in tail.read_new():
+                            collect(result)
+                    finished = True
+                    break
+
+                requeued = queue.requeue_stale(batch_id)
+                if requeued:
+                    print(f"[샤드] 응답 없는 워커의 샤드를 다시 큐에 넣었습니다: {', '.join(requeued)}")
+
+                # 남은 샤드가 있는데 살아 있는 로컬 워커가 없으면 새로 띄움 (다른 서버 워커가 없어도 끝나도록)
+                workers = [worker for worker in workers if worker.poll() is None]
+                if queue.pending_count(batch_id) and not workers:
+                    if restarts_left <= 0:
+                        print("[샤드] 로컬 워커가 계속 비정상 종료되어 남은 샤드를 포기합니다.")
+                        break
+                    restarts_left -= 1
+                    workers.append(_spawn_local_worker(queue_dir, concurrency, worker_args))
+                time.sleep(POLL_SECONDS)
+        finally:
+            _stop_workers(workers, graceful=finished)
+            queue.remove_batch(batch_id)
+
+        scheduler_stats["shards"] = scheduler_stats.get("shards", 0) + len(shard_names)
+        scheduler_stats["shard_workers"] = local_workers
+    return crawl_batch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="샤드 크롤링 워커")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    worker_parser = subparsers.add_parser("worker", help="큐 폴더에서 샤드를 가져와 크롤링")
+    worker_parser.add_argument("--queue", default=QUEUE_DIR, help="큐 폴더 (여러 서버가 공유 가능)")
+    worker_parser.add_argument("--concurrency", type=int, default=WORKER_CONCURRENCY, help="이 워커의 동시 크롤링 수")
+    worker_parser.add_argument("--exit-when-idle", action="store_true", help="남은 샤드가 없으면 종료")
+    worker_parser.add_argument("--engine", choices=["selenium", "http"], help="크롤링 엔진 (기본: app.py 설정)")
+    worker_parser.add_argument("--record-endpoint", help="HTTP 엔진의 전적 요청 주소 (벤치마크용)")
+    args = parser.parse_args(argv)
+
+    if args.command == "worker":
+        run_worker(args.queue, args.concurrency, args.exit_when_idle, args.engine, args.record_endpoint)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
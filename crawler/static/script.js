@@ -3,6 +3,88 @@ document.addEventListener("DOMContentLoaded", () => {
     const statusMessage = document.getElementById("statusMessage");
     const resultsOutput = document.getElementById("resultsOutput");
 
+    // -------------------------------------------------------------
+    // 진행 상황 스트림(SSE)을 구독하다가 작업이 끝나면 최종 상태(결과 포함)를 반환
+    function waitForCrawlJob(jobId) {
+        return new Promise((resolve, reject) => {
+            const events = new EventSource(`/crawl/${jobId}/events`);
+
+            events.addEventListener("start", (event) => {
+                const info = JSON.parse(event.data);
+                resultsOutput.innerHTML = `<p>총 ${info.total}개 URL 크롤링 중...</p>`;
+            });
+
+            events.addEventListener("progress", (event) => {
+                const info = JSON.parse(event.data);
+                statusMessage.textContent = `크롤링 진행 중... (${info.completed}/${info.total})`;
+                const p = document.createElement("p");
+                p.textContent = `${info.구단주명 || info.player_id}: ${info.error ? "실패 - " + info.error : "완료"}`;
+                if (info.error) {
+                    p.style.color = "red";
+                }
+                resultsOutput.appendChild(p);
+            });
+
+            events.addEventListener("league_done", (event) => {
+                const info = JSON.parse(event.data);
+                const p = document.createElement("p");
+                p.innerHTML = `<strong>${info.리그명 || "전체"} 결과가 먼저 반영되었습니다. (${info.last_updated})</strong>`;
+                resultsOutput.appendChild(p);
+            });
+
+            events.addEventListener("done", async () => {
+                events.close();
+                try {
+                    const response = await fetch(`/crawl/${jobId}`);
+                    resolve(await response.json());
+                } catch (error) {
+                    reject(error);
+                }
+            });
+
+            events.onerror = () => {
+                // 연결이 끊긴 경우 EventSource가 자동으로 재연결을 시도하므로 안내만 표시
+                statusMessage.textContent = "진행 상황 연결이 끊겼습니다. 재연결을 시도합니다...";
+            };
+        });
+    }
+
+    // -------------------------------------------------------------
+    // 최종 결과 표시
+    function showCrawlResult(data) {
+        if (data.status === "success" || data.status === "warning") {
+            statusMessage.textContent = data.message + " 결과 페이지를 새 탭으로 엽니다.";
+
+            // -------------------------------------------------------------
+            // 결과 데이터와 최신화 날짜를 localStorage에 저장
+            if (data.results) {
+                localStorage.setItem("fconline_crawl_results", JSON.stringify(data.results));
+                localStorage.setItem("fconline_last_updated", data.last_updated); // 최신화 날짜도 저장
+            }
+            window.open("/results_table", "_blank"); // 새 탭 열기
+            // -------------------------------------------------------------
+
+            resultsOutput.innerHTML = "<p>크롤링이 완료되었습니다. 새 탭에서 결과를 확인하세요.</p>";
+        } else {
+            statusMessage.textContent = `오류: ${data.message}`;
+            resultsOutput.innerHTML = `<p style="color:red;">오류가 발생했습니다: ${data.message}</p>`;
+            if (data.results && data.results.length > 0) {
+                data.results.forEach((item) => {
+                    const div = document.createElement("div");
+                    div.className = "result-item error";
+                    div.innerHTML = `
+                        <p><strong>구단주명:</strong> ${item.구단주명}</p>
+                        <p><strong>승:</strong> ${item.승}</p>
+                        <p><strong>무:</strong> ${item.무}</p>
+                        <p><strong>패:</strong> ${item.패}</p>
+                        ${item.error ? `<p style="color:red;"><strong>오류:</strong> ${item.error}</p>` : ""}
+                    `;
+                    resultsOutput.appendChild(div);
+                });
+            }
+        }
+    }
+
     startCrawlBtn.addEventListener("click", async () => {
         statusMessage.textContent = "크롤링 요청을 보냈습니다. 서버에서 데이터를 가져오는 중... (시간이 오래 걸릴 수 있습니다.)";
         resultsOutput.innerHTML = "<p>데이터를 처리 중입니다...</p>";
@@ -18,34 +100,13 @@ document.addEventListener("DOMContentLoaded", () => {
 
             const data = await response.json();
 
-            if (data.status === "success" || data.status === "warning") {
-                statusMessage.textContent = data.message + " 결과 페이지를 새 탭으로 엽니다.";
-
-                // -------------------------------------------------------------
-                // 결과 데이터와 최신화 날짜를 localStorage에 저장
-                localStorage.setItem("fconline_crawl_results", JSON.stringify(data.results));
-                localStorage.setItem("fconline_last_updated", data.last_updated); // 최신화 날짜도 저장
-                window.open("/results_table", "_blank"); // 새 탭 열기
-                // -------------------------------------------------------------
-
-                resultsOutput.innerHTML = "<p>크롤링이 완료되었습니다. 새 탭에서 결과를 확인하세요.</p>";
+            if (data.status === "accepted") {
+                // 크롤링은 서버에서 백그라운드로 진행되므로, 진행 상황 스트림을 구독하고 완료를 기다림
+                statusMessage.textContent = data.message;
+                const job = await waitForCrawlJob(data.job_id);
+                showCrawlResult(job.result || { status: "error", message: job.message });
             } else {
-                statusMessage.textContent = `오류: ${data.message}`;
-                resultsOutput.innerHTML = `<p style="color:red;">오류가 발생했습니다: ${data.message}</p>`;
-                if (data.results && data.results.length > 0) {
-                    data.results.forEach((item) => {
-                        const div = document.createElement("div");
-                        div.className = "result-item error";
-                        div.innerHTML = `
-                            <p><strong>구단주명:</strong> ${item.구단주명}</p>
-                            <p><strong>승:</strong> ${item.승}</p>
-                            <p><strong>무:</strong> ${item.무}</p>
-                            <p><strong>패:</strong> ${item.패}</p>
-                            ${item.error ? `<p style="color:red;"><strong>오류:</strong> ${item.error}</p>` : ""}
-                        `;
-                        resultsOutput.appendChild(div);
-                    });
-                }
+                showCrawlResult(data);
             }
         } catch (error) {
             statusMessage.textContent = `네트워크 오류 또는 서버 응답 실패: ${error}`;
@@ -0,0 +1,267 @@
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from leaderboard_cache import API_COLUMNS
+from output_writer import OutputWriter, content_hash, dumps_json
+
+# -------------------------------------------------------------
+# 정적 사이트 내보내기 (정적 호스팅에 올릴 폴더를 바뀐 파일만 갱신)
+#  - 리그별 HTML 조각(표) + 작은 JSON 데이터 파일(/api/leaderboard 와 같은 columns/rows 형식)을 만들고
+#  - 조각/데이터/정적 파일(style.css, results_table.js)은 내용 해시를 파일 이름에 넣음 (예: style.3f2a9c1b0d.css)
+#    -> 이름이 같으면 내용도 같으므로 호스트에서 오래 캐시해도 됨 (.htaccess 캐시 규칙 함께 기록)
+#  - 대상 폴더에 없는 해시 파일만 새로 쓰고, 진입 페이지(index.html)와 manifest.json 은 마지막에 교체
+#  - manifest 의 "written"/"deleted" 는 마지막 동기화 확인(--ack) 이후 누적된 목록
+#    -> 업로드 도구는 두 목록만 옮긴 뒤 'python static_export.py --ack' 로 비움 (그 사이 여러 번 내보내도 빠짐없음)
+#  - 더 이상 쓰지 않는 파일은 RETIRED_KEEP_HOURS 동안 남겨 두었다가(retired) 삭제
+#    -> 예전 index.html 을 보고 있는 방문자(또는 아직 동기화되지 않은 호스트)도 조각을 받을 수 있음
+#
+# 사용 예 (crawler 폴더에서 실행, 마지막 크롤링 결과로 내보내기 / 동기화 후 확인):
+#   python static_export.py --target static_site
+#   python static_export.py --target static_site --ack
+# -------------------------------------------------------------
+
+_CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 기본 대상 폴더 (로컬 폴더가 정적 호스트 역할)
+STATIC_EXPORT_DIR = "static_site"
+
+# 파일 이름에 넣을 해시 길이 (16진수 글자 수)
+HASH_LENGTH = 10
+
+# 해시 이름으로 함께 내보낼 정적 파일 (static 폴더 기준)
+STATIC_ASSETS = ("style.css", "results_table.js")
+
+INDEX_FILE = "index.html"
+MANIFEST_FILE = "manifest.json"
+DATA_FILE = "data.json"
+
+# Apache 계열 정적 호스트용 캐시 규칙: 해시 이름 파일은 1년 + immutable, 진입 페이지/manifest 는 매번 재확인
+CACHE_RULES_FILE = ".htaccess"
+CACHE_RULES = f"""<IfModule mod_headers.c>
+    <FilesMatch "\\.[0-9a-f]{{{HASH_LENGTH}}}\\.(css|js|html|json)$">
+        Header set Cache-Control "public, max-age=31536000, immutable"
+    </FilesMatch>
+    <FilesMatch "^({INDEX_FILE}|{MANIFEST_FILE})$">
+        Header set Cache-Control "no-cache"
+    </FilesMatch>
+</IfModule>
+"""
+
+# 더 이상 쓰지 않는 해시 파일을 지우기 전까지 남겨 두는 시간 (시간)
+RETIRED_KEEP_HOURS = 24
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+# -------------------------------------------------------------
+# 헬퍼 함수: 내용 해시를 넣은 파일 이름 (style.css -> style.<해시>.css)
+def hashed_name(name, body):
+    base, ext = os.path.splitext(name)
+    return f"{base}.{content_hash(body)[:HASH_LENGTH]}{ext}"
+
+
+# '비고' 값에 따른 CSS 클래스 (results_table.js 와 같은 규칙)
+def remark_class(remark):
+    if remark.startswith("↑") or remark == "New":
+        return "rank-up"
+    if remark.startswith("↓"):
+        return "rank-down"
+    if remark == "-":
+        return "rank-no-change"
+    if remark == "오류":
+        return "error-row"
+    return ""
+
+
+class StaticExporter:
+    def __init__(self, target_dir=STATIC_EXPORT_DIR, static_dir=None, template_dir=None,
+                 retired_keep_hours=RETIRED_KEEP_HOURS):
+        self.target_dir = target_dir
+        self.retired_keep = timedelta(hours=retired_keep_hours)
+        self.static_dir = static_dir or os.path.join(_CRAWLER_DIR, "static")
+        self.env = Environment(loader=FileSystemLoader(template_dir or os.path.join(_CRAWLER_DIR, "templates")),
+                               autoescape=select_autoescape(["html"]), trim_blocks=True, lstrip_blocks=True)
+        self.env.filters["remark_class"] = remark_class
+        self.writer = OutputWriter()
+
+    def _path(self, name):
+        return os.path.join(self.target_dir, name)
+
+    def _read_manifest(self):
+        try:
+            with open(self._path(MANIFEST_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"경고: 정적 사이트 manifest 를 읽지 못했습니다. 전체를 다시 씁니다: {e}")
+            return {}
+
+    # ---------------------------------------------------------
+    # 내보낼 파일 내용 만들기
+    # results: 화면 표시 형식의 결과 (표시 순서), leagues: 리그 순서 (None 이면 리그 구분 없음)
+    # 반환값: (해시 이름 파일 {논리 이름: (파일 이름, 바이트)}, index.html 바이트)
+    def build(self, results, leagues, last_updated):
+        hashed = {}
+        for asset in STATIC_ASSETS:
+            with open(os.path.join(self.static_dir, asset), 'rb') as f:
+                body = f.read()
+            hashed[asset] = (hashed_name(asset, body), body)
+
+        # 리그별 HTML 조각 (리그 안 순위는 표시 순서 그대로)
+        fragment_template = self.env.get_template("league_fragment.html")
+        fragments = []
+        for position, league in enumerate(leagues, 1):
+            league_results = [item for item in results if not league or item.get("리그명") == league]
+            body = fragment_template.render(
+                league=league or "전체",
+                results=league_results,
+                success_count=sum(1 for item in league_results if not item.get("error")),
+            ).encode("utf-8")
+            name = f"league{position}.html"
+            hashed[name] = (hashed_name(name, body), body)
+            fragments.append({"league": league or "전체", "file": hashed[name][0]})
+
+        body = dumps_json({
+            "last_updated": last_updated,
+            "columns": API_COLUMNS,
+            "rows": [[item.get(column) for column in API_COLUMNS] for item in results],
+        }, pretty=False)
+        hashed[DATA_FILE] = (hashed_name(DATA_FILE, body), body)
+
+        index_html = self.env.get_template("static_index.html").render(
+            assets={asset: hashed[asset][0] for asset in STATIC_ASSETS},
+            fragments=fragments,
+            data_file=hashed[DATA_FILE][0],
+            last_updated=last_updated,
+        ).encode("utf-8")
+        return hashed, index_html
+
+    def _write_manifest(self, manifest):
+        self.writer.write_all([(self._path(MANIFEST_FILE), dumps_json(manifest))])
+
+    # ---------------------------------------------------------
+    # 대상 폴더에 바뀐 파일만 기록 (크롤링 한 회차에 한 번)
+    # 반환값: 기록한 manifest ("last_export" 에 이번에 쓰고 지운 파일, "written"/"deleted" 에 동기화 대기 목록)
+    def export(self, results, leagues, last_updated, now=None):
+        now = now or datetime.now()
+        os.makedirs(self.target_dir, exist_ok=True)
+        previous = self._read_manifest()
+        hashed, index_html = self.build(results, leagues, last_updated)
+
+        # 해시 이름 파일은 이름이 같으면 내용도 같으므로 대상 폴더에 없는 것만 기록
+        artifacts = [
+            (self._path(name), body) for name, body in hashed.values() if not os.path.exists(self._path(name))
+        ]
+        # 진입 페이지는 조각/정적 파일이 모두 기록된 뒤에 교체 (내용이 같으면 OutputWriter 가 건너뜀)
+        artifacts.append((self._path(CACHE_RULES_FILE), CACHE_RULES.encode("utf-8")))
+        artifacts.append((self._path(INDEX_FILE), index_html))
+        written, _ = self.writer.write_all(artifacts)
+        written_names = [os.path.basename(path) for path in written]
+
+        # 정리: 이번에 쓰지 않는 파일은 retired 로 옮기고, RETIRED_KEEP_HOURS 가 지난 파일만 삭제
+        current_files = {name for name, _ in hashed.values()}
+        previous_retired = previous.get("retired") or {}
+        if isinstance(previous_retired, list):  # 예전 manifest 형식 (이름 목록)
+            previous_retired = dict.fromkeys(previous_retired, now.strftime(TIME_FORMAT))
+        retired = {name: retired_at for name, retired_at in previous_retired.items() if name not in current_files}
+        for name in set(previous.get("files", {}).values()) - current_files:
+            retired.setdefault(name, now.strftime(TIME_FORMAT))
+        deleted_names = []
+        for name, retired_at in sorted(retired.items()):
+            if now - datetime.strptime(retired_at, TIME_FORMAT) < self.retired_keep:
+                continue
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"경고: 이전 정적 파일 '{name}' 을(를) 지우지 못했습니다: {e}")
+                continue
+            del retired[name]
+            deleted_names.append(name)
+
+        # 동기화 대기 목록 누적 (아직 올리지 않은 채 지운 파일은 호스트에도 없으므로 두 목록에서 모두 뺌)
+        pending_written = [name for name in previous.get("written", []) if name != MANIFEST_FILE]
+        pending_deleted = previous.get("deleted", [])
+        for name in written_names:
+            if name not in pending_written:
+                pending_written.append(name)
+        pending_deleted = [name for name in pending_deleted if name not in written_names]
+        for name in deleted_names:
+            if name in pending_written:
+                pending_written.remove(name)
+            elif name not in pending_deleted:
+                pending_deleted.append(name)
+
+        manifest = {
+            "generated_at": now.strftime(TIME_FORMAT),
+            "last_updated": last_updated,
+            "entry": INDEX_FILE,
+            "files": {logical: name for logical, (name, _) in hashed.items()},
+            "hashes": {name: content_hash(body) for name, body in hashed.values()},
+            "written": pending_written + [MANIFEST_FILE],
+            "deleted": pending_deleted,
+            "retired": retired,
+            "last_export": {
+                "written": written_names,
+                "written_bytes": sum(len(body) for path, body in artifacts if path in written),
+                "deleted": deleted_names,
+            },
+        }
+        self._write_manifest(manifest)
+        return manifest
+
+    # 동기화 완료 확인: 누적된 written/deleted 목록을 비움
+    def acknowledge(self):
+        manifest = self._read_manifest()
+        if not manifest:
+            return manifest
+        manifest["written"] = []
+        manifest["deleted"] = []
+        self._write_manifest(manifest)
+        return manifest
+
+
+# -------------------------------------------------------------
+# 명령줄 실행: 표시용 JSON(current_crawl_display_data.json)으로 내보내기
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="리그 결과를 정적 사이트 폴더로 내보내기 (바뀐 파일만 기록)")
+    parser.add_argument("--target", default=STATIC_EXPORT_DIR, help="내보낼 폴더 (정적 호스트와 동기화할 폴더)")
+    parser.add_argument("--data", default="current_crawl_display_data.json", help="표시용 결과 JSON 파일")
+    parser.add_argument("--ack", action="store_true", help="호스트 동기화가 끝났음을 기록 (written/deleted 목록 비움)")
+    args = parser.parse_args(argv)
+
+    if args.ack:
+        StaticExporter(args.target).acknowledge()
+        print(f"'{args.target}' 폴더의 동기화 대기 목록을 비웠습니다.")
+        return 0
+
+    try:
+        with open(args.data, 'r', encoding='utf-8') as f:
+            display_data = json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"결과 파일을 읽지 못했습니다 ({args.data}): {e}")
+        return 1
+
+    results = display_data.get("results", [])
+    leagues = sorted({item["리그명"] for item in results if item.get("리그명")}) or [None]
+    manifest = StaticExporter(args.target).export(results, leagues, display_data.get("last_updated"))
+    last_export = manifest["last_export"]
+    print(f"'{args.target}' 폴더로 내보냈습니다: 파일 {len(last_export['written'])}개 기록 "
+          f"({last_export['written_bytes']:,}바이트), {len(last_export['deleted'])}개 삭제")
+    print(f"동기화 대기: 올릴 파일 {len(manifest['written'])}개, 지울 파일 {len(manifest['deleted'])}개")
+    for name in manifest["written"]:
+        print(f"  + {name}")
+    for name in manifest["deleted"]:
+        print(f"  - {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
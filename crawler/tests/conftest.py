@@ -0,0 +1,5 @@
+import os
+import sys
+
+# crawler 폴더의 모듈을 바로 import 할 수 있도록 (python -m pytest tests)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
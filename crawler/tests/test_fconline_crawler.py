@@ -0,0 +1,85 @@
+from selenium.common.exceptions import NoSuchElementException
+
+import app
+import failures
+import fconline_crawler
+
+OFFICIAL_RECORD = "9승 9무 9패"
+MANAGER_RECORD = "12승 3무 4패"
+
+
+# 프로필 팝업 하나만 흉내 내는 드라이버 (페이지 이동은 바로 끝남)
+class _FakeElement:
+    def __init__(self, driver, name):
+        self._driver = driver
+        self._name = name
+
+    @property
+    def text(self):
+        if self._name == "grade_desc":
+            return self._driver.grade_text
+        if self._name == "coach":
+            return "ES테스트"
+        return ""
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        # 감독 모드 탭을 누르면 (사이트가 반응하는 경우에만) 전적 텍스트가 바뀜
+        if self._name == "manager" and self._driver.switches_mode:
+            self._driver.grade_text = MANAGER_RECORD
+
+
+class _FakeDriver:
+    def __init__(self, switches_mode):
+        self.switches_mode = switches_mode
+        self.grade_text = ""
+        self.url = None
+
+    def execute_script(self, script, *args):
+        if args:
+            self.url = args[0]
+            self.grade_text = OFFICIAL_RECORD
+            return None
+        return self.url is not None
+
+    def find_element(self, by, value):
+        if self.url is None:
+            raise NoSuchElementException()
+        name = value if value in ("selector_wrap", "league", "grade_desc", "coach") else "manager"
+        return _FakeElement(self, name)
+
+    def find_elements(self, by, value):
+        try:
+            return [self.find_element(by, value)]
+        except NoSuchElementException:
+            return []
+
+
+def _run_task(monkeypatch, switches_mode):
+    monkeypatch.setattr(app, "MANAGER_RECORD_TIMEOUT", 0.05)
+    item = {"url": "https://fconline.nexon.com/profile/stat/popup/1234567890", "annotation": "", "league": "1부리그"}
+    task = fconline_crawler._TabTask(_FakeDriver(switches_mode), item, 1)
+    for _ in task.steps:
+        pass
+    return task.finish()
+
+
+def test_changed_record_is_stored(monkeypatch):
+    result = _run_task(monkeypatch, switches_mode=True)
+    assert "error" not in result
+    assert (result["승"], result["무"], result["패"]) == (12, 3, 4)
+    assert result["구단주명"] == "ES테스트"
+
+
+def test_unchanged_record_is_a_timeout_failure(monkeypatch):
+    # 감독 모드로 바뀌지 않은 화면의 값(공식 경기 전적)은 저장하지 않고, 재시도/서킷 브레이커 대상인 TIMEOUT 으로 분류
+    result = _run_task(monkeypatch, switches_mode=False)
+    assert "승" not in result
+    assert result["error"] == failures.RECORD_UNCHANGED_MESSAGE
+    assert result["error_class"] == failures.TIMEOUT
+    assert failures.error_class_of(result) == failures.TIMEOUT
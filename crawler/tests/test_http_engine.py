@@ -0,0 +1,93 @@
+import pytest
+
+import app
+import failures
+import http_engine
+from bench_server import ProfileServer, ProfileServerConfig
+
+PLAYER_ID = "1234567890"
+POPUP_PATH = f"/profile/stat/popup/{PLAYER_ID}"
+
+
+def _popup_html(server, query):
+    status, _, body = server.respond(POPUP_PATH, query)
+    assert status == 200
+    return body.decode("utf-8")
+
+
+def _server(**config):
+    return ProfileServer(ProfileServerConfig(record_latency=0.0, **config))
+
+
+# -------------------------------------------------------------
+# 응답 파싱 (bench_server 팝업 마크업 기준)
+def test_parses_manager_mode_record():
+    server = _server()
+    record = http_engine.parse_manager_record(_popup_html(server, {"n1Type": ["52"]}))
+    assert (record["win"], record["draw"], record["loss"]) == server.manager_record(PLAYER_ID)
+    assert record["coach"] == server.coach_name(PLAYER_ID)
+
+
+def test_missing_grade_desc_is_parse_error():
+    server = _server(missing_rate=1.0)
+    with pytest.raises(http_engine.RecordParseError):
+        http_engine.parse_manager_record(_popup_html(server, {"n1Type": ["52"]}))
+    with pytest.raises(http_engine.RecordParseError):
+        http_engine.parse_manager_record('<a class="league">감독 모드</a><span class="coach">ES테스트</span>')
+
+
+def test_default_mode_record_is_rejected():
+    # 모드 파라미터가 무시되어 공식경기 전적이 온 경우, 전적 형식이 맞아도 사용하지 않음
+    server = _server()
+    with pytest.raises(http_engine.RecordParseError):
+        http_engine.parse_manager_record(_popup_html(server, {}))
+    with pytest.raises(http_engine.RecordParseError):
+        http_engine.parse_manager_record('<div class="grade_desc">1승 2무 3패</div>')
+
+
+def test_void_tags_do_not_leak_text_outside_the_element():
+    parser = http_engine._ClassTextParser(["grade_desc", "coach"])
+    parser.feed('<div class="grade_desc"><br>1승 <img src="x.png">2무<br/> 3패</div>'
+                '<p>99승 0무 0패</p><span class="coach">ES<input type="hidden">테스트</span><b>다른 이름</b>')
+    parser.close()
+    assert parser.text_of("grade_desc") == "1승 2무 3패"
+    assert parser.text_of("coach") == "ES 테스트"
+
+
+# -------------------------------------------------------------
+# 엔진 대체 규칙: 전적 확인 실패만 Selenium으로 대체, 요청 실패는 오류 결과 (스케줄러/서킷 브레이커 반영)
+@pytest.fixture
+def popup_server(monkeypatch):
+    servers = []
+
+    def start(**config):
+        server = _server(**config).start()
+        servers.append(server)
+        monkeypatch.setattr(http_engine, "RECORD_ENDPOINT", server.base_url + "/profile/stat/popup/{player_id}")
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def _item():
+    return {"url": f"https://fconline.nexon.com/profile/stat/popup/{PLAYER_ID}", "annotation": "", "league": "1부리그"}
+
+
+def test_http_crawl_returns_raw_record(popup_server):
+    server = popup_server()
+    result = app._crawl_single_url_http(_item())
+    assert (result["승"], result["무"], result["패"]) == server.manager_record(PLAYER_ID)
+    assert "error" not in result
+
+
+def test_http_status_error_is_reported_not_retried_in_browser(popup_server):
+    popup_server(failure_rate=1.0)
+    result = app._crawl_single_url_http(_item())
+    assert result["error_class"] == failures.HTTP_ERROR
+
+
+def test_unverified_response_falls_back_to_selenium(popup_server):
+    popup_server(missing_rate=1.0)
+    assert app._crawl_single_url_http(_item()) is None
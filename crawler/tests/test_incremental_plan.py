@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import app
+from freshness import FreshnessCache
+from player_record import PlayerRecord, derive_stats
+
+NOW = datetime(2026, 1, 10, 12, 0, 0)
+PLAYER_ID = "1234567890"
+URL = f"https://fconline.nexon.com/profile/stat/popup/{PLAYER_ID}"
+
+
+def _previous(league):
+    record = PlayerRecord(PLAYER_ID, coach_name="ES테스트", league=league, win=10, draw=2, loss=3)
+    derive_stats([record])
+    return {PLAYER_ID: record}
+
+
+# 최근에 크롤링했고 변동이 없는 감독 -> "skip"
+def _fresh_cache(tmp_path):
+    freshness = FreshnessCache(str(tmp_path / "freshness.json"))
+    freshness.entries[PLAYER_ID] = {
+        "last_crawled": "2026-01-10 11:00:00",
+        "record": [10, 2, 3],
+        "fingerprint": "",
+        "last_changed": None,
+    }
+    return freshness
+
+
+def test_skipped_player_is_retagged_with_new_league(tmp_path):
+    previous = _previous("2부리그")
+    moved_player_ids = set()
+    urls_to_crawl, skipped_count = app._plan_incremental_crawl(
+        [{"url": URL, "annotation": "", "league": "1부리그"}], previous, _fresh_cache(tmp_path), NOW, False,
+        moved_player_ids=moved_player_ids,
+    )
+    assert (urls_to_crawl, skipped_count) == ([], 1)
+    assert previous[PLAYER_ID].league == "1부리그"
+    assert moved_player_ids == {PLAYER_ID}
+
+
+def test_skipped_player_in_same_league_is_not_changed(tmp_path):
+    previous = _previous("1부리그")
+    moved_player_ids = set()
+    app._plan_incremental_crawl(
+        [{"url": URL, "annotation": "", "league": "1부리그"}], previous, _fresh_cache(tmp_path), NOW, False,
+        moved_player_ids=moved_player_ids,
+    )
+    assert moved_player_ids == set()
+
+
+def test_failed_crawl_keeps_record_but_updates_league():
+    results_map = _previous("2부리그")
+    failed = PlayerRecord(PLAYER_ID, league="1부리그", error="timeout")
+    changed_player_ids = set()
+    app._merge_crawled_results(results_map, [failed], changed_player_ids)
+    assert results_map[PLAYER_ID].win == 10
+    assert results_map[PLAYER_ID].league == "1부리그"
+    assert changed_player_ids == {PLAYER_ID}
@@ -0,0 +1,23 @@
+import json
+
+import pytest
+
+from output_writer import write_json_atomic
+
+
+def test_write_json_atomic_replaces_file(tmp_path):
+    path = tmp_path / "state.json"
+    write_json_atomic(str(path), {"a": 1})
+    write_json_atomic(str(path), {"감독": "ES테스트"}, indent=2)
+    assert json.loads(path.read_text(encoding="utf-8")) == {"감독": "ES테스트"}
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    path = tmp_path / "state.json"
+    write_json_atomic(str(path), {"a": 1})
+    # 직렬화 도중 실패해도 기존 파일은 그대로이고 임시 파일도 남지 않음
+    with pytest.raises(TypeError):
+        write_json_atomic(str(path), {"a": object()})
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": 1}
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
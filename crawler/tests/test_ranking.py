@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+from player_record import PlayerRecord, derive_stats
+from ranking import RankingEngine
+
+# RankingEngine(증분 순위)이 기존 방식(매 회차 전체를 세 번 정렬)과 같은 순서/비고를 내는지 확인
+# 기존 방식은 결과 dict 기준: 오류가 아닌 항목만 (채굴 효율, player_id) 내림차순으로 리그별 순위를 매기고,
+# 화면 표시는 전체를 같은 키로 내림차순 정렬
+
+LEAGUES = ["1부리그", "2부리그", None]
+
+
+def _legacy_key(item):
+    efficiency = item.get('채굴 효율', -float('inf'))
+    if not isinstance(efficiency, (int, float)):
+        efficiency = -float('inf')
+    return (efficiency, item.get('player_id', ''))
+
+
+def _legacy_ranks(items):
+    ranks = {}
+    for league in {item.get('리그명') or "" for item in items}:
+        ranked = sorted(
+            [item for item in items if "error" not in item and (item.get('리그명') or "") == league],
+            key=_legacy_key, reverse=True,
+        )
+        ranks[league] = {item['player_id']: rank for rank, item in enumerate(ranked, 1)}
+    return ranks
+
+
+def _legacy_triple_sort(previous_items, current_items):
+    previous_ranks = _legacy_ranks(previous_items)
+    current_ranks = _legacy_ranks(current_items)
+    results = []
+    for item in current_items:
+        league = item.get('리그명') or ""
+        player_id = item['player_id']
+        if "error" not in item and player_id in current_ranks[league]:
+            prev_rank = previous_ranks.get(league, {}).get(player_id)
+            if prev_rank is None:
+                remark = "New"
+            else:
+                rank_diff = prev_rank - current_ranks[league][player_id]
+                remark = f"↑{rank_diff}" if rank_diff > 0 else f"↓{abs(rank_diff)}" if rank_diff < 0 else "-"
+        else:
+            remark = "오류"
+        results.append((player_id, remark))
+    order = sorted(current_items, key=_legacy_key, reverse=True)
+    remarks = dict(results)
+    return [(item['player_id'], remarks[item['player_id']]) for item in order]
+
+
+def _random_record(rng, player_id):
+    league = rng.choice(LEAGUES)
+    kind = rng.random()
+    if kind < 0.1:
+        # 전적 없음 ("N/A")
+        record = PlayerRecord(player_id, coach_name=f"c{player_id}", league=league)
+    elif kind < 0.2:
+        # 크롤링 실패 (전적 없음 또는 일부 남음)
+        wins = (rng.randint(0, 5), rng.randint(0, 2), rng.randint(0, 5)) if rng.random() < 0.3 else (None,) * 3
+        record = PlayerRecord(player_id, league=league, win=wins[0], draw=wins[1], loss=wins[2], error="timeout")
+    else:
+        # 동점이 자주 나오도록 작은 범위
+        record = PlayerRecord(player_id, coach_name=f"c{player_id}", league=league,
+                              win=rng.randint(0, 6), draw=rng.randint(0, 2), loss=rng.randint(0, 6))
+    derive_stats([record])
+    return record
+
+
+def _copy(record):
+    copied = PlayerRecord.from_result(record.to_result())
+    derive_stats([copied])
+    return copied
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_incremental_ranking_matches_triple_sort(seed):
+    rng = random.Random(seed)
+    player_ids = [f"{index:04d}" for index in range(rng.randint(0, 40))]
+    previous = {player_id: _random_record(rng, player_id) for player_id in player_ids}
+    previous_items = [record.to_result() for record in previous.values()]
+
+    ranking = RankingEngine(previous.values())
+    previous_ranks = ranking.rank_map()
+
+    # 이번 회차: 일부 전적 변경, 리그 이동, 오류로 바뀜, 새 플레이어
+    current = {player_id: _copy(record) for player_id, record in previous.items()}
+    changed = set()
+    for player_id in player_ids:
+        roll = rng.random()
+        if roll < 0.3:
+            current[player_id] = _random_record(rng, player_id)
+        elif roll < 0.4:
+            current[player_id].league = rng.choice(LEAGUES)
+        else:
+            continue
+        changed.add(player_id)
+    for index in range(rng.randint(0, 5)):
+        player_id = f"n{index:03d}"
+        current[player_id] = _random_record(rng, player_id)
+        changed.add(player_id)
+
+    for player_id in changed:
+        ranking.update(current[player_id])
+    ordered = ranking.ordered_items()
+    actual = [(record.player_id, ranking.remark(record.player_id, previous_ranks)) for record in ordered]
+
+    expected = _legacy_triple_sort(previous_items, [record.to_result() for record in current.values()])
+    assert actual == expected
+
+
+def test_rank_map_matches_legacy_ranks():
+    rng = random.Random(7)
+    records = [_random_record(rng, f"{index:04d}") for index in range(200)]
+    expected = {league: ranks for league, ranks in _legacy_ranks([r.to_result() for r in records]).items() if ranks}
+    assert RankingEngine(records).rank_map() == expected
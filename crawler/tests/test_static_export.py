@@ -0,0 +1,110 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from static_export import INDEX_FILE, MANIFEST_FILE, StaticExporter
+
+# 로컬 폴더를 정적 호스트로 사용해 내보내기 결과 확인
+
+LEAGUES = ["1부리그", "2부리그"]
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+
+def _row(player_id, league, win, remark="-"):
+    return {"player_id": player_id, "구단주명": f"감독{player_id}", "리그명": league, "승": win, "무": 0, "패": 1,
+            "판수": win + 1, "채굴 효율": win * 7 - 1, "승률": f"{win / (win + 1) * 100:.2f}%", "비고": remark}
+
+
+def _results(league2_win=5):
+    return [_row("1", "1부리그", 10), _row("2", "1부리그", 8), _row("3", "2부리그", league2_win)]
+
+
+def _files(target):
+    return {name for name in os.listdir(target) if name != MANIFEST_FILE}
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    return StaticExporter(str(tmp_path), retired_keep_hours=1)
+
+
+def test_first_export_writes_every_file(exporter, tmp_path):
+    manifest = exporter.export(_results(), LEAGUES, "2026-10-18 12:00:00", now=NOW)
+
+    assert set(manifest["last_export"]["written"]) == _files(tmp_path)
+    assert set(manifest["files"]) == {"style.css", "results_table.js", "league1.html", "league2.html", "data.json"}
+    index_html = (tmp_path / INDEX_FILE).read_text(encoding="utf-8")
+    for name in manifest["files"].values():
+        assert name in index_html
+        assert (tmp_path / name).exists()
+    assert manifest["written"][-1] == MANIFEST_FILE
+
+
+def test_unchanged_reexport_writes_nothing(exporter, tmp_path):
+    first = exporter.export(_results(), LEAGUES, "2026-10-18 12:00:00", now=NOW)
+    exporter.acknowledge()
+    second = exporter.export(_results(), LEAGUES, "2026-10-18 12:00:00", now=NOW + timedelta(minutes=5))
+
+    assert second["files"] == first["files"]
+    assert second["last_export"] == {"written": [], "written_bytes": 0, "deleted": []}
+    assert second["written"] == [MANIFEST_FILE]
+    assert second["deleted"] == []
+    assert second["retired"] == {}
+
+
+def test_one_league_change_rewrites_only_that_league(exporter, tmp_path):
+    first = exporter.export(_results(), LEAGUES, "2026-10-18 12:00:00", now=NOW)
+    exporter.acknowledge()
+    second = exporter.export(_results(league2_win=6), LEAGUES, "2026-10-18 13:00:00", now=NOW + timedelta(minutes=5))
+
+    assert second["files"]["league1.html"] == first["files"]["league1.html"]
+    assert second["files"]["style.css"] == first["files"]["style.css"]
+    assert set(second["last_export"]["written"]) == {second["files"]["league2.html"], second["files"]["data.json"],
+                                                     INDEX_FILE}
+    # 이전 조각/데이터는 바로 지우지 않고 retired 로 남김
+    assert set(second["retired"]) == {first["files"]["league2.html"], first["files"]["data.json"]}
+    assert (tmp_path / first["files"]["league2.html"]).exists()
+    assert second["deleted"] == []
+
+
+def test_pending_lists_accumulate_until_acknowledged(exporter, tmp_path):
+    exporter.export(_results(), LEAGUES, "2026-10-18 12:00:00", now=NOW)
+    first_pending = set(json.loads((tmp_path / MANIFEST_FILE).read_text(encoding="utf-8"))["written"])
+    manifest = exporter.export(_results(), LEAGUES, "2026-10-18 12:00:00", now=NOW + timedelta(minutes=1))
+
+    # 두 번째 내보내기에서 쓴 파일이 없어도 동기화 전이면 첫 회차 목록이 그대로 남음
+    assert set(manifest["written"]) == first_pending
+    assert exporter.acknowledge()["written"] == []
+
+
+def test_retired_files_are_deleted_after_keep_time(exporter, tmp_path):
+    first = exporter.export(_results(), LEAGUES, "2026-10-18 12:00:00", now=NOW)
+    exporter.acknowledge()
+    exporter.export(_results(league2_win=6), LEAGUES, "2026-10-18 13:00:00", now=NOW + timedelta(minutes=5))
+    exporter.acknowledge()
+    old_files = {first["files"]["league2.html"], first["files"]["data.json"]}
+
+    # 보관 시간 안: 여러 번 내보내도 그대로 유지
+    manifest = exporter.export(_results(league2_win=6), LEAGUES, "2026-10-18 13:00:00", now=NOW + timedelta(minutes=30))
+    assert set(manifest["retired"]) == old_files
+    assert all((tmp_path / name).exists() for name in old_files)
+
+    # 보관 시간이 지나면 삭제하고, 동기화 대기 목록(deleted)에 남김
+    manifest = exporter.export(_results(league2_win=6), LEAGUES, "2026-10-18 13:00:00", now=NOW + timedelta(hours=2))
+    assert set(manifest["last_export"]["deleted"]) == old_files
+    assert set(manifest["deleted"]) == old_files
+    assert manifest["retired"] == {}
+    assert not any((tmp_path / name).exists() for name in old_files)
+    assert set(manifest["files"].values()) <= _files(tmp_path)
+
+
+def test_retired_file_that_is_current_again_is_kept(exporter, tmp_path):
+    first = exporter.export(_results(), LEAGUES, "2026-10-18 12:00:00", now=NOW)
+    exporter.export(_results(league2_win=6), LEAGUES, "2026-10-18 13:00:00", now=NOW + timedelta(minutes=5))
+    manifest = exporter.export(_results(), LEAGUES, "2026-10-18 12:00:00", now=NOW + timedelta(hours=2))
+
+    assert manifest["files"]["league2.html"] == first["files"]["league2.html"]
+    assert first["files"]["league2.html"] not in manifest["retired"]
+    assert (tmp_path / first["files"]["league2.html"]).exists()